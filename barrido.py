@@ -0,0 +1,183 @@
+import glob
+import json
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cache_matrices import clave_matriz
+from propagacion import propagar_lote
+
+# Variables de entorno que limitan los hilos de las bibliotecas BLAS más comunes
+VARIABLES_BLAS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                  "BLIS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+NOMBRE_MANIFIESTO = "barrido.json"
+
+# Arreglos compartidos del proceso trabajador (se asignan en _iniciar_trabajador)
+_compartidos = {}
+
+
+def _iniciar_trabajador(descripciones):
+    # Cada trabajador se conecta a la memoria compartida una sola vez, sin copiar las matrices
+    for nombre, (nombre_memoria, forma, dtype) in descripciones.items():
+        memoria = shared_memory.SharedMemory(name=nombre_memoria)
+        _compartidos[nombre] = (memoria, np.ndarray(forma, dtype=dtype, buffer=memoria.buf))
+
+
+def _ruta_bloque(directorio, num_bloque):
+    return os.path.join(directorio, f"bloque_{num_bloque:06d}.npz")
+
+
+def _ejecutar_bloque(argumentos):
+    directorio, num_bloque, tareas, lista_pasos, metodo = argumentos
+    matrices = _compartidos["matrices"][1]
+    estados_iniciales = _compartidos["estados"][1]
+    resultados = np.stack([propagar_lote(matrices[i_matriz], estados_iniciales, lista_pasos[i_pasos], metodo)
+                           for i_matriz, i_pasos in tareas])
+    # Se escribe a un archivo temporal y se renombra: un bloque existe completo o no existe
+    ruta = _ruta_bloque(directorio, num_bloque)
+    temporal = ruta + ".tmp.npz"
+    np.savez(temporal, tareas=np.asarray(tareas, dtype=np.int64), estados=resultados)
+    os.replace(temporal, ruta)
+    return num_bloque
+
+
+def _manifiesto(matrices, lista_pasos, estados_iniciales, tamano_bloque, metodo):
+    # Se guarda en JSON: las tuplas se escriben como listas para poder comparar al reanudar
+    (forma_matrices, *resto_matrices) = clave_matriz(matrices)
+    (forma_estados, *resto_estados) = clave_matriz(estados_iniciales)
+    return {
+        "matrices": [list(forma_matrices)] + resto_matrices,
+        "estados": [list(forma_estados)] + resto_estados,
+        "pasos": [int(p) for p in lista_pasos],
+        "tamano_bloque": int(tamano_bloque),
+        "metodo": metodo,
+    }
+
+
+def ejecutar_barrido(matrices, lista_pasos, estados_iniciales, directorio, procesos=None, hilos_blas=1,
+                     tamano_bloque=16, metodo="auto"):
+    """
+    Evoluciona todos los estados iniciales con cada matriz de transición y cada número de pasos.
+
+    Sirve para los experimentos de rendijas clásico y cuántico (ambos aplican la matriz de transición
+    paso a paso). Cada tarea (matriz, pasos) evoluciona todos los estados a la vez con propagar_lote.
+    Las tareas se agrupan en bloques que se escriben en el directorio a medida que terminan, de modo
+    que si el barrido se interrumpe, al volver a llamarlo con los mismos datos solo se calculan los
+    bloques que faltan.
+
+    Con varios procesos, las matrices y los estados se pasan a los trabajadores por memoria compartida
+    (sin serializarlos) y cada trabajador usa hilos_blas hilos de BLAS, para no sobresuscribir los núcleos.
+
+    Parámetros:
+    - matrices (array_like): Arreglo (M, d, d) de matrices de transición.
+    - lista_pasos (list of int): Números de pasos a probar.
+    - estados_iniciales (array_like): Arreglo (S, d) de estados iniciales.
+    - directorio (str): Directorio donde se guardan los bloques de resultados.
+    - procesos (int, opcional): Número de procesos; None usa todos los núcleos, 0 o 1 calcula en el proceso actual.
+    - hilos_blas (int): Hilos de BLAS por proceso trabajador.
+    - tamano_bloque (int): Número de tareas (matriz, pasos) por bloque de resultados.
+    - metodo (str): Método de propagación ("auto", "iterativo", "potencia" o "espectral").
+
+    Retorna:
+    - calculados (int): Número de bloques calculados en esta llamada (los ya existentes se omiten).
+    """
+    matrices = np.ascontiguousarray(matrices)
+    estados_iniciales = np.ascontiguousarray(estados_iniciales)
+    if matrices.ndim != 3 or estados_iniciales.ndim != 2:
+        raise ValueError("Se esperan matrices (M, d, d) y estados iniciales (S, d)")
+
+    os.makedirs(directorio, exist_ok=True)
+    manifiesto = _manifiesto(matrices, lista_pasos, estados_iniciales, tamano_bloque, metodo)
+    ruta_manifiesto = os.path.join(directorio, NOMBRE_MANIFIESTO)
+    if os.path.exists(ruta_manifiesto):
+        with open(ruta_manifiesto) as archivo:
+            if json.load(archivo) != manifiesto:
+                raise ValueError(f"El directorio {directorio} contiene un barrido con otros parámetros")
+    else:
+        with open(ruta_manifiesto, "w") as archivo:
+            json.dump(manifiesto, archivo)
+
+    tareas = [(i_matriz, i_pasos) for i_matriz in range(len(matrices)) for i_pasos in range(len(lista_pasos))]
+    pendientes = []
+    for num_bloque, inicio in enumerate(range(0, len(tareas), tamano_bloque)):
+        if not os.path.exists(_ruta_bloque(directorio, num_bloque)):
+            pendientes.append((directorio, num_bloque, tareas[inicio:inicio + tamano_bloque], list(lista_pasos), metodo))
+    if not pendientes:
+        return 0
+
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    if procesos <= 1:
+        _compartidos["matrices"] = (None, matrices)
+        _compartidos["estados"] = (None, estados_iniciales)
+        try:
+            for argumentos in pendientes:
+                _ejecutar_bloque(argumentos)
+        finally:
+            _compartidos.clear()
+        return len(pendientes)
+
+    memorias = []
+    entorno_anterior = {variable: os.environ.get(variable) for variable in VARIABLES_BLAS}
+    try:
+        descripciones = {}
+        for nombre, arreglo in [("matrices", matrices), ("estados", estados_iniciales)]:
+            memoria = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+            memorias.append(memoria)
+            np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=memoria.buf)[...] = arreglo
+            descripciones[nombre] = (memoria.name, arreglo.shape, arreglo.dtype.str)
+
+        # Los trabajadores se crean con "spawn" y heredan estas variables antes de cargar BLAS
+        for variable in VARIABLES_BLAS:
+            os.environ[variable] = str(hilos_blas)
+        contexto = multiprocessing.get_context("spawn")
+        with contexto.Pool(procesos, initializer=_iniciar_trabajador, initargs=(descripciones,)) as grupo:
+            for variable, valor in entorno_anterior.items():
+                if valor is None:
+                    os.environ.pop(variable, None)
+                else:
+                    os.environ[variable] = valor
+            for _ in grupo.imap_unordered(_ejecutar_bloque, pendientes):
+                pass
+    finally:
+        for variable, valor in entorno_anterior.items():
+            if valor is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = valor
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+    return len(pendientes)
+
+
+def cargar_resultados(directorio):
+    """
+    Reúne los bloques de un barrido terminado en un solo arreglo.
+
+    Parámetros:
+    - directorio (str): Directorio del barrido.
+
+    Retorna:
+    - estados (numpy.ndarray): Arreglo (M, P, S, d) con el estado final de cada matriz, número de
+      pasos y estado inicial.
+    """
+    with open(os.path.join(directorio, NOMBRE_MANIFIESTO)) as archivo:
+        manifiesto = json.load(archivo)
+    num_matrices = manifiesto["matrices"][0][0]
+    num_pasos = len(manifiesto["pasos"])
+    resultados = None
+    calculadas = 0
+    for ruta in sorted(glob.glob(os.path.join(directorio, "bloque_*[0-9].npz"))):
+        with np.load(ruta) as bloque:
+            if resultados is None:
+                resultados = np.empty((num_matrices, num_pasos) + bloque["estados"].shape[1:], dtype=bloque["estados"].dtype)
+            for (i_matriz, i_pasos), estados in zip(bloque["tareas"], bloque["estados"]):
+                resultados[i_matriz, i_pasos] = estados
+                calculadas += 1
+    if calculadas != num_matrices * num_pasos:
+        raise ValueError(f"El barrido está incompleto: {calculadas} de {num_matrices * num_pasos} tareas")
+    return resultados
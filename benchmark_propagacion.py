@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+
+from propagacion import elegir_metodo, limpiar_cache_espectral, propagar
+
+# Costo máximo (en pasos * d²) permitido para el método iterativo antes de omitirlo
+LIMITE_ITERATIVO = 2e9
+
+
+# Matriz unitaria aleatoria de dimensión d
+def matriz_unitaria_aleatoria(dimension, rng):
+    matriz = rng.standard_normal((dimension, dimension)) + 1j * rng.standard_normal((dimension, dimension))
+    q, r = np.linalg.qr(matriz)
+    return q * (np.diag(r) / np.abs(np.diag(r)))
+
+
+# Tiempo de una propagación con el método dado (None si se omite)
+def medir(matriz, estado, pasos, metodo, repeticiones, en_cache=False):
+    if metodo == "iterativo" and pasos * matriz.shape[0] ** 2 > LIMITE_ITERATIVO:
+        return None
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        # Sin caché la diagonalización se cuenta en cada medición, como en una primera llamada
+        limpiar_cache_espectral()
+        if en_cache:
+            propagar(matriz, estado, 1, "espectral")
+        inicio = time.perf_counter()
+        propagar(matriz, estado, pasos, metodo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+# Tabla de tiempos por dimensión y número de pasos, con el método más rápido y el elegido por "auto"
+def benchmark(dimensiones, lista_pasos, repeticiones=3, semilla=0):
+    rng = np.random.default_rng(semilla)
+    metodos = ["iterativo", "potencia", "espectral"]
+    print(f"{'d':>6} {'pasos':>9} " + " ".join(f"{m:>11}" for m in metodos) + f" {'esp. caché':>11} {'mejor':>10} {'auto':>10}")
+    for dimension in dimensiones:
+        matriz = matriz_unitaria_aleatoria(dimension, rng)
+        estado = np.zeros(dimension, dtype=complex)
+        estado[0] = 1
+        for pasos in lista_pasos:
+            tiempos = {m: medir(matriz, estado, pasos, m, repeticiones) for m in metodos}
+            medidos = {m: t for m, t in tiempos.items() if t is not None}
+            mejor = min(medidos, key=medidos.get)
+            limpiar_cache_espectral()
+            auto = elegir_metodo(matriz, pasos)
+            en_cache = medir(matriz, estado, pasos, "espectral", repeticiones, en_cache=True)
+            columnas = " ".join(f"{tiempos[m]:>11.2e}" if tiempos[m] is not None else f"{'-':>11}" for m in metodos)
+            print(f"{dimension:>6} {pasos:>9} {columnas} {en_cache:>11.2e} {mejor:>10} {auto:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cruce entre métodos de propagación por dimensión y pasos")
+    parser.add_argument("--dimensiones", type=int, nargs="+", default=[4, 16, 64, 256, 1024])
+    parser.add_argument("--pasos", type=int, nargs="+", default=[1, 10, 100, 1000, 10000, 100000, 1000000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    argumentos = parser.parse_args()
+    benchmark(argumentos.dimensiones, argumentos.pasos, argumentos.repeticiones)
@@ -0,0 +1,439 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import clasico_a_lo_cuantico_poder_ver_grafica as experimentos
+import evolucion_hamiltoniana
+import libreria_CYNT_com as libreria
+import propagacion
+import teoriaCuanticaBasicaObv as teoria
+
+# Dimensiones por defecto: potencias de dos de 2 a 2^14
+DIMENSIONES = [2 ** k for k in range(1, 15)]
+
+# Números de pasos por defecto para los casos de evolución
+PASOS = [1, 10, 100, 1000]
+
+# Presupuesto por caso: los que superan el número estimado de operaciones o de bytes se omiten
+OPERACIONES_MAXIMAS = 2e10
+MEMORIA_MAXIMA = 1 << 30
+
+# Tiempo mínimo de cada repetición; las funciones rápidas se llaman varias veces seguidas
+TIEMPO_MINIMO = 0.02
+
+# Tolerancias de regresión (relativas) y diferencias mínimas para no confundir ruido con regresión
+TOLERANCIA_TIEMPO = 0.25
+TOLERANCIA_MEMORIA = 0.10
+PISO_TIEMPO = 1e-5
+PISO_MEMORIA = 1 << 16
+
+
+# Vector de estado complejo aleatorio normalizado
+def vector_aleatorio(dimension, rng):
+    vector = rng.standard_normal(dimension) + 1j * rng.standard_normal(dimension)
+    return vector / np.linalg.norm(vector)
+
+
+# Matriz compleja aleatoria (sin estructura)
+def matriz_aleatoria(dimension, rng):
+    return (rng.standard_normal((dimension, dimension)) + 1j * rng.standard_normal((dimension, dimension))) / np.sqrt(dimension)
+
+
+# Matriz unitaria densa: permutación con fases aleatorias (se construye en O(d²), sin QR)
+def matriz_unitaria(dimension, rng):
+    matriz = np.zeros((dimension, dimension), dtype=complex)
+    matriz[rng.permutation(dimension), np.arange(dimension)] = np.exp(2j * np.pi * rng.random(dimension))
+    return matriz
+
+
+# Matriz Hermitiana aleatoria
+def matriz_hermitiana(dimension, rng):
+    matriz = matriz_aleatoria(dimension, rng)
+    return (matriz + matriz.conj().T) / 2
+
+
+# Matriz estocástica por columnas (transición clásica probabilística)
+def matriz_estocastica(dimension, rng):
+    matriz = rng.random((dimension, dimension))
+    return matriz / matriz.sum(axis=0)
+
+
+def _caso(grupo, nombre, preparar, exponente, factor=1.0, matrices=0, con_pasos=False, costo_por_paso=True):
+    # preparar(dimension, pasos, rng) construye las entradas y retorna la función sin argumentos que se mide;
+    # el costo estimado es factor * d^exponente, multiplicado por los pasos (o por su logaritmo si
+    # costo_por_paso es False), y la memoria, matrices d x d complejas
+    return {"grupo": grupo, "nombre": nombre, "preparar": preparar, "exponente": exponente, "factor": factor,
+            "matrices": matrices, "con_pasos": con_pasos, "costo_por_paso": costo_por_paso}
+
+
+def _casos_libreria():
+    # print_complex_matrix se omite: solo escribe en la salida estándar
+    def vectores(funcion):
+        def preparar(d, pasos, rng):
+            v, w = vector_aleatorio(d, rng), vector_aleatorio(d, rng)
+            return lambda: funcion(v, w)
+        return preparar
+
+    def vector(funcion):
+        def preparar(d, pasos, rng):
+            v = vector_aleatorio(d, rng)
+            return lambda: funcion(v)
+        return preparar
+
+    def matrices(funcion, construir=matriz_aleatoria):
+        def preparar(d, pasos, rng):
+            a, b = construir(d, rng), construir(d, rng)
+            return lambda: funcion(a, b)
+        return preparar
+
+    def matriz(funcion, construir=matriz_aleatoria):
+        def preparar(d, pasos, rng):
+            a = construir(d, rng)
+            return lambda: funcion(a)
+        return preparar
+
+    def escalar(funcion, construir):
+        def preparar(d, pasos, rng):
+            a = construir(d, rng)
+            return lambda: funcion(2 + 3j, a)
+        return preparar
+
+    def accion(d, pasos, rng):
+        a, v = matriz_aleatoria(d, rng), vector_aleatorio(d, rng)
+        return lambda: libreria.matrix_vector_action(a, v)
+
+    def tensor(d, pasos, rng):
+        # Dos factores cuyo producto tensor es d x d
+        k = 2 ** (int(np.log2(d)) // 2)
+        a, b = matriz_aleatoria(k, rng), matriz_aleatoria(d // k, rng)
+        return lambda: libreria.tensor_product(a, b)
+
+    return [
+        _caso("libreria", "add_complex_vectors", vectores(libreria.add_complex_vectors), 1),
+        _caso("libreria", "inverse_complex_vector", vector(libreria.inverse_complex_vector), 1),
+        _caso("libreria", "scalar_multiply_complex_vector", escalar(libreria.scalar_multiply_complex_vector, vector_aleatorio), 1),
+        _caso("libreria", "inner_product", vectores(libreria.inner_product), 1),
+        _caso("libreria", "vector_norm", vector(libreria.vector_norm), 1),
+        _caso("libreria", "vector_distance", vectores(libreria.vector_distance), 1),
+        _caso("libreria", "add_complex_matrices", matrices(libreria.add_complex_matrices), 2, matrices=3),
+        _caso("libreria", "inverse_complex_matrix", matriz(libreria.inverse_complex_matrix), 2, matrices=2),
+        _caso("libreria", "scalar_multiply_complex_matrix", escalar(libreria.scalar_multiply_complex_matrix, matriz_aleatoria), 2, matrices=2),
+        _caso("libreria", "complex_transpose", matriz(libreria.complex_transpose), 2, matrices=2),
+        _caso("libreria", "complex_conjugate", matriz(libreria.complex_conjugate), 2, matrices=2),
+        _caso("libreria", "complex_adjoint", matriz(libreria.complex_adjoint), 2, matrices=2),
+        _caso("libreria", "matrix_multiply", matrices(libreria.matrix_multiply), 3, matrices=3),
+        _caso("libreria", "matrix_vector_action", accion, 2, matrices=1),
+        _caso("libreria", "eigenvalues_eigenvectors", matriz(libreria.eigenvalues_eigenvectors), 3, factor=20, matrices=3),
+        _caso("libreria", "is_unitary", matriz(libreria.is_unitary, matriz_unitaria), 3, matrices=2),
+        _caso("libreria", "is_hermitian", matriz(libreria.is_hermitian, matriz_hermitiana), 2, matrices=2),
+        _caso("libreria", "tensor_product", tensor, 2, matrices=2),
+    ]
+
+
+def _casos_teoria():
+    def sistema(metodo, *argumentos):
+        def preparar(d, pasos, rng):
+            sistema_cuantico = teoria.SistemaCuantico(d, vector_aleatorio(d, rng))
+            valores = [vector_aleatorio(d, rng) if argumento is vector_aleatorio else argumento for argumento in argumentos]
+            return lambda: getattr(sistema_cuantico, metodo)(*valores)
+        return preparar
+
+    def observable(funcion, con_estados_finales):
+        def preparar(d, pasos, rng):
+            a, v = matriz_hermitiana(d, rng), vector_aleatorio(d, rng)
+            if not con_estados_finales:
+                return lambda: funcion(a, v)
+            estados_finales = list(np.linalg.eigh(a)[1].T)
+            return lambda: funcion(a, v, estados_finales)
+        return preparar
+
+    def observable_sin_cache(d, pasos, rng):
+        a = matriz_hermitiana(d, rng)
+        return lambda: teoria.Observable(a).autovalores
+
+    def amplitud(d, pasos, rng):
+        v, w = vector_aleatorio(d, rng), vector_aleatorio(d, rng)
+        return lambda: teoria.problema_4_3_1(v, w)
+
+    def hermitiana(d, pasos, rng):
+        a = matriz_hermitiana(d, rng)
+        return lambda: teoria.problema_4_4_1(a)
+
+    def medias(d, pasos, rng):
+        observables = [matriz_hermitiana(d, rng) for _ in range(4)]
+        estados = np.array([vector_aleatorio(d, rng) for _ in range(16)])
+        return lambda: teoria.medias_y_varianzas(observables, estados)
+
+    def transiciones(d, pasos, rng):
+        iniciales = np.array([vector_aleatorio(d, rng) for _ in range(16)])
+        finales = np.linalg.eigh(matriz_hermitiana(d, rng))[1].T
+        return lambda: teoria.probabilidades_de_transicion(iniciales, finales)
+
+    def evolucion(d, pasos, rng):
+        u, v = matriz_unitaria(d, rng), vector_aleatorio(d, rng)
+        return lambda: teoria.evolucion_del_sistema(v, [u] * pasos)
+
+    def evolucion_lote(d, pasos, rng):
+        u = matriz_unitaria(d, rng)
+        estados = np.array([vector_aleatorio(d, rng) for _ in range(16)])
+        return lambda: teoria.evolucion_del_sistema_lote(estados, [u] * pasos)
+
+    # Las funciones que usan obtener_observable se miden con la caché ya llena (uso repetido);
+    # observable_sin_cache mide la primera diagonalización
+    return [
+        _caso("teoria", "probabilidad_en_posicion", sistema("probabilidad_en_posicion", 0), 1),
+        _caso("teoria", "probabilidad_de_transicion", sistema("probabilidad_de_transicion", vector_aleatorio), 1),
+        _caso("teoria", "distribucion_de_posiciones", sistema("distribucion_de_posiciones"), 1),
+        _caso("teoria", "muestrear", sistema("muestrear", 1000, 0), 1),
+        _caso("teoria", "histograma", sistema("histograma", 1000, 0), 1),
+        _caso("teoria", "amplitud_de_transicion", amplitud, 1),
+        _caso("teoria", "es_hermitiana", hermitiana, 2, matrices=1),
+        _caso("teoria", "observable_sin_cache", observable_sin_cache, 3, factor=10, matrices=3),
+        _caso("teoria", "media_y_varianza", observable(teoria.media_y_varianza, False), 2, matrices=3),
+        _caso("teoria", "medias_y_varianzas", medias, 2, factor=64, matrices=12),
+        _caso("teoria", "problema_4_3_2", observable(lambda a, v, finales: teoria.problema_4_3_2(v, a, finales), True), 2, matrices=4),
+        _caso("teoria", "problema_4_4_2", observable(teoria.problema_4_4_2, True), 2, matrices=4),
+        _caso("teoria", "probabilidades_de_transicion", transiciones, 2, factor=16, matrices=1),
+        _caso("teoria", "evolucion_del_sistema", evolucion, 2, matrices=1, con_pasos=True),
+        _caso("teoria", "evolucion_del_sistema_lote", evolucion_lote, 2, factor=16, matrices=1, con_pasos=True),
+    ]
+
+
+def _casos_evolucion():
+    def propagar(metodo):
+        def preparar(d, pasos, rng):
+            u, v = matriz_unitaria(d, rng), vector_aleatorio(d, rng)
+            return lambda: propagacion.propagar(u, v, pasos, metodo)
+        return preparar
+
+    def hamiltoniano(metodo):
+        def preparar(d, pasos, rng):
+            h, v = matriz_hermitiana(d, rng), vector_aleatorio(d, rng)
+            return lambda: evolucion_hamiltoniana.evolucionar_hamiltoniano(h, v, 1.0, metodo)
+        return preparar
+
+    casos = [
+        _caso("evolucion", "propagar_iterativo", propagar("iterativo"), 2, matrices=1, con_pasos=True),
+        _caso("evolucion", "propagar_potencia", propagar("potencia"), 3, matrices=3, con_pasos=True, costo_por_paso=False),
+        _caso("evolucion", "propagar_espectral", propagar("espectral"), 3, factor=20, matrices=3, con_pasos=True,
+              costo_por_paso=False),
+        _caso("evolucion", "evolucionar_hamiltoniano_lanczos", hamiltoniano("lanczos"), 2, factor=60, matrices=1),
+        _caso("evolucion", "evolucionar_hamiltoniano_taylor", hamiltoniano("taylor"), 2, factor=60, matrices=1),
+    ]
+
+    def experimento(funcion, construir, estado):
+        def preparar(d, pasos, rng):
+            m = construir(d, rng)
+            v = estado(d, rng)
+            return lambda: funcion(m, v, pasos)
+        return preparar
+
+    def canicas(d, rng):
+        estado = np.zeros(d)
+        estado[0] = 1
+        return estado
+
+    def probabilidades(d, rng):
+        return rng.dirichlet(np.ones(d))
+
+    matriz_booleana = lambda d, rng: np.abs(matriz_unitaria(d, rng))
+    return casos + [
+        _caso("experimentos", "canicas_booleanas", experimento(experimentos.canicas_booleanas, matriz_booleana, canicas),
+              2, matrices=1, con_pasos=True),
+        _caso("experimentos", "canicas_booleanas_bits", experimento(experimentos.canicas_booleanas_bits, matriz_booleana, canicas),
+              2, factor=1 / 64, matrices=1, con_pasos=True),
+        _caso("experimentos", "rendijas_clasico_probabilistico",
+              experimento(experimentos.rendijas_clasico_probabilistico, matriz_estocastica, probabilidades), 2, matrices=1, con_pasos=True),
+        _caso("experimentos", "rendijas_cuantico", experimento(experimentos.rendijas_cuantico, matriz_unitaria, vector_aleatorio),
+              2, matrices=1, con_pasos=True),
+    ]
+
+
+def casos():
+    """
+    Retorna:
+    - casos (list of dict): Todos los casos de benchmark, con su grupo, nombre y costo estimado.
+    """
+    return _casos_libreria() + _casos_teoria() + _casos_evolucion()
+
+
+def medir(funcion, repeticiones=3):
+    """
+    Mide el tiempo por llamada y la memoria pico de una función.
+
+    El tiempo es el mejor de varias repeticiones; en cada una la función se llama las veces
+    necesarias para durar al menos TIEMPO_MINIMO. La memoria pico se mide aparte con tracemalloc
+    (que también registra los arreglos de numpy), en una sola llamada.
+
+    Parámetros:
+    - funcion (callable): Función sin argumentos.
+    - repeticiones (int): Número de repeticiones del tiempo.
+
+    Retorna:
+    - tiempo (float): Segundos por llamada.
+    - memoria_pico (int): Bytes reservados como máximo durante una llamada.
+    """
+    funcion()
+    numero = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= TIEMPO_MINIMO:
+            break
+        numero *= 2 if duracion == 0 else max(2, int(np.ceil(TIEMPO_MINIMO / duracion)))
+    mejor = duracion / numero
+    for _ in range(repeticiones - 1):
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcion()
+        mejor = min(mejor, (time.perf_counter() - inicio) / numero)
+
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return mejor, pico
+
+
+def clave(caso, dimension, pasos=None):
+    if pasos is None:
+        return f"{caso['grupo']}.{caso['nombre']}[d={dimension}]"
+    return f"{caso['grupo']}.{caso['nombre']}[d={dimension},pasos={pasos}]"
+
+
+def ejecutar(dimensiones=DIMENSIONES, lista_pasos=PASOS, repeticiones=3, filtro=None,
+             operaciones_maximas=OPERACIONES_MAXIMAS, memoria_maxima=MEMORIA_MAXIMA, semilla=0, mostrar=True):
+    """
+    Ejecuta todos los casos en cada dimensión (y número de pasos) dentro del presupuesto.
+
+    Parámetros:
+    - dimensiones (list of int): Dimensiones d.
+    - lista_pasos (list of int): Números de pasos para los casos de evolución.
+    - repeticiones (int): Repeticiones de cada medición de tiempo.
+    - filtro (str, opcional): Solo se ejecutan los casos cuyo "grupo.nombre" contiene este texto.
+    - operaciones_maximas (float): Se omiten los casos con más operaciones estimadas.
+    - memoria_maxima (int): Se omiten los casos cuyas matrices ocuparían más bytes.
+    - semilla (int): Semilla de las entradas aleatorias.
+    - mostrar (bool): Si es True se imprime cada resultado al medirlo.
+
+    Retorna:
+    - resultados (dict): Por clave "grupo.nombre[d=...,pasos=...]", un diccionario con
+      "tiempo" (segundos por llamada) y "memoria_pico" (bytes).
+    """
+    resultados = {}
+    for caso in casos():
+        if filtro is not None and filtro not in f"{caso['grupo']}.{caso['nombre']}":
+            continue
+        for dimension in dimensiones:
+            if caso["matrices"] * dimension ** 2 * 16 > memoria_maxima:
+                continue
+            for pasos in (lista_pasos if caso["con_pasos"] else [None]):
+                operaciones = caso["factor"] * dimension ** caso["exponente"]
+                if pasos is not None:
+                    operaciones *= pasos if caso["costo_por_paso"] else np.log2(pasos) + 1
+                if operaciones > operaciones_maximas:
+                    continue
+                rng = np.random.default_rng(semilla)
+                funcion = caso["preparar"](dimension, pasos or 1, rng)
+                tiempo, memoria_pico = medir(funcion, repeticiones)
+                nombre = clave(caso, dimension, pasos)
+                resultados[nombre] = {"tiempo": tiempo, "memoria_pico": memoria_pico}
+                if mostrar:
+                    print(f"{nombre:<70} {tiempo:>11.3e} s {memoria_pico / 2 ** 20:>10.2f} MiB", flush=True)
+    return resultados
+
+
+def comparar(resultados, linea_base, tolerancia_tiempo=TOLERANCIA_TIEMPO, tolerancia_memoria=TOLERANCIA_MEMORIA):
+    """
+    Compara unos resultados con una línea base y retorna las regresiones.
+
+    Un tiempo (o memoria) es una regresión si supera el de la línea base en más de la tolerancia
+    relativa y, además, en más de PISO_TIEMPO segundos (o PISO_MEMORIA bytes). Los casos que no
+    están en la línea base no se comparan.
+
+    Parámetros:
+    - resultados (dict): Resultados de ejecutar.
+    - linea_base (dict): Resultados guardados con los que se compara.
+    - tolerancia_tiempo, tolerancia_memoria (float): Aumentos relativos permitidos.
+
+    Retorna:
+    - regresiones (list of tuple): (clave, medida, valor_base, valor_actual) de cada regresión.
+    """
+    regresiones = []
+    limites = {"tiempo": (tolerancia_tiempo, PISO_TIEMPO), "memoria_pico": (tolerancia_memoria, PISO_MEMORIA)}
+    for nombre, actual in resultados.items():
+        if nombre not in linea_base:
+            continue
+        for medida, (tolerancia, piso) in limites.items():
+            base = linea_base[nombre][medida]
+            if actual[medida] > base * (1 + tolerancia) and actual[medida] - base > piso:
+                regresiones.append((nombre, medida, base, actual[medida]))
+    return regresiones
+
+
+def guardar_en_historial(ruta, resultados):
+    """
+    Agrega una ejecución (con fecha y versiones) al historial JSON de benchmarks.
+
+    Parámetros:
+    - ruta (str): Archivo del historial; se crea si no existe.
+    - resultados (dict): Resultados de ejecutar.
+    """
+    historial = []
+    if os.path.exists(ruta):
+        with open(ruta) as archivo:
+            historial = json.load(archivo)
+    historial.append({
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.machine(),
+        "resultados": resultados,
+    })
+    temporal = ruta + ".tmp"
+    with open(temporal, "w") as archivo:
+        json.dump(historial, archivo, indent=1)
+    os.replace(temporal, ruta)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de la biblioteca, la teoría cuántica básica y las evoluciones")
+    parser.add_argument("--dimensiones", type=int, nargs="+", default=DIMENSIONES)
+    parser.add_argument("--pasos", type=int, nargs="+", default=PASOS)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--filtro", help="Solo los casos cuyo grupo.nombre contiene este texto")
+    parser.add_argument("--operaciones-maximas", type=float, default=OPERACIONES_MAXIMAS)
+    parser.add_argument("--memoria-maxima", type=int, default=MEMORIA_MAXIMA)
+    parser.add_argument("--historial", default="historial_benchmarks.json")
+    parser.add_argument("--linea-base", help="Archivo JSON con los resultados de referencia")
+    parser.add_argument("--guardar-linea-base", action="store_true", help="Guarda estos resultados como línea base")
+    parser.add_argument("--tolerancia-tiempo", type=float, default=TOLERANCIA_TIEMPO)
+    parser.add_argument("--tolerancia-memoria", type=float, default=TOLERANCIA_MEMORIA)
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar(argumentos.dimensiones, argumentos.pasos, argumentos.repeticiones, argumentos.filtro,
+                          argumentos.operaciones_maximas, argumentos.memoria_maxima)
+    guardar_en_historial(argumentos.historial, resultados)
+
+    if argumentos.linea_base and argumentos.guardar_linea_base:
+        with open(argumentos.linea_base, "w") as archivo:
+            json.dump(resultados, archivo, indent=1)
+    elif argumentos.linea_base:
+        with open(argumentos.linea_base) as archivo:
+            regresiones = comparar(resultados, json.load(archivo), argumentos.tolerancia_tiempo, argumentos.tolerancia_memoria)
+        for nombre, medida, base, actual in regresiones:
+            print(f"REGRESIÓN {nombre} {medida}: {base:.3e} -> {actual:.3e}", file=sys.stderr)
+        if regresiones:
+            sys.exit(1)
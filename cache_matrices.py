@@ -0,0 +1,69 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+def clave_matriz(matriz):
+    """
+    Calcula una clave de caché a partir del contenido de una matriz.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz.
+
+    Retorna:
+    - clave (tuple): Forma, tipo de dato y resumen del contenido de la matriz.
+    """
+    contigua = np.ascontiguousarray(matriz)
+    resumen = hashlib.blake2b(memoryview(contigua).cast("B"), digest_size=16).hexdigest()
+    return contigua.shape, contigua.dtype.str, resumen
+
+
+class CacheLRU:
+    def __init__(self, tamano_maximo):
+        """
+        Inicializa una caché acotada que descarta la entrada usada hace más tiempo.
+
+        Parámetros:
+        - tamano_maximo (int): Número máximo de entradas guardadas.
+        """
+        self.tamano_maximo = tamano_maximo
+        self._entradas = OrderedDict()
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obtener(self, clave):
+        """
+        Retorna el valor guardado para la clave y la marca como usada recientemente.
+
+        Parámetros:
+        - clave (hashable): La clave buscada; debe estar en la caché.
+
+        Retorna:
+        - valor (object): El valor guardado.
+        """
+        self._entradas.move_to_end(clave)
+        return self._entradas[clave]
+
+    def guardar(self, clave, valor):
+        """
+        Guarda un valor, descartando la entrada más antigua si se supera el tamaño máximo.
+
+        Parámetros:
+        - clave (hashable): La clave.
+        - valor (object): El valor que se guarda.
+        """
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        if len(self._entradas) > self.tamano_maximo:
+            self._entradas.popitem(last=False)
+
+    def limpiar(self):
+        """
+        Vacía la caché.
+        """
+        self._entradas.clear()
@@ -0,0 +1,117 @@
+import numpy as np
+
+# Tamaño máximo (en bytes) de los arreglos temporales de un paso
+MAX_BYTES_TEMPORAL = 1 << 26
+
+
+def empaquetar_bits(booleanos):
+    """
+    Empaqueta un arreglo booleano en palabras de 64 bits a lo largo del último eje.
+
+    Parámetros:
+    - booleanos (array_like): Arreglo (..., d) de valores booleanos.
+
+    Retorna:
+    - palabras (numpy.ndarray): Arreglo (..., ceil(d / 64)) de tipo uint64.
+    """
+    booleanos = np.asarray(booleanos, dtype=bool)
+    dimension = booleanos.shape[-1]
+    num_palabras = max((dimension + 63) // 64, 1)
+    relleno = [(0, 0)] * (booleanos.ndim - 1) + [(0, num_palabras * 64 - dimension)]
+    bytes_ = np.packbits(np.pad(booleanos, relleno), axis=-1, bitorder="little")
+    return np.ascontiguousarray(bytes_).view(np.uint64)
+
+
+def desempaquetar_bits(palabras, dimension):
+    """
+    Recupera el arreglo booleano a partir de sus palabras de 64 bits.
+
+    Parámetros:
+    - palabras (numpy.ndarray): Arreglo (..., W) de tipo uint64.
+    - dimension (int): Número de posiciones d originales.
+
+    Retorna:
+    - booleanos (numpy.ndarray): Arreglo (..., d) de valores booleanos.
+    """
+    bytes_ = np.ascontiguousarray(palabras).view(np.uint8)
+    return np.unpackbits(bytes_, axis=-1, count=dimension, bitorder="little").astype(bool)
+
+
+class MatrizBooleana:
+    def __init__(self, matriz_transicion):
+        """
+        Inicializa una matriz de transición booleana con sus filas empaquetadas en bits.
+
+        Una entrada es verdadera si el valor de la matriz original es distinto de cero.
+        Cada paso calcula estado'[i] = OR_j (M[i, j] AND estado[j]) con operaciones
+        bit a bit sobre palabras uint64, usando 64 veces menos memoria que float64.
+
+        Parámetros:
+        - matriz_transicion (array_like): Matriz cuadrada (d, d).
+        """
+        matriz_transicion = np.asarray(matriz_transicion)
+        if matriz_transicion.ndim != 2 or matriz_transicion.shape[0] != matriz_transicion.shape[1]:
+            raise ValueError("La matriz de transición debe ser cuadrada")
+        self.dimension = matriz_transicion.shape[0]
+        self.filas = empaquetar_bits(matriz_transicion != 0)
+
+    def paso(self, estados):
+        """
+        Aplica un paso de la evolución booleana a uno o varios estados empaquetados.
+
+        Parámetros:
+        - estados (numpy.ndarray): Estado empaquetado (W,) o lote de estados empaquetados (N, W).
+
+        Retorna:
+        - estados (numpy.ndarray): Los estados empaquetados después de un paso, con la misma forma.
+        """
+        lote = np.atleast_2d(estados)
+        num_estados, num_palabras = lote.shape
+        alcanzadas = np.empty((num_estados, self.dimension), dtype=bool)
+
+        # Se procesan bloques de filas para acotar el arreglo temporal (N, bloque, W)
+        bloque = max(MAX_BYTES_TEMPORAL // (8 * num_estados * num_palabras), 1)
+        temporal = np.empty((num_estados, min(bloque, self.dimension), num_palabras), dtype=np.uint64)
+        for inicio in range(0, self.dimension, bloque):
+            filas = self.filas[inicio:inicio + bloque]
+            destino = temporal[:, :len(filas)]
+            np.bitwise_and(lote[:, np.newaxis, :], filas[np.newaxis, :, :], out=destino)
+            np.any(destino, axis=-1, out=alcanzadas[:, inicio:inicio + len(filas)])
+
+        resultado = empaquetar_bits(alcanzadas)
+        return resultado if np.ndim(estados) == 2 else resultado[0]
+
+    def evolucionar(self, estados_iniciales, pasos, detectar_ciclos=True):
+        """
+        Evoluciona uno o varios estados booleanos el número de pasos indicado.
+
+        Como solo hay 2^d estados, toda trayectoria termina en un punto fijo o en un ciclo.
+        Con detectar_ciclos se compara cada estado con uno de referencia (algoritmo de Brent,
+        memoria constante) y, al encontrar una repetición, se salta directamente al paso pedido.
+        El resultado es exacto en ambos casos.
+
+        Parámetros:
+        - estados_iniciales (array_like): Estado booleano (d,) o lote de estados (N, d).
+        - pasos (int): Número de pasos a propagar.
+        - detectar_ciclos (bool): Si es True se detectan los ciclos para no recorrerlos.
+
+        Retorna:
+        - estados_finales (numpy.ndarray): Estados booleanos con la misma forma de la entrada.
+        """
+        estados = empaquetar_bits(estados_iniciales)
+        pasos = int(pasos)
+        referencia = estados
+        potencia = longitud = 1
+        for paso in range(1, pasos + 1):
+            estados = self.paso(estados)
+            if detectar_ciclos and np.array_equal(estados, referencia):
+                # El lote se repite cada `longitud` pasos (o un divisor): solo falta el resto
+                for _ in range((pasos - paso) % longitud):
+                    estados = self.paso(estados)
+                break
+            if longitud == potencia:
+                referencia = estados
+                potencia *= 2
+                longitud = 0
+            longitud += 1
+        return desempaquetar_bits(estados, self.dimension)
@@ -1,36 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import numpy as np
-import matplotlib.pyplot as plt
 import unittest
+from multiprocessing import shared_memory
+from unittest import mock
+from barrido import cargar_resultados, ejecutar_barrido
+from canicas_bits import MatrizBooleana
+from estado_tensorial import EstadoTensorial, aplicar_operador_local
+from evolucion_hamiltoniana import evolucion_temporal, evolucionar_hamiltoniano
+from graficas import graficar_evolucion, graficar_trayectoria, importar_pyplot
+from instrumentacion import exportar_traza_chrome, instrumentacion_activa, instrumentar, perfil
+from libreria_CYNT_com import add_complex_vectors, matrix_multiply, tensor_product
+from matriz_densidad import (MatrizDensidad, canal_amortiguamiento, canal_desfase, canal_despolarizante,
+                             canal_inversion_de_bit, es_canal_valido)
+from matriz_dispersa import MatrizDispersaCSR
+from operadores_perezosos import Matriz, Tensor, orden_de_contraccion
+from precision import cota_error, precision_temporal
+from propagacion import distribucion_estacionaria, limpiar_cache_espectral, propagar, propagar_lote
+from propiedades import (OperadorVerificado, es_hermitiana_por_bloques, es_hermitiana_probabilistica,
+                         es_unitaria_por_bloques, es_unitaria_probabilistica)
+from puntos_control import cargar, guardar, leer_cabecera
+from teoriaCuanticaBasicaObv import (Observable, SistemaCuantico, evolucion_del_sistema, evolucion_del_sistema_lote,
+                                     histogramas_en_lote, media_y_varianza, medias_y_varianzas, obtener_observable,
+                                     probabilidades_de_transicion)
+from trayectorias import cargar_trayectoria, guardar_trayectoria, trayectoria
 # Experimento de las canicas con coeficiente booleanos
-def canicas_booleanas(matriz_estado_inicial, matriz_transicion, pasos):
-    estado_actual = matriz_estado_inicial
-    for _ in range(pasos):
-        estado_actual = np.dot(matriz_transicion, estado_actual)
-    return estado_actual
+@instrumentar()
+def canicas_booleanas(matriz_transicion, vector_estado_inicial, pasos, metodo="auto"):
+    return propagar(matriz_transicion, vector_estado_inicial, pasos, metodo)
+
+# Experimento de las canicas con coeficientes booleanos verdaderos (OR de ANDs sobre bits),
+# para un estado (d,) o un lote de configuraciones iniciales (N, d)
+@instrumentar()
+def canicas_booleanas_bits(matriz_transicion, vector_estado_inicial, pasos):
+    return MatrizBooleana(matriz_transicion).evolucionar(vector_estado_inicial, pasos)
 
 # Experimento de las múltiples rendijas clásico probabilístico
-def rendijas_clasico_probabilistico(matriz_transicion, matriz_probabilidades_inicial, pasos):
-    estado_actual = matriz_probabilidades_inicial
-    for _ in range(pasos):
-        estado_actual = np.dot(matriz_transicion, estado_actual)
-    return estado_actual
+@instrumentar()
+def rendijas_clasico_probabilistico(matriz_transicion, matriz_probabilidades_inicial, pasos, metodo="auto"):
+    return propagar(matriz_transicion, matriz_probabilidades_inicial, pasos, metodo)
 
 # Experimento de las múltiples rendijas cuántico
-def rendijas_cuantico(matriz_transicion, vector_estado_inicial, pasos):
-    estado_actual = vector_estado_inicial
-    for _ in range(pasos):
-        estado_actual = np.dot(matriz_transicion, estado_actual)
-    return estado_actual
-
-# Función para graficar un vector de estados
-def graficar_probabilidades(vector_estado, etiquetas, titulo, nombre_archivo):
+@instrumentar()
+def rendijas_cuantico(matriz_transicion, vector_estado_inicial, pasos, metodo="auto"):
+    return propagar(matriz_transicion, vector_estado_inicial, pasos, metodo)
+
+# Experimento de las múltiples rendijas cuántico para un lote (N, d) de estados iniciales
+@instrumentar()
+def rendijas_cuantico_lote(matriz_transicion, estados_iniciales, pasos, metodo="auto"):
+    return propagar_lote(matriz_transicion, estados_iniciales, pasos, metodo)
+
+# Función para graficar un vector de estados; con mostrar=False solo se guarda el archivo, sin
+# bloquear (para la evolución paso a paso, ver graficas.graficar_evolucion y graficas.graficar_trayectoria)
+def graficar_probabilidades(vector_estado, etiquetas, titulo, nombre_archivo, mostrar=True):
+    plt = importar_pyplot()
     plt.bar(range(len(vector_estado)), vector_estado)
     plt.xticks(range(len(etiquetas)), etiquetas)
     plt.title(titulo)
     plt.xlabel("Estado")
     plt.ylabel("Probabilidad")
     plt.savefig(nombre_archivo)
-    plt.show()
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
 
 # Ejemplo de uso
 class TestExperimentos(unittest.TestCase):
@@ -43,6 +79,56 @@ class TestExperimentos(unittest.TestCase):
         resultado_canicas = canicas_booleanas(matriz_transicion_canicas, vector_estado_inicial_canicas, 1)
         self.assertTrue(np.allclose(resultado_canicas, [0., 0., 1., 0.], atol=1e-6))
 
+    def test_canicas_booleanas_bits(self):
+        matriz_transicion_canicas = np.array([[0, 0, 1, 0],
+                                              [0, 1, 0, 0],
+                                              [1, 0, 0, 0],
+                                              [0, 0, 0, 1]], dtype=float)
+        configuraciones_iniciales = np.array([[1, 0, 0, 0],
+                                              [0, 1, 0, 1],
+                                              [1, 0, 1, 0]], dtype=bool)
+        resultado_canicas = canicas_booleanas_bits(matriz_transicion_canicas, configuraciones_iniciales, 3)
+        self.assertTrue(np.array_equal(resultado_canicas, [[False, False, True, False],
+                                                           [False, True, False, True],
+                                                           [True, False, True, False]]))
+        resultado_canica = canicas_booleanas_bits(matriz_transicion_canicas, configuraciones_iniciales[0], 2)
+        self.assertTrue(np.array_equal(resultado_canica, [True, False, False, False]))
+
+    def test_canicas_y_rendijas_con_ciclos(self):
+        matriz_transicion_canicas = np.array([[0, 0, 1, 0],
+                                              [0, 1, 0, 0],
+                                              [1, 0, 0, 0],
+                                              [0, 0, 0, 1]], dtype=float)
+        vector_estado_inicial_canicas = np.array([1, 0, 0, 0], dtype=float)
+        with instrumentacion_activa():
+            resultado_canicas = canicas_booleanas(matriz_transicion_canicas, vector_estado_inicial_canicas, 10**12 + 1, metodo="ciclos")
+        self.assertTrue(np.array_equal(resultado_canicas, [0., 0., 1., 0.]))
+        # Solo se cuentan los 3 productos 4 x 4 ejecutados antes de detectar el ciclo, no los 10**12 pedidos
+        self.assertEqual(perfil()["propagacion._propagar_ciclos"]["flops"], 3 * 2 * 16)
+        resultado_bits = MatrizBooleana(matriz_transicion_canicas).evolucionar(vector_estado_inicial_canicas.astype(bool), 10**12)
+        self.assertTrue(np.array_equal(resultado_bits, [True, False, False, False]))
+        matriz_transicion_rendijas = np.array([[1/2, 1/4, 0],
+                                               [1/2, 1/2, 1/2],
+                                               [0, 1/4, 1/2]], dtype=float)
+        estacionaria = distribucion_estacionaria(matriz_transicion_rendijas)
+        self.assertTrue(np.allclose(estacionaria, [1/4, 1/2, 1/4]))
+        resultado_rendijas = rendijas_clasico_probabilistico(matriz_transicion_rendijas, np.array([1, 0, 0], dtype=float), 10**9, metodo="ciclos")
+        self.assertTrue(np.allclose(resultado_rendijas, estacionaria))
+        # Una cadena que mezcla muy lento cambia poco en cada paso, pero no está en un ciclo
+        mezcla_lenta = (1 - 1e-11) * np.eye(2) + 1e-11 * np.array([[0, 1], [1, 0]])
+        resultado_lento = rendijas_clasico_probabilistico(mezcla_lenta, np.array([1, 0], dtype=float), 10**4, metodo="ciclos")
+        esperado_lento = rendijas_clasico_probabilistico(mezcla_lenta, np.array([1, 0], dtype=float), 10**4, metodo="potencia")
+        self.assertTrue(np.allclose(resultado_lento, esperado_lento, rtol=1e-6, atol=0))
+        # Una matriz no diagonalizable pasa del método espectral a potencia: sus operaciones se cuentan una vez
+        jordan = np.array([[1, 1], [0, 1]], dtype=float)
+        with instrumentacion_activa():
+            resultado_jordan = rendijas_clasico_probabilistico(jordan, np.array([0, 1], dtype=float), 5, metodo="espectral")
+        self.assertTrue(np.array_equal(resultado_jordan, [5, 1]))
+        registro = perfil()
+        self.assertEqual(registro["propagacion._propagar_espectral"]["flops"], 0)
+        # 5 = 101 en binario: 2 cuadrados 2 x 2 y 2 productos por el estado
+        self.assertEqual(registro["propagacion._propagar_potencia"]["flops"], 2 * 16 + 2 * 8)
+
     def test_rendijas_clasico_probabilistico(self):
         matriz_transicion_rendijas = np.array([[0, 1/2, 1/2],
                                                [0, 1, 0],
@@ -59,5 +145,632 @@ class TestExperimentos(unittest.TestCase):
         resultado_rendijas_cuantico = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 1)
         self.assertTrue(np.allclose(resultado_rendijas_cuantico, [0. + 0j, 0.70710678 + 0j, 0.70710678 + 0j], atol=1e-6))
 
+    def test_rendijas_cuantico_probabilidades_de_transicion(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        estados_iniciales = np.eye(3, dtype=complex)
+        resultado = rendijas_cuantico_lote(matriz_transicion_rendijas_cuantico, estados_iniciales, 3)
+        probabilidades = probabilidades_de_transicion(resultado, np.eye(3), tamano_bloque=2)
+        self.assertTrue(np.allclose(probabilidades, np.abs(resultado) ** 2))
+        self.assertTrue(np.isclose(probabilidades_de_transicion(resultado[0], estados_iniciales[1]), np.abs(resultado[0, 1]) ** 2))
+
+    def test_rendijas_cuantico_metodos_de_propagacion(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        esperado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 25, metodo="iterativo")
+        for metodo in ["potencia", "espectral", "auto"]:
+            resultado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 25, metodo=metodo)
+            self.assertTrue(np.allclose(resultado, esperado, atol=1e-6))
+
+    def test_rendijas_cuantico_casi_hermitiana_muchos_pasos(self):
+        # U es unitaria pero no Hermitiana por una fase de 1e-9, que en 1e9 pasos se vuelve apreciable
+        matriz_transicion = np.diag([1, np.exp(1e-9j)])
+        vector_estado_inicial = np.array([1, 1], dtype=complex) / np.sqrt(2)
+        esperado = np.array([1, np.exp(1j)]) / np.sqrt(2)
+        limpiar_cache_espectral()
+        for metodo in ["potencia", "espectral", "auto"]:
+            resultado = rendijas_cuantico(matriz_transicion, vector_estado_inicial, 10**9, metodo=metodo)
+            self.assertTrue(np.allclose(resultado, esperado, atol=1e-6))
+
+    def test_rendijas_cuantico_lote(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        estados_iniciales = np.array([[1, 0, 0], [0, 1, 0], [0, 1j, 1]], dtype=complex)
+        resultado_lote = rendijas_cuantico_lote(matriz_transicion_rendijas_cuantico, estados_iniciales, 3)
+        self.assertEqual(resultado_lote.shape, (3, 3))
+        for estado_inicial, resultado in zip(estados_iniciales, resultado_lote):
+            esperado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, estado_inicial, 3, metodo="iterativo")
+            self.assertTrue(np.allclose(resultado, esperado, atol=1e-6))
+
+    def test_rendijas_clasico_probabilistico_disperso(self):
+        matriz_transicion_rendijas = np.array([[0, 1/2, 1/2],
+                                               [0, 1, 0],
+                                               [0, 0, 1]], dtype=float)
+        aristas = [(1, 0), (2, 0), (1, 1), (2, 2)]
+        matriz_dispersa = MatrizDispersaCSR.desde_aristas(aristas, 3, pesos=[1/2, 1/2, 1, 1])
+        self.assertTrue(np.allclose(matriz_dispersa.a_densa(), matriz_transicion_rendijas))
+        vector_probabilidades_inicial_rendijas = np.array([0.2, 0.5, 0.3], dtype=float)
+        resultado_disperso = rendijas_clasico_probabilistico(matriz_dispersa, vector_probabilidades_inicial_rendijas, 4)
+        resultado_denso = rendijas_clasico_probabilistico(matriz_transicion_rendijas, vector_probabilidades_inicial_rendijas, 4, metodo="iterativo")
+        self.assertTrue(np.allclose(resultado_disperso, resultado_denso, atol=1e-6))
+
+    def test_trayectoria_rendijas_cuantico(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        probabilidades = list(trayectoria(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 6, probabilidades=True))
+        self.assertEqual(len(probabilidades), 7)
+        for paso in [0, 1, 6]:
+            esperado = np.abs(rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, paso)) ** 2
+            self.assertTrue(np.allclose(probabilidades[paso], esperado, atol=1e-6))
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "trayectoria.npy")
+            num_filas = guardar_trayectoria(ruta, matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 6,
+                                            probabilidades=True, cada=2, tamano_bloque=3)
+            guardada = cargar_trayectoria(ruta)
+            self.assertEqual(num_filas, 4)
+            self.assertTrue(np.allclose(guardada, probabilidades[::2], atol=1e-6))
+            del guardada
+            # Un paso de submuestreo inválido se rechaza antes de crear el archivo
+            for cada in [0, -1]:
+                with self.assertRaises(ValueError):
+                    guardar_trayectoria(os.path.join(directorio, "invalida.npy"), matriz_transicion_rendijas_cuantico,
+                                        vector_estado_inicial_rendijas_cuantico, 6, cada=cada)
+            self.assertFalse(os.path.exists(os.path.join(directorio, "invalida.npy")))
+
+    def test_graficar_evolucion_rendijas_cuantico(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        with tempfile.TemporaryDirectory() as directorio:
+            num_cuadros = graficar_evolucion(trayectoria(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico,
+                                                         6, probabilidades=True),
+                                             ["Estado 0", "Estado 1", "Estado 2"], "Rendijas cuánticas",
+                                             os.path.join(directorio, "cuadro_{:02d}.png"), os.path.join(directorio, "evolucion.gif"),
+                                             cada=2, maximo=None, tamano_cola=1)
+            self.assertEqual(num_cuadros, 4)
+            self.assertEqual(sorted(os.listdir(directorio)), ["cuadro_00.png", "cuadro_02.png", "cuadro_04.png",
+                                                              "cuadro_06.png", "evolucion.gif"])
+
+    def test_graficar_trayectoria_con_memoria_acotada(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex) / np.sqrt(2)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        completa = np.array(list(trayectoria(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 100, probabilidades=True)))
+        with tempfile.TemporaryDirectory() as directorio:
+            filas, cada = graficar_trayectoria(trayectoria(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico,
+                                                           100, probabilidades=True),
+                                               ["Estado 0", "Estado 1", "Estado 2"], "Rendijas cuánticas",
+                                               os.path.join(directorio, "trayectoria.png"), cada=3, max_filas=8)
+            self.assertTrue(os.path.exists(os.path.join(directorio, "trayectoria.png")))
+        self.assertLessEqual(len(filas), 8)
+        self.assertEqual(cada % 3, 0)
+        self.assertTrue(np.allclose(filas, completa[::cada][:len(filas)]))
+        self.assertGreater(len(filas) * cada, 100 - cada)
+
+    def test_rendijas_cuantico_precision_simple(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex) / np.sqrt(2)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        esperado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 20, metodo="iterativo")
+        with precision_temporal("simple", renormalizar_cada=5):
+            resultado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 20, metodo="iterativo")
+        self.assertEqual(resultado.dtype, np.complex64)
+        self.assertTrue(np.allclose(resultado / np.linalg.norm(resultado), esperado / np.linalg.norm(esperado), atol=1e-5))
+
+    def test_rendijas_cuantico_renormalizado_con_todos_los_metodos(self):
+        # La matriz de rendijas dividida por √2 no es unitaria: sin renormalizar la norma decae
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex) / np.sqrt(2)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        esperado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 7, metodo="potencia")
+        esperado /= np.linalg.norm(esperado)
+        with precision_temporal("doble", renormalizar_cada=3):
+            for metodo in ["auto", "iterativo", "potencia", "espectral", "ciclos"]:
+                resultado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 7, metodo=metodo)
+                self.assertAlmostEqual(np.linalg.norm(resultado), 1)
+                self.assertTrue(np.allclose(resultado, esperado))
+                lote = rendijas_cuantico_lote(matriz_transicion_rendijas_cuantico, 2 * np.eye(3, dtype=complex), 7, metodo=metodo)
+                self.assertTrue(np.allclose(np.linalg.norm(lote, axis=1), 1))
+                self.assertTrue(np.allclose(lote[0], esperado))
+            disperso = propagar(MatrizDispersaCSR.desde_densa(matriz_transicion_rendijas_cuantico), vector_estado_inicial_rendijas_cuantico, 7)
+            self.assertTrue(np.allclose(disperso, esperado))
+            self.assertAlmostEqual(np.linalg.norm(propagar(matriz_transicion_rendijas_cuantico, 2 * vector_estado_inicial_rendijas_cuantico, 0)), 1)
+
+    def test_rendijas_cuantico_precision_simple_sin_pasos(self):
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        with precision_temporal("simple"):
+            resultado = propagar(np.eye(3, dtype=complex), vector_estado_inicial_rendijas_cuantico, 0)
+        self.assertEqual(resultado.dtype, np.complex64)
+        self.assertTrue(np.array_equal(resultado, vector_estado_inicial_rendijas_cuantico))
+        self.assertIs(propagar(np.eye(3, dtype=complex), vector_estado_inicial_rendijas_cuantico, 0),
+                      vector_estado_inicial_rendijas_cuantico)
+
+    def test_cota_error_precision_simple(self):
+        dimension, pasos = 64, 1000
+        unidad_redondeo = np.finfo(np.complex64).eps / 2
+        cotas = cota_error(dimension, pasos, np.complex64)
+        self.assertAlmostEqual(cotas["tipica"], pasos * np.sqrt(dimension) * unidad_redondeo)
+        self.assertAlmostEqual(cotas["peor_caso"], pasos * dimension * unidad_redondeo / (1 - dimension * unidad_redondeo))
+        self.assertLess(cotas["tipica"], cotas["peor_caso"])
+        with precision_temporal("simple"):
+            self.assertEqual(cota_error(dimension, pasos), cotas)
+
+        # Error medido de una unitaria aleatoria en precisión simple frente a doble
+        rng = np.random.default_rng(13)
+        unitaria, _ = np.linalg.qr(rng.standard_normal((dimension, dimension)) + 1j * rng.standard_normal((dimension, dimension)))
+        estado = unitaria[:, 0]
+        esperado = propagar(unitaria, estado, pasos, metodo="iterativo")
+        with precision_temporal("simple"):
+            resultado = propagar(unitaria, estado, pasos, metodo="iterativo")
+        error = np.linalg.norm(resultado - esperado)
+        self.assertLess(error, cotas["tipica"])
+        self.assertLess(error, cotas["peor_caso"])
+
+    def test_barrido_rendijas_cuantico(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        matrices = np.stack([matriz_transicion_rendijas_cuantico, np.eye(3, dtype=complex)])
+        estados_iniciales = np.eye(3, dtype=complex)
+        lista_pasos = [0, 1, 5]
+        with tempfile.TemporaryDirectory() as directorio:
+            self.assertEqual(ejecutar_barrido(matrices, lista_pasos, estados_iniciales, directorio, procesos=1, tamano_bloque=4), 2)
+            # Al reanudar un barrido completo no se recalcula ningún bloque
+            self.assertEqual(ejecutar_barrido(matrices, lista_pasos, estados_iniciales, directorio, procesos=1, tamano_bloque=4), 0)
+            resultados = cargar_resultados(directorio)
+        self.assertEqual(resultados.shape, (2, 3, 3, 3))
+        for i_pasos, pasos in enumerate(lista_pasos):
+            esperado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, estados_iniciales[1], pasos)
+            self.assertTrue(np.allclose(resultados[0, i_pasos, 1], esperado))
+        self.assertTrue(np.allclose(resultados[1, 2], estados_iniciales))
+
+    def test_barrido_rendijas_cuantico_en_varios_procesos(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex) / np.sqrt(2)
+        matrices = np.stack([matriz_transicion_rendijas_cuantico, np.eye(3, dtype=complex), matriz_transicion_rendijas_cuantico.T])
+        estados_iniciales = np.eye(3, dtype=complex)
+        lista_pasos = [0, 1, 5, 20]
+        entorno_anterior = {variable: os.environ.get(variable) for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS")}
+        with tempfile.TemporaryDirectory() as serie, tempfile.TemporaryDirectory() as paralelo:
+            self.assertEqual(ejecutar_barrido(matrices, lista_pasos, estados_iniciales, serie, procesos=1, tamano_bloque=5), 3)
+            self.assertEqual(ejecutar_barrido(matrices, lista_pasos, estados_iniciales, paralelo, procesos=2, tamano_bloque=5), 3)
+            self.assertTrue(np.allclose(cargar_resultados(paralelo), cargar_resultados(serie)))
+            # Al reanudar en paralelo solo se calcula el bloque que falta
+            os.remove(os.path.join(paralelo, "bloque_000001.npz"))
+            self.assertEqual(ejecutar_barrido(matrices, lista_pasos, estados_iniciales, paralelo, procesos=2, tamano_bloque=5), 1)
+            self.assertEqual(ejecutar_barrido(matrices, lista_pasos, estados_iniciales, paralelo, procesos=2, tamano_bloque=5), 0)
+            self.assertTrue(np.allclose(cargar_resultados(paralelo), cargar_resultados(serie)))
+        # Los hilos de BLAS solo se fijan para los trabajadores
+        self.assertEqual({variable: os.environ.get(variable) for variable in entorno_anterior}, entorno_anterior)
+
+    def test_barrido_libera_la_memoria_compartida_si_falla_un_trabajador(self):
+        creadas = []
+        crear_memoria = shared_memory.SharedMemory
+
+        def registrar_memoria(*args, **kwargs):
+            memoria = crear_memoria(*args, **kwargs)
+            creadas.append(memoria.name)
+            return memoria
+
+        with tempfile.TemporaryDirectory() as directorio, \
+                mock.patch("barrido.shared_memory.SharedMemory", side_effect=registrar_memoria):
+            # El método desconocido hace fallar a propagar dentro de cada trabajador
+            with self.assertRaises(ValueError):
+                ejecutar_barrido(np.eye(2)[np.newaxis], [1], np.eye(2), directorio, procesos=2, metodo="inexistente")
+        self.assertEqual(len(creadas), 2)
+        for nombre in creadas:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=nombre)
+
+    def test_importacion_sin_efectos_secundarios(self):
+        # Cada proceso trabajador importa estos módulos: no deben imprimir nada, ni cargar matplotlib,
+        # ni tardar más de medio segundo (sin contar numpy)
+        codigo = ("import json, sys, time, numpy\n"
+                  "inicio = time.perf_counter()\n"
+                  "import libreria_CYNT_com, teoriaCuanticaBasicaObv, clasico_a_lo_cuantico_poder_ver_grafica, barrido\n"
+                  "sys.stderr.write(json.dumps([time.perf_counter() - inicio, 'matplotlib' in sys.modules]))\n")
+        resultado = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+        duracion, matplotlib_cargado = json.loads(resultado.stderr)
+        self.assertEqual(resultado.stdout, "")
+        self.assertFalse(matplotlib_cargado)
+        self.assertLess(duracion, 0.5)
+
+    def test_instrumentacion_rendijas_cuantico(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        with instrumentacion_activa():
+            rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 4, metodo="iterativo")
+        registro = perfil()
+        self.assertEqual(registro[rendijas_cuantico.__module__ + ".rendijas_cuantico"]["llamadas"], 1)
+        # 4 productos matriz-vector complejos 3 x 3: 4 * 8 * 9 operaciones
+        self.assertEqual(registro["propagacion._propagar_iterativo"]["flops"], 288)
+        self.assertEqual(registro["propagacion._propagar_iterativo"]["formas"], {"[[3, 3], [3]]": 1})
+
+        # Con la instrumentación apagada no se registra nada
+        rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 4)
+        self.assertEqual(perfil(), registro)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "traza.json")
+            exportar_traza_chrome(ruta)
+            with open(ruta) as archivo:
+                eventos = json.load(archivo)["traceEvents"]
+        self.assertEqual(sorted(evento["name"] for evento in eventos),
+                         sorted(["propagacion._propagar_iterativo", "propagacion.propagar",
+                                 rendijas_cuantico.__module__ + ".rendijas_cuantico"]))
+
+        # Las operaciones se estiman antes de la llamada, aunque la función vacíe sus argumentos
+        @instrumentar(nombre="vaciar", flops=lambda pendientes: 8 * len(pendientes))
+        def vaciar(pendientes):
+            while pendientes:
+                pendientes.pop()
+        with instrumentacion_activa():
+            vaciar([np.eye(2)] * 3)
+        self.assertEqual(perfil()["vaciar"]["flops"], 24)
+
+    def test_instrumentacion_con_generadores_y_argumentos_por_nombre(self):
+        # Con la instrumentación activa el generador de matrices lo recorre solo la función
+        negacion = np.array([[0, 1], [1, 0]], dtype=complex)
+        vector_estado_inicial = np.array([1, 0], dtype=complex)
+        esperado = evolucion_del_sistema(vector_estado_inicial, (negacion for _ in range(3)))
+        with instrumentacion_activa():
+            resultado = evolucion_del_sistema(vector_estado_inicial, (negacion for _ in range(3)))
+            lote = evolucion_del_sistema_lote(np.eye(2, dtype=complex), (negacion for _ in range(3)))
+        self.assertTrue(np.array_equal(esperado, [0, 1]))
+        self.assertTrue(np.array_equal(resultado, esperado))
+        self.assertTrue(np.array_equal(lote, negacion))
+        registro = perfil()
+        # 3 productos complejos 2 x 2 por un vector (8 * 4) y por una matriz (8 * 8)
+        self.assertEqual(registro["teoriaCuanticaBasicaObv.evolucion_del_sistema"]["flops"], 3 * 32)
+        self.assertEqual(registro["teoriaCuanticaBasicaObv.evolucion_del_sistema_lote"]["flops"], 3 * 64)
+
+        # Los argumentos pasados por nombre llegan al estimador y se registran sus formas
+        a, b = np.ones((2, 3)), np.ones((3, 4))
+        with instrumentacion_activa():
+            self.assertEqual(matrix_multiply(matrix1=a, matrix2=b).shape, (2, 4))
+            self.assertTrue(np.array_equal(add_complex_vectors(vector1=np.ones(3), vector2=np.ones(3)), 2 * np.ones(3)))
+            self.assertEqual(tensor_product(matrix1=a, matrix2=b).shape, (6, 12))
+        registro = perfil()
+        self.assertEqual(registro["libreria_CYNT_com.matrix_multiply"]["flops"], 2 * 2 * 3 * 4)
+        self.assertEqual(registro["libreria_CYNT_com.matrix_multiply"]["formas"], {"[[2, 3], [3, 4]]": 1})
+        self.assertEqual(registro["libreria_CYNT_com.add_complex_vectors"]["flops"], 3)
+        self.assertEqual(registro["libreria_CYNT_com.tensor_product"]["flops"], 6 * 12)
+
+        # Si el estimador falla solo se pierde la métrica, no la llamada
+        @instrumentar(nombre="estimador_fallido", flops=lambda valor: valor["inexistente"])
+        def identidad(valor):
+            return valor
+        with instrumentacion_activa():
+            self.assertEqual(identidad(valor=5), 5)
+        self.assertEqual(perfil()["estimador_fallido"]["llamadas"], 1)
+        self.assertEqual(perfil()["estimador_fallido"]["flops"], 0)
+
+    def test_rendijas_cuantico_con_desfase_total_es_clasico(self):
+        # Con desfase total tras cada paso, la evolución unitaria U equivale a la clásica con |U_ij|²
+        unitaria = np.linalg.qr(np.arange(9).reshape(3, 3) + 1j * np.eye(3))[0]
+        estado = MatrizDensidad.desde_estados_puros(np.array([[1, 0, 0], [0, 0, 1]], dtype=complex))
+        for _ in range(3):
+            estado.aplicar_unitaria(unitaria).aplicar_canal(canal_desfase(1.0, 3))
+        esperado = rendijas_clasico_probabilistico(np.abs(unitaria) ** 2, np.array([[1, 0], [0, 0], [0, 1]], dtype=float), 3)
+        self.assertTrue(np.allclose(estado.probabilidades(), esperado.T))
+        self.assertTrue(np.allclose(estado.traza(), 1))
+        self.assertTrue(np.all(estado.pureza() < 1))
+
+    def test_matriz_densidad_canales_y_trazas_parciales(self):
+        rng = np.random.default_rng(18)
+        # Bell (|00⟩ + |11⟩)/√2: cada qubit por separado está en I/2, y Z⊗Z vale 1
+        bell = MatrizDensidad.desde_estados_puros(np.array([1, 0, 0, 1], dtype=complex), dimensiones=[2, 2])
+        for conservar in [0, 1]:
+            reducido = bell.traza_parcial(conservar)
+            self.assertTrue(np.allclose(reducido.rho[0], np.eye(2) / 2))
+            self.assertAlmostEqual(reducido.pureza(), 0.5)
+        z = np.diag([1, -1])
+        self.assertAlmostEqual(bell.valor_esperado(np.kron(z, z)), 1)
+        self.assertAlmostEqual(bell.valor_esperado(np.kron(z, np.eye(2))), 0)
+        self.assertTrue(np.allclose(bell.probabilidades_marginales(1), [0.5, 0.5]))
+        # |0⟩ ⊗ (√0.25 |0⟩ + √0.75 |1⟩) ⊗ |1⟩: traza parcial y marginales en el orden pedido
+        producto = np.kron(np.kron([1, 0], [0.5, np.sqrt(0.75)]), [0, 1])
+        estado = MatrizDensidad.desde_estados_puros(producto, dimensiones=[2, 2, 2])
+        self.assertTrue(np.allclose(estado.traza_parcial([0, 2]).rho[0], np.diag([0, 1, 0, 0])))
+        self.assertTrue(np.allclose(estado.probabilidades_marginales([1, 0]), np.outer([0.25, 0.75], [1, 0])))
+
+        # Despolarizante y amortiguamiento sobre estados conocidos
+        cero = MatrizDensidad.desde_estados_puros(np.array([1, 0], dtype=complex))
+        self.assertTrue(np.allclose(cero.aplicar_canal(canal_despolarizante(0.3)).rho[0], 0.7 * np.diag([1, 0]) + 0.15 * np.eye(2)))
+        uno = MatrizDensidad.desde_estados_puros(np.array([0, 1], dtype=complex))
+        self.assertTrue(np.allclose(uno.aplicar_canal(canal_amortiguamiento(1.0)).rho[0], np.diag([1, 0])))
+
+        # Un conjunto de Kraus arbitrario: bloques de una isometría aleatoria V (V† V = I)
+        isometria, _ = np.linalg.qr(rng.normal(size=(6, 2)) + 1j * rng.normal(size=(6, 2)))
+        aleatorio = [isometria[2 * k:2 * k + 2] for k in range(3)]
+        self.assertTrue(es_canal_valido(aleatorio))
+        canales = [canal_despolarizante(0.3), canal_desfase(0.4), canal_inversion_de_bit(0.25),
+                   canal_amortiguamiento(0.6), aleatorio]
+        for precision in ["doble", "simple"]:
+            with precision_temporal(precision):
+                amplitudes = rng.normal(size=(4, 4)) + 1j * rng.normal(size=(4, 4))
+                mezcla = amplitudes @ amplitudes.conj().T
+                lote = MatrizDensidad([2, 2], np.stack([mezcla / np.trace(mezcla).real, np.diag([0.1, 0.2, 0.3, 0.4])]))
+                tolerancia = 1e-5 if precision == "simple" else 1e-12
+                for canal in canales:
+                    for subsistema in [0, 1]:
+                        lote.aplicar_canal(canal, subsistema)
+                        self.assertTrue(np.allclose(lote.traza(), 1, atol=tolerancia))
+                        self.assertTrue(np.all(np.linalg.eigvalsh(lote.rho) >= -tolerancia))
+
+        # Un conjunto que no conserva la traza se rechaza, salvo que no se valide
+        no_conserva = [np.sqrt(0.9) * np.eye(2)]
+        self.assertFalse(es_canal_valido(no_conserva))
+        with self.assertRaises(ValueError):
+            MatrizDensidad.desde_estados_puros(np.array([1, 0], dtype=complex)).aplicar_canal(no_conserva)
+        reducido = MatrizDensidad.desde_estados_puros(np.array([1, 0], dtype=complex)).aplicar_canal(no_conserva, validar=False)
+        self.assertAlmostEqual(reducido.traza(), 0.9)
+
+    def test_punto_de_control_rendijas_cuantico(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        vector_estado_inicial_rendijas_cuantico = np.array([1, 0, 0], dtype=complex)
+        esperado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, vector_estado_inicial_rendijas_cuantico, 7)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_matriz = os.path.join(directorio, "matriz.cchk")
+            ruta_estado = os.path.join(directorio, "estado.cchk")
+            guardar(ruta_matriz, matriz_transicion_rendijas_cuantico, base_propia=True)
+            guardar(ruta_estado, vector_estado_inicial_rendijas_cuantico)
+            limpiar_cache_espectral()
+            matriz = cargar(ruta_matriz)
+            estado = cargar(ruta_estado)
+            self.assertIsInstance(matriz, np.memmap)
+            resultado = rendijas_cuantico(matriz, estado, 7, metodo="espectral")
+            del matriz, estado
+        self.assertTrue(np.allclose(resultado, esperado))
+
+    def test_cabecera_de_punto_de_control(self):
+        objetos = [
+            (SistemaCuantico(3, np.array([1, 0, 0], dtype=complex)), "sistema", 3, np.complex128),
+            (EstadoTensorial([2] * 5), "estado_tensorial", 32, np.complex128),
+            (MatrizDispersaCSR.desde_densa(np.eye(1000)), "dispersa", 1000, np.float64),
+            (Tensor([Matriz(np.eye(2)), Matriz(np.eye(8, dtype=complex))]), "tensor", 16, np.complex128),
+            (Observable(np.diag([1.0, 2.0, 3.0])), "observable", 3, np.float64),
+            (OperadorVerificado(np.eye(4, dtype=np.complex64), es_unitaria=True), "operador_verificado", 4, np.complex64),
+            (np.eye(6, dtype=np.float32), "densa", 6, np.float32),
+        ]
+        with tempfile.TemporaryDirectory() as directorio:
+            for indice, (objeto, tipo, dimension, dtype) in enumerate(objetos):
+                ruta = os.path.join(directorio, f"{indice}.cchk")
+                guardar(ruta, objeto)
+                cabecera = leer_cabecera(ruta)
+                self.assertEqual((cabecera["tipo"], cabecera["dimension"]), (tipo, dimension))
+                self.assertEqual(np.dtype(cabecera["dtype"]), np.dtype(dtype))
+
+    def test_punto_de_control_conserva_base_propia_y_propiedades(self):
+        rng = np.random.default_rng(19)
+        aleatoria = rng.normal(size=(4, 4)) + 1j * rng.normal(size=(4, 4))
+        observable = Observable(aleatoria + aleatoria.conj().T)
+        unitaria, _ = np.linalg.qr(aleatoria)
+        operador = OperadorVerificado(unitaria)
+        self.assertTrue(operador.es_unitaria())
+        estado = np.array([1, 0, 0, 0], dtype=complex)
+        with tempfile.TemporaryDirectory() as directorio:
+            rutas = [os.path.join(directorio, f"{nombre}.cchk") for nombre in ["observable", "operador", "vector"]]
+            guardar(rutas[0], observable, base_propia=True)
+            guardar(rutas[1], operador)
+            # Un vector no tiene base propia: base_propia se ignora
+            guardar(rutas[2], estado, base_propia=True)
+            self.assertEqual(set(leer_cabecera(rutas[2])["arreglos"]), {"matriz"})
+
+            # Al cargar no se vuelve a diagonalizar ni a comprobar nada
+            with mock.patch("numpy.linalg.eigh", side_effect=AssertionError("se volvió a diagonalizar")), \
+                    mock.patch("propiedades.es_unitaria_por_bloques", side_effect=AssertionError("se volvió a comprobar")):
+                cargado = cargar(rutas[0])
+                self.assertTrue(cargado.esta_diagonalizado)
+                self.assertTrue(np.allclose(cargado.autovalores, observable.autovalores))
+                self.assertTrue(np.allclose(cargado.media_y_varianza(estado), observable.media_y_varianza(estado)))
+                self.assertIs(obtener_observable(observable.matriz), cargado)
+                operador_cargado = cargar(rutas[1])
+                self.assertEqual(operador_cargado.propiedades_verificadas(), {"es_unitaria": True})
+                self.assertTrue(operador_cargado.es_unitaria())
+            self.assertTrue(np.array_equal(cargar(rutas[2]), estado))
+            del cargado, operador_cargado
+
+    def test_cache_de_observables_no_cambia_con_la_matriz_original(self):
+        matriz = np.diag([1.0, 2.0, 3.0])
+        observable = obtener_observable(matriz)
+        matriz[1, 1] = 5
+        self.assertFalse(observable.matriz.flags.writeable)
+        self.assertTrue(np.allclose(media_y_varianza(np.diag([1.0, 2.0, 3.0]), np.array([0, 1, 0], dtype=complex)), (2.0, 0.0)))
+
+    def test_operadores_perezosos_contra_densos(self):
+        rng = np.random.default_rng(0)
+        a, b = rng.normal(size=(3, 4)) + 1j * rng.normal(size=(3, 4)), rng.normal(size=(4, 2))
+        c, d = rng.normal(size=(3, 2)) + 1j * rng.normal(size=(3, 2)), rng.normal(size=(2, 2))
+        columnas = rng.normal(size=(2, 5))
+        e = np.where(rng.random((3, 4)) < 0.5, 0, rng.normal(size=(3, 4)) + 1j * rng.normal(size=(3, 4)))
+        dispersa = MatrizDispersaCSR.desde_densa(e)
+        expresiones = [
+            (Matriz(a) @ Matriz(b), a @ b),
+            (Matriz(a) @ b + Matriz(c), a @ b + c),
+            (2j * (Matriz(a) @ b) - Matriz(c), 2j * (a @ b) - c),
+            (Matriz(a).H, a.conj().T),
+            ((Matriz(a) @ b).H @ Matriz(c), (a @ b).conj().T @ c),
+            (Tensor([Matriz(c), Matriz(d)]), np.kron(c, d)),
+            (Tensor([Matriz(c), Matriz(d)]).H, np.kron(c, d).conj().T),
+            (Matriz(dispersa).H, e.conj().T),
+            (Matriz(dispersa).H @ Matriz(c) + Matriz(b), e.conj().T @ c + b),
+        ]
+        for expresion, densa in expresiones:
+            self.assertTrue(np.allclose(expresion.evaluar(), densa))
+            vector = rng.normal(size=densa.shape[1]) + 1j * rng.normal(size=densa.shape[1])
+            fila = rng.normal(size=densa.shape[0]) + 1j * rng.normal(size=densa.shape[0])
+            self.assertTrue(np.allclose(expresion @ vector, densa @ vector))
+            self.assertTrue(np.allclose(fila @ expresion, fila @ densa))
+        self.assertTrue(np.allclose((Matriz(a) @ b @ d).aplicar(columnas), a @ b @ d @ columnas))
+        # El adjunto de una hoja dispersa no se convierte en matriz densa
+        self.assertIsInstance(Matriz(dispersa).H.matriz, MatrizDispersaCSR)
+        self.assertTrue(np.array_equal(dispersa.adjunta().a_densa(), e.conj().T))
+        # Cadena clásica A1..A6 (30x35, 35x15, 15x5, 5x10, 10x20, 20x25): ((A1 (A2 A3)) ((A4 A5) A6)), 15125 multiplicaciones
+        dimensiones = [30, 35, 15, 5, 10, 20, 25]
+        formas = list(zip(dimensiones, dimensiones[1:]))
+        self.assertEqual(orden_de_contraccion(formas), (((0, (1, 2)), ((3, 4), 5)), 15125))
+        matrices = [rng.normal(size=forma) for forma in formas]
+        cadena = Matriz(matrices[0]) @ Matriz(matrices[1])
+        for matriz in matrices[2:]:
+            cadena = cadena @ Matriz(matriz)
+        self.assertTrue(np.allclose(cadena.evaluar(), np.linalg.multi_dot(matrices)))
+
+    def test_evolucion_hamiltoniana_contra_diagonalizacion(self):
+        rng = np.random.default_rng(1)
+        aleatoria = rng.normal(size=(12, 12)) + 1j * rng.normal(size=(12, 12))
+        hamiltoniano = (aleatoria + aleatoria.conj().T) / 2
+        autovalores, autovectores = np.linalg.eigh(hamiltoniano)
+
+        def exacta(estados, tiempo):
+            return autovectores @ (np.exp(-1j * autovalores * tiempo)[:, np.newaxis] * (autovectores.conj().T @ estados.reshape(12, -1)))
+
+        estado = rng.normal(size=12) + 1j * rng.normal(size=12)
+        lote = rng.normal(size=(12, 3)) + 1j * rng.normal(size=(12, 3))
+        for metodo in ["lanczos", "taylor"]:
+            self.assertTrue(np.allclose(evolucionar_hamiltoniano(hamiltoniano, estado, 0.0, metodo), estado))
+            for tiempo in [0.1, 2.5, -1.0]:
+                resultado = evolucionar_hamiltoniano(hamiltoniano, estado, tiempo, metodo, tolerancia=1e-10)
+                self.assertTrue(np.allclose(resultado, exacta(estado, tiempo)[:, 0], atol=1e-8))
+            resultado = evolucionar_hamiltoniano(hamiltoniano, lote, 1.5, metodo, tolerancia=1e-10)
+            self.assertTrue(np.allclose(resultado, exacta(lote, 1.5), atol=1e-8))
+            tiempos = [0.0, 0.3, 1.0]
+            estados = evolucion_temporal(hamiltoniano, estado, tiempos, metodo=metodo, tolerancia=1e-10)
+            self.assertTrue(np.allclose(estados, np.array([exacta(estado, t)[:, 0] for t in tiempos]), atol=1e-8))
+
+        # Estado en un subespacio invariante de dimensión 2: la base de Krylov se corta y basta un paso
+        invariante = autovectores[:, 3] + 2j * autovectores[:, 7]
+        resultado, info = evolucionar_hamiltoniano(hamiltoniano, invariante, 50.0, "lanczos", devolver_info=True)
+        self.assertEqual(info["pasos"], 1)
+        self.assertTrue(np.allclose(resultado, exacta(invariante, 50.0)[:, 0], atol=1e-8))
+
+    def test_propiedades_por_bloques_y_probabilisticas(self):
+        rng = np.random.default_rng(2)
+        aleatoria = rng.normal(size=(10, 10)) + 1j * rng.normal(size=(10, 10))
+        for dtype in [np.complex128, np.complex64]:
+            hermitiana = ((aleatoria + aleatoria.conj().T) / 2).astype(dtype)
+            unitaria = np.linalg.qr(aleatoria)[0].astype(dtype)
+            # Una entrada alterada en el último bloque (tamano_bloque=3 no divide a 10)
+            no_hermitiana, no_unitaria = hermitiana.copy(), unitaria.copy()
+            no_hermitiana[9, 2] += 0.1
+            no_unitaria[9, 9] *= 1.01
+            self.assertTrue(es_hermitiana_por_bloques(hermitiana, tamano_bloque=3))
+            self.assertFalse(es_hermitiana_por_bloques(no_hermitiana, tamano_bloque=3))
+            self.assertTrue(es_unitaria_por_bloques(unitaria, tamano_bloque=3))
+            self.assertFalse(es_unitaria_por_bloques(no_unitaria, tamano_bloque=3))
+            self.assertFalse(es_unitaria_por_bloques(hermitiana))
+            for semilla in range(5):
+                self.assertTrue(es_hermitiana_probabilistica(hermitiana, semilla=semilla))
+                self.assertFalse(es_hermitiana_probabilistica(no_hermitiana, semilla=semilla))
+                self.assertTrue(es_unitaria_probabilistica(unitaria, semilla=semilla))
+                self.assertFalse(es_unitaria_probabilistica(no_unitaria, semilla=semilla))
+            self.assertFalse(es_unitaria_probabilistica(unitaria[:, :9]))
+
+            operador = OperadorVerificado(unitaria)
+            self.assertTrue(operador.es_unitaria("probabilistico"))
+            self.assertEqual(operador.propiedades_verificadas(), {})
+            self.assertTrue(operador.es_unitaria())
+            self.assertFalse(operador.es_hermitiana())
+            self.assertEqual(operador.propiedades_verificadas(), {"es_unitaria": True, "es_hermitiana": False})
+            # Las propiedades conocidas no se vuelven a comprobar
+            self.assertTrue(OperadorVerificado(no_unitaria, es_unitaria=True).es_unitaria("probabilistico"))
+
+    def test_estado_tensorial_contra_producto_de_kronecker(self):
+        rng = np.random.default_rng(3)
+        dimensiones = [2, 3, 2, 2]
+        estado = rng.normal(size=24) + 1j * rng.normal(size=24)
+        for subsistemas in [[3, 0], [2], [1, 3], [3, 1, 0]]:
+            dimension_local = int(np.prod([dimensiones[s] for s in subsistemas]))
+            operador = rng.normal(size=(dimension_local, dimension_local)) + 1j * rng.normal(size=(dimension_local, dimension_local))
+            # Operador completo: operador ⊗ I en el orden (subsistemas, resto), y luego se regresa al orden original
+            resto = [eje for eje in range(4) if eje not in subsistemas]
+            orden = subsistemas + resto
+            completo = np.kron(operador, np.eye(int(np.prod([dimensiones[eje] for eje in resto]))))
+            permutado = np.transpose(estado.reshape(dimensiones), orden).reshape(-1)
+            esperado = np.transpose((completo @ permutado).reshape([dimensiones[eje] for eje in orden]), np.argsort(orden)).reshape(-1)
+            self.assertTrue(np.allclose(aplicar_operador_local(estado, operador, subsistemas, dimensiones), esperado))
+            for tamano_bloque in [1, 4, 1 << 16]:
+                sistema = EstadoTensorial(dimensiones, estado)
+                vector = sistema.vector()
+                sistema.aplicar(operador, subsistemas, tamano_bloque=tamano_bloque)
+                self.assertTrue(np.allclose(vector, esperado))
+        producto = EstadoTensorial(dimensiones, estado).aplicar_producto([np.eye(2), None, np.array([[0, 1], [1, 0]]), None])
+        self.assertTrue(np.allclose(producto.vector(), np.kron(np.kron(np.eye(6), np.array([[0, 1], [1, 0]])), np.eye(2)) @ estado))
+
+    def test_muestreo_rendijas_cuantico(self):
+        matriz_transicion_rendijas_cuantico = np.array([[0, 1/np.sqrt(2), 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 0, 1/np.sqrt(2)],
+                                                        [1/np.sqrt(2), 1/np.sqrt(2), 0]], dtype=complex)
+        estado = rendijas_cuantico(matriz_transicion_rendijas_cuantico, np.array([1, 0.5j, 0], dtype=complex), 3)
+        sistema = SistemaCuantico(3, estado)
+        distribucion = sistema.distribucion_de_posiciones()
+        self.assertTrue(np.isclose(distribucion.sum(), 1))
+
+        muestras = sistema.muestrear(200000, semilla=7)
+        self.assertTrue(np.array_equal(muestras, sistema.muestrear(200000, semilla=7)))
+        self.assertTrue(np.array_equal(muestras, sistema.muestrear(200000, semilla=np.random.default_rng(7))))
+        self.assertTrue(np.allclose(np.bincount(muestras, minlength=3) / len(muestras), distribucion, atol=0.01))
+
+        conteos = sistema.histograma(200000, semilla=7)
+        self.assertEqual(conteos.sum(), 200000)
+        self.assertTrue(np.allclose(conteos / 200000, distribucion, atol=0.01))
+
+        # Cada sistema recibe su propia semilla derivada: sistemas iguales dan histogramas distintos,
+        # y el resultado no depende del número de procesos
+        sistemas = [sistema, sistema, SistemaCuantico(2, np.array([1, 1j]) / np.sqrt(2))]
+        en_serie = histogramas_en_lote(sistemas, 1000, semilla=11)
+        self.assertEqual(en_serie.shape, (3, 3))
+        self.assertTrue(np.array_equal(en_serie.sum(axis=1), [1000, 1000, 1000]))
+        self.assertEqual(en_serie[2, 2], 0)
+        self.assertFalse(np.array_equal(en_serie[0], en_serie[1]))
+        self.assertTrue(np.array_equal(en_serie, histogramas_en_lote(sistemas, 1000, semilla=11)))
+        self.assertTrue(np.array_equal(en_serie, histogramas_en_lote(sistemas, 1000, semilla=11, procesos=2)))
+
+    def test_medias_y_varianzas_en_lote(self):
+        rng = np.random.default_rng(4)
+        aleatorias = rng.normal(size=(3, 4, 4)) + 1j * rng.normal(size=(3, 4, 4))
+        observables = (aleatorias + np.conj(np.swapaxes(aleatorias, 1, 2))) / 2
+        estados = rng.normal(size=(5, 4)) + 1j * rng.normal(size=(5, 4))
+        estados /= np.linalg.norm(estados, axis=1, keepdims=True)
+        for tamano_bloque in [None, 2]:
+            medias, varianzas = medias_y_varianzas(observables, estados, tamano_bloque)
+            self.assertEqual(medias.shape, (5, 3))
+            for n, estado in enumerate(estados):
+                for k, observable in enumerate(observables):
+                    self.assertTrue(np.allclose((medias[n, k], varianzas[n, k]), media_y_varianza(observable, estado)))
+        media, varianza = medias_y_varianzas(observables[0], estados[0])
+        self.assertTrue(np.allclose((media, varianza), media_y_varianza(observables[0], estados[0])))
+        medias, varianzas = medias_y_varianzas(observables, np.empty((0, 4), dtype=complex))
+        self.assertEqual((medias.shape, varianzas.shape), ((0, 3), (0, 3)))
+        self.assertIsNone(medias_y_varianzas(aleatorias, estados))
+        # En precisión simple se acepta el mismo redondeo que en el resto de la API (numpy.allclose no lo aceptaba)
+        simples = observables.astype(np.complex64)
+        simples[:, 0, 1] += 1e-4
+        self.assertIsNotNone(obtener_observable(simples[0]))
+        medias, varianzas = medias_y_varianzas(simples, estados.astype(np.complex64))
+        self.assertTrue(np.allclose(medias, medias_y_varianzas(observables, estados)[0], atol=1e-3))
+        # Se aceptan objetos Observable, y una matriz ya vista se toma de la caché
+        self.assertIs(obtener_observable(observables[1]), obtener_observable(observables[1].copy()))
+        medias, _ = medias_y_varianzas([Observable(observables[0]), observables[1]], estados)
+        self.assertEqual(medias.shape, (5, 2))
+        self.assertTrue(np.allclose(medias_y_varianzas(Observable(observables[2]), estados)[0],
+                                    medias_y_varianzas(observables[2], estados)[0]))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
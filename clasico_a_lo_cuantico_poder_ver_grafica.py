@@ -1,36 +1,49 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from canicas_bits import MatrizBooleana
+from graficas import importar_pyplot
+from instrumentacion import instrumentar
+from propagacion import propagar, propagar_lote
 
 # Experimento de las canicas con coeficiente booleanos
-def canicas_booleanas(matriz_transicion, vector_estado_inicial, pasos):
-    estado_actual = vector_estado_inicial
-    for _ in range(pasos):
-        estado_actual = np.dot(matriz_transicion, estado_actual)
-    return estado_actual
+@instrumentar()
+def canicas_booleanas(matriz_transicion, vector_estado_inicial, pasos, metodo="auto"):
+    return propagar(matriz_transicion, vector_estado_inicial, pasos, metodo)
+
+# Experimento de las canicas con coeficientes booleanos verdaderos (OR de ANDs sobre bits),
+# para un estado (d,) o un lote de configuraciones iniciales (N, d)
+@instrumentar()
+def canicas_booleanas_bits(matriz_transicion, vector_estado_inicial, pasos):
+    return MatrizBooleana(matriz_transicion).evolucionar(vector_estado_inicial, pasos)
 
 # Experimento de las múltiples rendijas clásico probabilístico
-def rendijas_clasico_probabilistico(matriz_transicion, vector_probabilidades_inicial, pasos):
-    estado_actual = vector_probabilidades_inicial
-    for _ in range(pasos):
-        estado_actual = np.dot(matriz_transicion, estado_actual)
-    return estado_actual
+@instrumentar()
+def rendijas_clasico_probabilistico(matriz_transicion, vector_probabilidades_inicial, pasos, metodo="auto"):
+    return propagar(matriz_transicion, vector_probabilidades_inicial, pasos, metodo)
 
 # Experimento de las múltiples rendijas cuántico
-def rendijas_cuantico(matriz_transicion, vector_estado_inicial, pasos):
-    estado_actual = vector_estado_inicial
-    for _ in range(pasos):
-        estado_actual = np.dot(matriz_transicion, estado_actual)
-    return estado_actual
+@instrumentar()
+def rendijas_cuantico(matriz_transicion, vector_estado_inicial, pasos, metodo="auto"):
+    return propagar(matriz_transicion, vector_estado_inicial, pasos, metodo)
+
+# Experimento de las múltiples rendijas cuántico para un lote (N, d) de estados iniciales
+@instrumentar()
+def rendijas_cuantico_lote(matriz_transicion, estados_iniciales, pasos, metodo="auto"):
+    return propagar_lote(matriz_transicion, estados_iniciales, pasos, metodo)
 
-# Función para graficar un vector de estados
-def graficar_probabilidades(vector_estado, etiquetas, titulo, nombre_archivo):
+# Función para graficar un vector de estados; con mostrar=False solo se guarda el archivo, sin
+# bloquear (para la evolución paso a paso, ver graficas.graficar_evolucion y graficas.graficar_trayectoria)
+def graficar_probabilidades(vector_estado, etiquetas, titulo, nombre_archivo, mostrar=True):
+    plt = importar_pyplot()
     plt.bar(range(len(vector_estado)), vector_estado)
     plt.xticks(range(len(etiquetas)), etiquetas)
     plt.title(titulo)
     plt.xlabel("Estado")
     plt.ylabel("Probabilidad")
     plt.savefig(nombre_archivo)
-    plt.show()
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
 
 # Ejemplo de uso
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+import numpy as np
+
+# Número de amplitudes que EstadoTensorial.aplicar actualiza por bloque: la memoria temporal
+# depende de este tamaño y no del tamaño del estado
+TAMANO_BLOQUE = 1 << 16
+
+
+def aplicar_operador_local(estado, operador, subsistemas, dimensiones):
+    """
+    Aplica un operador sobre algunos subsistemas de un estado compuesto sin formar el producto tensor.
+
+    Equivale a multiplicar el estado por I ⊗ ... ⊗ operador ⊗ ... ⊗ I, pero el estado se
+    trata como un tensor con un eje por subsistema y solo se contraen los ejes elegidos.
+
+    Parámetros:
+    - estado (numpy.ndarray): Vector de longitud prod(dimensiones) (o el tensor con forma dimensiones).
+    - operador (numpy.ndarray): Matriz (D, D) con D el producto de las dimensiones de los subsistemas elegidos.
+    - subsistemas (list of int): Índices de los subsistemas sobre los que actúa el operador, en el orden
+      en que aparecen en su producto tensor.
+    - dimensiones (list of int): Dimensión de cada subsistema.
+
+    Retorna:
+    - estado (numpy.ndarray): El nuevo estado (un arreglo nuevo), con la misma forma que la entrada.
+    """
+    dimensiones = tuple(int(d) for d in dimensiones)
+    subsistemas = [int(s) for s in subsistemas]
+    if len(set(subsistemas)) != len(subsistemas):
+        raise ValueError("Los subsistemas no pueden repetirse")
+    dimensiones_locales = tuple(dimensiones[s] for s in subsistemas)
+    dimension_local = int(np.prod(dimensiones_locales))
+    operador = np.asarray(operador)
+    if operador.shape != (dimension_local, dimension_local):
+        raise ValueError(f"El operador debe ser ({dimension_local}, {dimension_local}) para los subsistemas {subsistemas}")
+
+    tensor = np.reshape(estado, dimensiones)
+    operador_tensor = operador.reshape(dimensiones_locales + dimensiones_locales)
+    n = len(subsistemas)
+    # Los ejes de salida del operador quedan al frente; se devuelven a su posición original
+    resultado = np.tensordot(operador_tensor, tensor, axes=(list(range(n, 2 * n)), subsistemas))
+    resultado = np.moveaxis(resultado, list(range(n)), subsistemas)
+    return resultado.reshape(np.shape(estado))
+
+
+class EstadoTensorial:
+    def __init__(self, dimensiones, estado=None, dtype=complex):
+        """
+        Inicializa el estado de un sistema compuesto por varios subsistemas.
+
+        El estado se guarda como un tensor con un eje por subsistema, de modo que los
+        operadores locales se aplican sin construir operadores de tamaño d^n x d^n.
+
+        Parámetros:
+        - dimensiones (list of int): Dimensión de cada subsistema.
+        - estado (numpy.ndarray, opcional): Vector de longitud prod(dimensiones). Si se omite,
+          el sistema empieza en |0...0⟩.
+        - dtype (numpy.dtype): Tipo de dato del estado.
+        """
+        self.dimensiones = tuple(int(d) for d in dimensiones)
+        if estado is None:
+            self.tensor = np.zeros(self.dimensiones, dtype=dtype)
+            self.tensor[(0,) * len(self.dimensiones)] = 1
+        else:
+            estado = np.asarray(estado, dtype=dtype)
+            if estado.size != int(np.prod(self.dimensiones)):
+                raise ValueError("El tamaño del estado no coincide con las dimensiones de los subsistemas")
+            self.tensor = estado.reshape(self.dimensiones).copy()
+
+    @classmethod
+    def desde_producto(cls, estados, dtype=complex):
+        """
+        Construye el estado producto |ψ1⟩ ⊗ |ψ2⟩ ⊗ ... de varios subsistemas.
+
+        Parámetros:
+        - estados (list of numpy.ndarray): Vector de estado de cada subsistema.
+        - dtype (numpy.dtype): Tipo de dato del estado.
+
+        Retorna:
+        - estado (EstadoTensorial): El estado compuesto.
+        """
+        tensor = np.ones((), dtype=dtype)
+        for estado in estados:
+            tensor = np.multiply.outer(tensor, np.asarray(estado, dtype=dtype))
+        return cls(tensor.shape, tensor, dtype=dtype)
+
+    @property
+    def num_subsistemas(self):
+        return len(self.dimensiones)
+
+    def aplicar(self, operador, subsistemas, tamano_bloque=TAMANO_BLOQUE):
+        """
+        Aplica un operador local sobre los subsistemas indicados, sobrescribiendo el estado.
+
+        El operador no mezcla los índices de los demás subsistemas, así que el tensor se recorre
+        por bloques (fijando los índices de algunos subsistemas no afectados) y cada bloque se
+        escribe de vuelta en el mismo arreglo: la memoria temporal es la de un bloque, no la del
+        estado, y las vistas obtenidas con vector() siguen siendo válidas.
+
+        Parámetros:
+        - operador (numpy.ndarray): Matriz (D, D) que actúa sobre los subsistemas elegidos.
+        - subsistemas (int or list of int): Subsistema o subsistemas sobre los que actúa el operador.
+        - tamano_bloque (int): Número aproximado de amplitudes actualizadas a la vez.
+
+        Retorna:
+        - estado (EstadoTensorial): El mismo objeto, para encadenar operaciones.
+        """
+        if np.ndim(subsistemas) == 0:
+            subsistemas = [subsistemas]
+        subsistemas = [int(s) for s in subsistemas]
+        # Ejes no afectados que se fijan, hasta que el bloque restante sea suficientemente pequeño
+        externos = []
+        tamano = self.tensor.size
+        for eje in range(self.num_subsistemas):
+            if tamano <= tamano_bloque:
+                break
+            if eje not in subsistemas:
+                externos.append(eje)
+                tamano //= self.dimensiones[eje]
+        restantes = [eje for eje in range(self.num_subsistemas) if eje not in externos]
+        locales = [restantes.index(s) for s in subsistemas]
+        dimensiones_bloque = [self.dimensiones[eje] for eje in restantes]
+        vista = np.moveaxis(self.tensor, externos, list(range(len(externos))))
+        for indice in np.ndindex(*vista.shape[:len(externos)]):
+            bloque = vista[indice]
+            bloque[...] = aplicar_operador_local(bloque, operador, locales, dimensiones_bloque)
+        return self
+
+    def aplicar_producto(self, operadores):
+        """
+        Aplica el operador A1 ⊗ A2 ⊗ ... ⊗ An sin formar su producto de Kronecker.
+
+        Parámetros:
+        - operadores (list of numpy.ndarray or None): Un operador por subsistema; None equivale a la identidad.
+
+        Retorna:
+        - estado (EstadoTensorial): El mismo objeto, para encadenar operaciones.
+        """
+        if len(operadores) != self.num_subsistemas:
+            raise ValueError("Debe haber un operador por subsistema")
+        for subsistema, operador in enumerate(operadores):
+            if operador is not None:
+                self.aplicar(operador, subsistema)
+        return self
+
+    def vector(self):
+        """
+        Retorna:
+        - estado (numpy.ndarray): El estado como vector de longitud prod(dimensiones) (sin copiar).
+        """
+        return self.tensor.reshape(-1)
+
+    def norma(self):
+        """
+        Retorna:
+        - norma (float): La norma del estado.
+        """
+        return np.linalg.norm(self.tensor.reshape(-1))
+
+    def probabilidades(self):
+        """
+        Retorna:
+        - probabilidades (numpy.ndarray): Probabilidad de cada estado de la base computacional.
+        """
+        return np.abs(self.tensor.reshape(-1)) ** 2
+
+    def probabilidades_marginales(self, subsistemas):
+        """
+        Calcula la distribución de probabilidad de medir solo algunos subsistemas.
+
+        Parámetros:
+        - subsistemas (int or list of int): Subsistemas que se miden.
+
+        Retorna:
+        - probabilidades (numpy.ndarray): Arreglo con un eje por subsistema medido, en el orden dado.
+        """
+        if np.ndim(subsistemas) == 0:
+            subsistemas = [subsistemas]
+        subsistemas = [int(s) for s in subsistemas]
+        resto = tuple(eje for eje in range(self.num_subsistemas) if eje not in subsistemas)
+        marginales = np.sum(np.abs(self.tensor) ** 2, axis=resto)
+        # Tras sumar, los ejes restantes quedan en orden creciente
+        return np.transpose(marginales, np.argsort(np.argsort(subsistemas)))
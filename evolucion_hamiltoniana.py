@@ -0,0 +1,216 @@
+import numpy as np
+
+from matriz_dispersa import MatrizDispersaCSR
+from precision import ajustar_precision, tipo_complejo, tolerancia_por_defecto
+from propiedades import es_hermitiana_probabilistica
+
+# Métodos disponibles para calcular e^{-iHt} ψ
+METODOS = ("lanczos", "taylor")
+
+# Dimensión máxima del subespacio de Krylov en cada paso de Lanczos
+DIMENSION_KRYLOV = 30
+
+# Número máximo de términos de la serie de Taylor en cada subpaso
+TERMINOS_TAYLOR = 60
+
+
+def _aplicador(hamiltoniano):
+    # Acepta numpy.ndarray, MatrizDispersaCSR u operadores perezosos (con aplicar)
+    if hasattr(hamiltoniano, "aplicar"):
+        return hamiltoniano.aplicar
+    if not hasattr(hamiltoniano, "dot"):
+        hamiltoniano = np.asarray(hamiltoniano)
+    return hamiltoniano.dot
+
+
+def _estimar_norma(hamiltoniano, aplicar, dimension, semilla=0):
+    # Norma 1 exacta cuando la matriz está disponible; si no, iteración de potencias con margen
+    if isinstance(hamiltoniano, np.ndarray):
+        return np.abs(hamiltoniano).sum(axis=0).max()
+    if isinstance(hamiltoniano, MatrizDispersaCSR):
+        return np.bincount(hamiltoniano.indices, np.abs(hamiltoniano.datos), minlength=dimension).max()
+    vector = np.random.default_rng(semilla).standard_normal(dimension) + 0j
+    estimacion = 0.0
+    for _ in range(20):
+        vector = vector / np.linalg.norm(vector)
+        vector = aplicar(vector)
+        estimacion = np.linalg.norm(vector)
+    return 2 * estimacion
+
+
+def _base_de_krylov(aplicar, estado, dimension_krylov):
+    """
+    Construye la base de Lanczos del subespacio de Krylov generado por H y el estado.
+
+    Retorna:
+    - base (numpy.ndarray): Vectores ortonormales (k, d) de la base.
+    - alfas, betas (numpy.ndarray): Diagonal y subdiagonal de la matriz tridiagonal T = V† H V.
+    - beta_siguiente (float): Norma del residuo tras el último vector (0 si el subespacio es invariante).
+    """
+    norma = np.linalg.norm(estado)
+    base = np.empty((dimension_krylov, len(estado)), dtype=np.result_type(estado.dtype, np.complex64))
+    base[0] = estado / norma
+    alfas, betas = [], []
+    beta_siguiente = 0.0
+    for j in range(dimension_krylov):
+        w = aplicar(base[j])
+        alfa = np.real(np.vdot(base[j], w))
+        w = w - alfa * base[j]
+        if j:
+            w = w - betas[-1] * base[j - 1]
+        # Reortogonalización completa: con k pequeño es barata y evita perder ortogonalidad
+        w = w - np.dot(base[:j + 1].T, np.dot(base[:j + 1].conj(), w))
+        alfas.append(alfa)
+        beta_siguiente = np.linalg.norm(w)
+        if beta_siguiente <= 1e-12 * max(abs(alfa), 1.0) or j == dimension_krylov - 1:
+            break
+        betas.append(beta_siguiente)
+        base[j + 1] = w / beta_siguiente
+    if beta_siguiente <= 1e-12 * max(abs(alfas[-1]), 1.0):
+        beta_siguiente = 0.0
+    return base[:len(alfas)], np.array(alfas), np.array(betas), beta_siguiente
+
+
+def _paso_lanczos(aplicar, estado, tiempo_restante, paso_sugerido, tolerancia_por_tiempo, dimension_krylov):
+    norma = np.linalg.norm(estado)
+    base, alfas, betas, beta_siguiente = _base_de_krylov(aplicar, estado, dimension_krylov)
+    tridiagonal = np.diag(alfas) + np.diag(betas, 1) + np.diag(betas, -1)
+    autovalores, autovectores = np.linalg.eigh(tridiagonal)
+
+    # La base no depende del paso: si el error es grande se reduce el paso reutilizándola
+    paso = min(paso_sugerido, abs(tiempo_restante)) * np.sign(tiempo_restante)
+    while True:
+        coeficientes = np.dot(autovectores, np.exp(-1j * autovalores * paso) * autovectores[0].conj())
+        error = norma * beta_siguiente * abs(coeficientes[-1])
+        if error <= tolerancia_por_tiempo * abs(paso) or beta_siguiente == 0.0:
+            break
+        paso *= 0.5
+    return norma * np.dot(base.T, coeficientes.astype(base.dtype)), paso, error
+
+
+def _paso_taylor(aplicar, estado, paso, tolerancia):
+    termino = estado
+    suma = estado.astype(np.result_type(estado.dtype, np.complex64))
+    for k in range(1, TERMINOS_TAYLOR + 1):
+        termino = (-1j * paso / k) * aplicar(termino)
+        suma = suma + termino
+        norma_termino = np.linalg.norm(termino)
+        if norma_termino <= tolerancia * np.linalg.norm(suma):
+            return suma, True, norma_termino
+    return suma, False, norma_termino
+
+
+def evolucionar_hamiltoniano(hamiltoniano, estado_inicial, tiempo, metodo="lanczos", tolerancia=None,
+                             dimension_krylov=DIMENSION_KRYLOV, tolerancia_norma=None, devolver_info=False):
+    """
+    Calcula e^{-iHt} ψ directamente a partir del Hamiltoniano, sin formar la exponencial d x d.
+
+    Con "lanczos" se proyecta H sobre un subespacio de Krylov pequeño en cada paso y el tamaño
+    del paso se ajusta con una estimación a posteriori del error. Con "taylor" se suma la serie
+    truncada de la exponencial en subpasos con ‖Hτ‖ ≤ 1, dividiendo el paso si no converge.
+    Solo se necesitan productos H·v, por lo que H puede ser densa, MatrizDispersaCSR o un
+    operador perezoso.
+
+    Parámetros:
+    - hamiltoniano (numpy.ndarray or MatrizDispersaCSR or Operador): El Hamiltoniano Hermitiano.
+    - estado_inicial (numpy.ndarray): El estado inicial ψ, o un lote de estados (d, k) por columnas.
+    - tiempo (float): El tiempo t de evolución.
+    - metodo (str): "lanczos" o "taylor". Con "lanczos" cada columna de un lote genera su propio
+      subespacio de Krylov y se evoluciona por separado.
+    - tolerancia (float, opcional): Error máximo aproximado permitido en el estado final
+      (por defecto, el de la precisión configurada en el módulo precision).
+    - dimension_krylov (int): Dimensión máxima del subespacio de Krylov (solo "lanczos").
+    - tolerancia_norma (float, opcional): Cambio relativo máximo permitido en la norma del estado
+      (por defecto, 100 veces la tolerancia).
+    - devolver_info (bool): Si es True también se retorna un diccionario con los pasos dados,
+      el error estimado y el cambio de la norma.
+
+    Retorna:
+    - estado_final (numpy.ndarray): El estado e^{-iHt} ψ.
+    - info (dict): Solo si devolver_info es True.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método de evolución desconocido: {metodo}")
+    if metodo == "lanczos" and np.ndim(estado_inicial) > 1:
+        resultados = [evolucionar_hamiltoniano(hamiltoniano, columna, tiempo, metodo, tolerancia, dimension_krylov,
+                                               tolerancia_norma, devolver_info=True)
+                      for columna in np.asarray(estado_inicial).T]
+        estado = np.stack([resultado[0] for resultado in resultados], axis=1)
+        if devolver_info:
+            return estado, {"pasos": sum(info["pasos"] for _, info in resultados),
+                            "error_estimado": sum(info["error_estimado"] for _, info in resultados),
+                            "cambio_norma": max(info["cambio_norma"] for _, info in resultados)}
+        return estado
+    if isinstance(hamiltoniano, np.ndarray) and not es_hermitiana_probabilistica(hamiltoniano, semilla=0):
+        raise ValueError("El Hamiltoniano no es Hermitiano")
+    if tolerancia is None:
+        tolerancia = tolerancia_por_defecto()
+    if tolerancia_norma is None:
+        tolerancia_norma = 100 * tolerancia
+    hamiltoniano = hamiltoniano if hasattr(hamiltoniano, "aplicar") else ajustar_precision(hamiltoniano)
+    aplicar = _aplicador(hamiltoniano)
+    estado = ajustar_precision(estado_inicial)
+    norma_inicial = np.linalg.norm(estado)
+    tiempo = float(tiempo)
+    pasos = 0
+    error_total = 0.0
+
+    if metodo == "lanczos":
+        tolerancia_por_tiempo = tolerancia / max(abs(tiempo), 1e-300)
+        tiempo_restante = tiempo
+        paso_sugerido = abs(tiempo)
+        while abs(tiempo_restante) > 1e-15 * max(abs(tiempo), 1.0) and norma_inicial > 0:
+            estado, paso, error = _paso_lanczos(aplicar, estado, tiempo_restante, paso_sugerido,
+                                                tolerancia_por_tiempo, dimension_krylov)
+            tiempo_restante -= paso
+            error_total += error
+            pasos += 1
+            # Si el paso se aceptó sin reducirlo, se intenta uno más largo
+            paso_sugerido = 2 * abs(paso)
+    else:
+        norma = _estimar_norma(hamiltoniano, aplicar, len(estado))
+        subpasos = max(int(np.ceil(norma * abs(tiempo))), 1)
+        while True:
+            paso = tiempo / subpasos
+            actual = estado
+            convergio = True
+            error_total = 0.0
+            for _ in range(subpasos):
+                actual, convergio, error = _paso_taylor(aplicar, actual, paso, tolerancia / subpasos)
+                error_total += error
+                if not convergio:
+                    break
+            if convergio:
+                estado, pasos = actual, subpasos
+                break
+            subpasos *= 2
+
+    cambio_norma = abs(np.linalg.norm(estado) - norma_inicial) / max(norma_inicial, 1e-300)
+    if cambio_norma > tolerancia_norma:
+        raise ArithmeticError(f"La evolución no conservó la norma (cambio relativo {cambio_norma:.2e})")
+    if devolver_info:
+        return estado, {"pasos": pasos, "error_estimado": error_total, "cambio_norma": cambio_norma}
+    return estado
+
+
+def evolucion_temporal(hamiltoniano, estado_inicial, tiempos, **opciones):
+    """
+    Calcula el estado en varios instantes, evolucionando cada uno a partir del anterior.
+
+    Parámetros:
+    - hamiltoniano (numpy.ndarray or MatrizDispersaCSR or Operador): El Hamiltoniano Hermitiano.
+    - estado_inicial (numpy.ndarray): El estado en t = 0.
+    - tiempos (list of float): Instantes en los que se quiere el estado.
+    - opciones: Argumentos adicionales para evolucionar_hamiltoniano.
+
+    Retorna:
+    - estados (numpy.ndarray): Arreglo (len(tiempos), d) con el estado en cada instante.
+    """
+    estado = np.asarray(estado_inicial, dtype=tipo_complejo())
+    estados = np.empty((len(tiempos), len(estado)), dtype=tipo_complejo())
+    tiempo_actual = 0.0
+    for i, tiempo in enumerate(tiempos):
+        estado = evolucionar_hamiltoniano(hamiltoniano, estado, tiempo - tiempo_actual, **opciones)
+        estados[i] = estado
+        tiempo_actual = tiempo
+    return estados
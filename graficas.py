@@ -0,0 +1,239 @@
+import queue
+import threading
+
+import numpy as np
+
+from trayectorias import submuestrear
+
+# Número máximo de cuadros esperando a ser dibujados; con la cola llena la simulación espera al dibujo
+TAMANO_COLA = 8
+
+# Número máximo de filas (pasos) del mapa de calor de graficar_trayectoria
+MAX_FILAS = 1024
+
+# Marca de fin para el hilo de dibujo
+_FIN = object()
+
+
+# matplotlib se importa solo al graficar, nunca al importar un módulo: importar la biblioteca
+# (incluido este módulo) no debe cargarlo
+
+def importar_pyplot():
+    """
+    Retorna:
+    - plt (module): matplotlib.pyplot, importado en el momento de graficar.
+    """
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _figura_agg(**opciones):
+    # Figura con el backend Agg, sin ventana ni estado global de pyplot
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figura = Figure(**opciones)
+    FigureCanvasAgg(figura)
+    return figura
+
+
+class GraficadorProbabilidades:
+    def __init__(self, etiquetas, titulo="", patron_archivos=None, animacion=None, cuadros_por_segundo=10,
+                 maximo=1.0, en_segundo_plano=True, tamano_cola=TAMANO_COLA, dpi=100):
+        """
+        Dibuja un gráfico de barras de probabilidades por cada paso de una evolución, sin bloquear.
+
+        Usa una sola figura de matplotlib con el backend Agg (sin ventana ni plt.show) y en cada
+        cuadro solo cambia la altura de las barras y el título. Con en_segundo_plano el dibujo se
+        hace en un hilo aparte mientras la simulación continúa; como mucho quedan tamano_cola
+        cuadros pendientes, así que la memoria no crece si el dibujo es más lento que la simulación.
+
+        Parámetros:
+        - etiquetas (list of str): Etiqueta de cada estado.
+        - titulo (str): Título de la figura; a cada cuadro se le agrega el paso.
+        - patron_archivos (str, opcional): Patrón para guardar cada cuadro, con el paso como campo de
+          formato (por ejemplo "cuadro_{:05d}.png").
+        - animacion (str, opcional): Archivo GIF en el que se guardan todos los cuadros.
+        - cuadros_por_segundo (int): Velocidad de la animación.
+        - maximo (float, opcional): Límite del eje de probabilidad; None lo ajusta a cada cuadro.
+        - en_segundo_plano (bool): Si es False se dibuja en el momento, en el hilo que llama.
+        - tamano_cola (int): Número máximo de cuadros pendientes.
+        - dpi (int): Resolución de las imágenes.
+        """
+        self.titulo = titulo
+        self.patron_archivos = patron_archivos
+        self.maximo = maximo
+        self.num_cuadros = 0
+        self._agregados = 0
+        self.figura = _figura_agg(dpi=dpi)
+        self._ejes = self.figura.add_subplot()
+        self._barras = self._ejes.bar(range(len(etiquetas)), np.zeros(len(etiquetas)))
+        self._ejes.set_xticks(range(len(etiquetas)), etiquetas)
+        self._ejes.set_xlabel("Estado")
+        self._ejes.set_ylabel("Probabilidad")
+        if maximo is not None:
+            self._ejes.set_ylim(0, maximo)
+
+        self._escritor = None
+        if animacion is not None:
+            from matplotlib.animation import PillowWriter
+            self._escritor = PillowWriter(fps=cuadros_por_segundo)
+            self._escritor.setup(self.figura, animacion, dpi=dpi)
+
+        self._error = None
+        self._cerrado = False
+        self._cola = None
+        if en_segundo_plano:
+            self._cola = queue.Queue(maxsize=tamano_cola)
+            self._hilo = threading.Thread(target=self._trabajar, daemon=True)
+            self._hilo.start()
+
+    def _dibujar(self, probabilidades, paso):
+        for barra, altura in zip(self._barras, probabilidades):
+            barra.set_height(altura)
+        if self.maximo is None:
+            self._ejes.set_ylim(0, max(float(np.max(probabilidades, initial=0)), 1e-12) * 1.05)
+        self._ejes.set_title(f"{self.titulo} (paso {paso})" if self.titulo else f"Paso {paso}")
+        if self.patron_archivos is not None:
+            self.figura.savefig(self.patron_archivos.format(paso))
+        if self._escritor is not None:
+            self._escritor.grab_frame()
+        self.num_cuadros += 1
+
+    def _trabajar(self):
+        while True:
+            elemento = self._cola.get()
+            if elemento is _FIN:
+                return
+            # Tras un error se siguen sacando cuadros de la cola para no bloquear a la simulación
+            if self._error is None:
+                try:
+                    self._dibujar(*elemento)
+                except Exception as error:
+                    self._error = error
+
+    def _revisar_error(self):
+        if self._error is not None:
+            raise RuntimeError("Falló el dibujo de un cuadro") from self._error
+
+    def agregar(self, probabilidades, paso=None):
+        """
+        Agrega un cuadro. En segundo plano se copia el vector y se retorna enseguida, salvo que la
+        cola esté llena, en cuyo caso se espera a que se dibuje un cuadro.
+
+        Parámetros:
+        - probabilidades (numpy.ndarray): Probabilidad de cada estado.
+        - paso (int, opcional): Número de paso, para el título y el nombre del archivo; por defecto
+          el número de cuadros agregados.
+        """
+        if self._cerrado:
+            raise ValueError("El graficador ya está cerrado")
+        self._revisar_error()
+        if paso is None:
+            paso = self._agregados
+        self._agregados += 1
+        probabilidades = np.array(probabilidades, dtype=float)
+        if self._cola is None:
+            self._dibujar(probabilidades, paso)
+        else:
+            self._cola.put((probabilidades, paso))
+
+    def cerrar(self):
+        """
+        Espera a que se dibujen los cuadros pendientes y termina la animación, si la hay.
+        """
+        if self._cerrado:
+            return
+        self._cerrado = True
+        if self._cola is not None:
+            self._cola.put(_FIN)
+            self._hilo.join()
+        if self._escritor is not None:
+            self._escritor.finish()
+        self._revisar_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+def graficar_evolucion(trayectoria, etiquetas, titulo, patron_archivos=None, animacion=None, cada=1, **opciones):
+    """
+    Dibuja las probabilidades de cada paso de una trayectoria (por ejemplo, la de
+    trayectorias.trayectoria con probabilidades=True) mientras se va generando.
+
+    Parámetros:
+    - trayectoria (iterable of numpy.ndarray): Probabilidades en cada paso (generador o arreglo).
+    - etiquetas (list of str): Etiqueta de cada estado.
+    - titulo (str): Título de la figura.
+    - patron_archivos (str, opcional): Patrón de los archivos de cada cuadro (ver GraficadorProbabilidades).
+    - animacion (str, opcional): Archivo GIF de salida.
+    - cada (int): Se dibuja uno de cada `cada` pasos.
+    - opciones: Otros parámetros de GraficadorProbabilidades.
+
+    Retorna:
+    - num_cuadros (int): Número de cuadros dibujados.
+    """
+    with GraficadorProbabilidades(etiquetas, titulo, patron_archivos, animacion, **opciones) as graficador:
+        for indice, probabilidades in enumerate(submuestrear(trayectoria, cada)):
+            graficador.agregar(probabilidades, indice * cada)
+    return graficador.num_cuadros
+
+
+def graficar_trayectoria(trayectoria, etiquetas, titulo, nombre_archivo, cada=1, max_filas=MAX_FILAS):
+    """
+    Dibuja la evolución de las probabilidades como un mapa de calor (paso contra estado),
+    consumiendo la trayectoria (generador o arreglo mapeado en memoria) a medida que se genera.
+
+    Se guardan como mucho max_filas filas: cuando se llenan se descarta una de cada dos y se duplica
+    la separación entre filas, así que la memoria no depende del número de pasos.
+
+    Parámetros:
+    - trayectoria (iterable of numpy.ndarray): Probabilidades en cada paso.
+    - etiquetas (list of str): Etiqueta de cada estado.
+    - titulo (str): Título de la figura.
+    - nombre_archivo (str): Archivo de salida.
+    - cada (int): Se conserva como mínimo uno de cada `cada` pasos.
+    - max_filas (int): Número máximo de filas (par, al menos 2).
+
+    Retorna:
+    - probabilidades (numpy.ndarray): Las filas dibujadas.
+    - cada (int): Pasos entre filas consecutivas.
+    """
+    if max_filas < 2 or max_filas % 2:
+        raise ValueError("max_filas debe ser par y al menos 2")
+
+    cada = int(cada)
+    filas = None
+    num_filas = 0
+    salto = 1
+    for indice, probabilidades in enumerate(submuestrear(trayectoria, cada)):
+        if indice % salto:
+            continue
+        if filas is None:
+            filas = np.empty((max_filas, len(probabilidades)))
+        if num_filas == max_filas:
+            filas[:max_filas // 2] = filas[0::2]
+            num_filas = max_filas // 2
+            salto *= 2
+            if indice % salto:
+                continue
+        filas[num_filas] = probabilidades
+        num_filas += 1
+    if filas is None:
+        raise ValueError("La trayectoria está vacía")
+    filas = filas[:num_filas]
+    cada *= salto
+
+    figura = _figura_agg()
+    ejes = figura.add_subplot()
+    imagen = ejes.imshow(filas, aspect="auto", origin="lower", interpolation="nearest",
+                         extent=(-0.5, filas.shape[1] - 0.5, -0.5 * cada, (num_filas - 0.5) * cada))
+    figura.colorbar(imagen, label="Probabilidad")
+    ejes.set_xticks(range(len(etiquetas)), etiquetas)
+    ejes.set_title(titulo)
+    ejes.set_xlabel("Estado")
+    ejes.set_ylabel("Paso")
+    figura.savefig(nombre_archivo)
+    return filas, cada
@@ -0,0 +1,293 @@
+import collections.abc
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# Número máximo de eventos guardados para la traza de Chrome (el perfil agregado no tiene límite)
+MAX_EVENTOS = 1_000_000
+
+# La instrumentación está apagada por defecto: una función instrumentada solo comprueba esta bandera
+_activa = False
+
+_perfil = {}
+_eventos = []
+_pila = threading.local()
+_candado = threading.Lock()
+_origen = time.perf_counter()
+
+
+def activar():
+    """
+    Enciende el registro de llamadas de las funciones instrumentadas.
+    """
+    global _activa
+    _activa = True
+
+
+def desactivar():
+    """
+    Apaga el registro; lo ya registrado se conserva hasta llamar a reiniciar.
+    """
+    global _activa
+    _activa = False
+
+
+def esta_activa():
+    """
+    Retorna:
+    - activa (bool): True si se están registrando las llamadas.
+    """
+    return _activa
+
+
+def reiniciar():
+    """
+    Borra el perfil y los eventos registrados.
+    """
+    with _candado:
+        _perfil.clear()
+        _eventos.clear()
+
+
+@contextlib.contextmanager
+def instrumentacion_activa(reiniciar_registro=True):
+    """
+    Registra las llamadas instrumentadas dentro de un bloque with y restaura el estado anterior al salir.
+
+    Parámetros:
+    - reiniciar_registro (bool): Si es True se borra lo registrado antes de empezar.
+    """
+    anterior = _activa
+    if reiniciar_registro:
+        reiniciar()
+    activar()
+    try:
+        yield
+    finally:
+        if not anterior:
+            desactivar()
+
+
+def _factor_complejo(*arreglos):
+    # Una multiplicación-suma compleja son 4 multiplicaciones y 4 sumas reales, contra 1 y 1
+    return 4 if any(np.iscomplexobj(getattr(a, "datos", a)) for a in arreglos) else 1
+
+
+def flops_producto(a, b):
+    """
+    Estima las operaciones de punto flotante de numpy.dot(a, b) (matriz-matriz, matriz-vector o vector-vector).
+
+    Parámetros:
+    - a (numpy.ndarray or MatrizDispersaCSR): Factor izquierdo; si es dispersa se cuentan sus nnz entradas.
+    - b (numpy.ndarray): Factor derecho.
+
+    Retorna:
+    - flops (int): 2 por cada multiplicación-suma real (8 si es compleja).
+    """
+    forma_a = np.shape(a) if not hasattr(a, "nnz") else a.shape
+    entradas_a = a.nnz if hasattr(a, "nnz") else int(np.prod(forma_a))
+    columnas_b = int(np.prod(np.shape(b))) // max(forma_a[-1], 1)
+    return 2 * _factor_complejo(a, b) * entradas_a * columnas_b
+
+
+def flops_elementos(*arreglos):
+    """
+    Estima las operaciones de una operación elemento a elemento (suma, negación, escalado).
+
+    Retorna:
+    - flops (int): Una por elemento del arreglo más grande (dos si es complejo).
+    """
+    tamano = max(int(np.prod(np.shape(a))) for a in arreglos)
+    return tamano * (2 if any(np.iscomplexobj(a) for a in arreglos) else 1)
+
+
+def flops_producto_tensor(a, b):
+    """
+    Estima las operaciones del producto de Kronecker: una multiplicación por elemento del resultado (6 si es compleja).
+    """
+    return int(np.size(a)) * int(np.size(b)) * (6 if np.iscomplexobj(a) or np.iscomplexobj(b) else 1)
+
+
+def flops_diagonalizacion(matriz):
+    """
+    Estima las operaciones de una diagonalización densa completa (≈ 10 d³, por 4 si es compleja).
+    """
+    return 10 * _factor_complejo(matriz) * np.shape(matriz)[0] ** 3
+
+
+def contar_flops(operaciones):
+    """
+    Suma operaciones a la llamada instrumentada en curso. Sirve para funciones cuyo costo solo se
+    conoce al ejecutarlas: bucles que pueden terminar antes, o que recorren un iterador.
+    Sin instrumentación activa, o fuera de una función instrumentada, no hace nada.
+
+    Parámetros:
+    - operaciones (int): Operaciones de punto flotante realizadas.
+    """
+    if not _activa:
+        return
+    pila = getattr(_pila, "llamadas", None)
+    if pila:
+        pila[-1][1] += int(operaciones)
+
+
+def _formas(argumentos):
+    return [list(a.shape) for a in argumentos if hasattr(a, "shape")]
+
+
+def _estimar(flops, argumentos):
+    # El estimador no debe consumir ni modificar los argumentos: con un iterador entre ellos no se
+    # estima (la función puede usar contar_flops), y si el estimador falla solo se pierde la métrica
+    if flops is None or argumentos is None:
+        return 0
+    if any(isinstance(valor, collections.abc.Iterator) for valor in argumentos.arguments.values()):
+        return 0
+    try:
+        return int(flops(*argumentos.args, **argumentos.kwargs))
+    except Exception:
+        return 0
+
+
+def _bytes_resultado(resultado):
+    if isinstance(resultado, np.ndarray):
+        return resultado.nbytes
+    if isinstance(resultado, tuple):
+        return sum(r.nbytes for r in resultado if isinstance(r, np.ndarray))
+    return 0
+
+
+def instrumentar(nombre=None, flops=None):
+    """
+    Decorador que registra, cuando la instrumentación está activa, las llamadas a una función:
+    número de llamadas, tiempo total y propio (sin las funciones instrumentadas que llama),
+    operaciones estimadas, formas de los argumentos y bytes de los arreglos que retorna.
+
+    Con la instrumentación apagada el costo es una llamada extra y la comprobación de una bandera.
+
+    Parámetros:
+    - nombre (str, opcional): Nombre con el que aparece en el perfil (por defecto, modulo.funcion).
+    - flops (callable, opcional): Estima las operaciones antes de la llamada. Recibe los argumentos
+      de la función ya asociados a sus parámetros (los pasados por nombre llegan en posición) y no
+      se usa si alguno es un iterador. Para contar durante la ejecución, ver contar_flops.
+    """
+    def decorador(funcion):
+        etiqueta = nombre or f"{funcion.__module__}.{funcion.__qualname__}"
+        try:
+            firma = inspect.signature(funcion)
+        except (TypeError, ValueError):
+            firma = None
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activa:
+                return funcion(*args, **kwargs)
+            return _registrar(etiqueta, funcion, firma, flops, args, kwargs)
+
+        return envoltura
+
+    return decorador
+
+
+def _registrar(etiqueta, funcion, firma, flops, args, kwargs):
+    # Cada llamada en curso guarda [tiempo de las funciones instrumentadas que llama, flops contados]
+    pila = getattr(_pila, "llamadas", None)
+    if pila is None:
+        pila = _pila.llamadas = []
+    try:
+        argumentos = firma.bind(*args, **kwargs) if firma is not None else None
+    except TypeError:
+        # Llamada inválida: el error lo lanza la propia función
+        argumentos = None
+    # La estimación se hace antes de la llamada: la función puede modificar sus argumentos
+    operaciones = _estimar(flops, argumentos)
+    pila.append([0.0, 0])
+    inicio = time.perf_counter()
+    try:
+        resultado = funcion(*args, **kwargs)
+    finally:
+        duracion = time.perf_counter() - inicio
+        tiempo_hijos, contadas = pila.pop()
+        if pila:
+            pila[-1][0] += duracion
+    operaciones += contadas
+    num_bytes = _bytes_resultado(resultado)
+    formas = _formas(argumentos.arguments.values() if argumentos is not None else args)
+
+    with _candado:
+        entrada = _perfil.get(etiqueta)
+        if entrada is None:
+            entrada = _perfil[etiqueta] = {"llamadas": 0, "tiempo_total": 0.0, "tiempo_propio": 0.0,
+                                           "flops": 0, "bytes": 0, "formas": {}}
+        entrada["llamadas"] += 1
+        entrada["tiempo_total"] += duracion
+        entrada["tiempo_propio"] += duracion - tiempo_hijos
+        entrada["flops"] += operaciones
+        entrada["bytes"] += num_bytes
+        clave_formas = str(formas)
+        entrada["formas"][clave_formas] = entrada["formas"].get(clave_formas, 0) + 1
+        if len(_eventos) < MAX_EVENTOS:
+            _eventos.append((etiqueta, inicio - _origen, duracion, threading.get_ident(), operaciones, num_bytes, formas))
+    return resultado
+
+
+def perfil():
+    """
+    Retorna:
+    - perfil (dict): Por función, "llamadas", "tiempo_total" y "tiempo_propio" (s), "flops",
+      "bytes" (de los arreglos retornados), "gflops" (por segundo de tiempo propio) y "formas"
+      (número de llamadas por combinación de formas de los argumentos).
+    """
+    with _candado:
+        resultado = {etiqueta: dict(entrada, formas=dict(entrada["formas"])) for etiqueta, entrada in _perfil.items()}
+    for entrada in resultado.values():
+        entrada["gflops"] = entrada["flops"] / entrada["tiempo_propio"] / 1e9 if entrada["tiempo_propio"] > 0 else 0.0
+    return resultado
+
+
+def imprimir_perfil(ordenar_por="tiempo_propio"):
+    """
+    Imprime el perfil plano, una fila por función, ordenado de mayor a menor.
+
+    Parámetros:
+    - ordenar_por (str): Columna por la que se ordena ("tiempo_propio", "tiempo_total", "llamadas", "flops" o "bytes").
+    """
+    datos = perfil()
+    print(f"{'función':<55} {'llamadas':>9} {'total (s)':>11} {'propio (s)':>11} {'GFLOP/s':>9} {'MiB':>10}")
+    for etiqueta, entrada in sorted(datos.items(), key=lambda item: item[1][ordenar_por], reverse=True):
+        print(f"{etiqueta:<55} {entrada['llamadas']:>9} {entrada['tiempo_total']:>11.4f} {entrada['tiempo_propio']:>11.4f} "
+              f"{entrada['gflops']:>9.2f} {entrada['bytes'] / 2 ** 20:>10.2f}")
+
+
+def exportar_perfil(ruta):
+    """
+    Guarda el perfil plano en un archivo JSON.
+
+    Parámetros:
+    - ruta (str): Archivo de salida.
+    """
+    with open(ruta, "w") as archivo:
+        json.dump(perfil(), archivo, indent=1)
+
+
+def exportar_traza_chrome(ruta):
+    """
+    Guarda las llamadas registradas en el formato de trazas de Chrome (chrome://tracing o Perfetto),
+    con un evento por llamada y las funciones anidadas una dentro de otra.
+
+    Parámetros:
+    - ruta (str): Archivo JSON de salida.
+    """
+    with _candado:
+        eventos = list(_eventos)
+    proceso = os.getpid()
+    traza = [{"name": etiqueta, "ph": "X", "ts": inicio * 1e6, "dur": duracion * 1e6, "pid": proceso, "tid": hilo,
+              "args": {"flops": operaciones, "bytes": num_bytes, "formas": formas}}
+             for etiqueta, inicio, duracion, hilo, operaciones, num_bytes, formas in eventos]
+    with open(ruta, "w") as archivo:
+        json.dump({"traceEvents": traza, "displayTimeUnit": "ms"}, archivo)
@@ -0,0 +1,265 @@
+import numpy as np
+
+from estado_tensorial import aplicar_operador_local
+from precision import tipo_complejo
+from propiedades import tolerancia_para
+
+
+def es_canal_valido(kraus, tolerancia=None):
+    """
+    Comprueba que unos operadores de Kraus definen un canal que conserva la traza (Σ K† K = I).
+
+    Parámetros:
+    - kraus (list of numpy.ndarray): Operadores de Kraus (D, D).
+    - tolerancia (float, opcional): Error absoluto máximo permitido (por defecto tolerancia_para(dtype)).
+
+    Retorna:
+    - es_valido (bool): True si Σ K† K = I.
+    """
+    kraus = np.asarray(kraus)
+    tolerancia = tolerancia_para(kraus.dtype) if tolerancia is None else tolerancia
+    suma = np.einsum("kji,kjl->il", kraus.conj(), kraus)
+    return bool(np.allclose(suma, np.eye(kraus.shape[-1]), atol=tolerancia, rtol=0))
+
+
+def operadores_de_weyl(dimension):
+    """
+    Construye los d² operadores de Weyl X^a Z^b (las matrices de Pauli generalizadas).
+
+    Parámetros:
+    - dimension (int): Dimensión d del subsistema.
+
+    Retorna:
+    - operadores (numpy.ndarray): Arreglo (d², d, d); el primero es la identidad.
+    """
+    desplazamiento = np.roll(np.eye(dimension), 1, axis=0)
+    fases = np.diag(np.exp(2j * np.pi * np.arange(dimension) / dimension))
+    return np.array([np.linalg.matrix_power(desplazamiento, a) @ np.linalg.matrix_power(fases, b)
+                     for a in range(dimension) for b in range(dimension)])
+
+
+# Canales estándar, como listas de operadores de Kraus
+
+def canal_despolarizante(p, dimension=2):
+    # ρ -> (1 - p) ρ + p I/d
+    weyl = operadores_de_weyl(dimension)
+    pesos = np.full(len(weyl), p / dimension ** 2)
+    pesos[0] += 1 - p
+    return list(np.sqrt(pesos)[:, np.newaxis, np.newaxis] * weyl)
+
+def canal_desfase(p, dimension=2):
+    # Multiplica las coherencias (fuera de la diagonal) por 1 - p; con p = 1 el estado queda clásico
+    return [np.sqrt(1 - p) * np.eye(dimension)] + [np.sqrt(p) * np.diag(np.eye(dimension)[j]) for j in range(dimension)]
+
+def canal_inversion_de_bit(p):
+    return [np.sqrt(1 - p) * np.eye(2), np.sqrt(p) * np.array([[0, 1], [1, 0]])]
+
+def canal_amortiguamiento(gamma):
+    # Decaimiento |1⟩ -> |0⟩ con probabilidad gamma
+    return [np.array([[1, 0], [0, np.sqrt(1 - gamma)]]), np.array([[0, np.sqrt(gamma)], [0, 0]])]
+
+
+class MatrizDensidad:
+    def __init__(self, dimensiones, rho, dtype=None):
+        """
+        Inicializa un estado mixto, o un lote de estados mixtos, de un sistema con varios subsistemas.
+
+        Las matrices se guardan como un arreglo (N, D, D) con D = prod(dimensiones), y los canales
+        se aplican sobre los ejes de los subsistemas elegidos, sin formar superoperadores D² x D².
+
+        Parámetros:
+        - dimensiones (list of int): Dimensión de cada subsistema.
+        - rho (numpy.ndarray): Matriz densidad (D, D) o lote (N, D, D).
+        - dtype (numpy.dtype, opcional): Tipo de dato; por defecto el complejo de la precisión actual.
+        """
+        self.dimensiones = tuple(int(d) for d in dimensiones)
+        dimension = int(np.prod(self.dimensiones))
+        rho = np.asarray(rho, dtype=tipo_complejo() if dtype is None else dtype)
+        self.es_lote = rho.ndim == 3
+        self.rho = np.array(rho.reshape(-1, dimension, dimension))
+
+    @classmethod
+    def desde_estados_puros(cls, estados, dimensiones=None, dtype=None):
+        """
+        Construye ρ = |ψ⟩⟨ψ| a partir de un vector de estado (d,) o de un lote de vectores (N, d).
+
+        Parámetros:
+        - estados (numpy.ndarray): El estado o los estados (se normalizan).
+        - dimensiones (list of int, opcional): Dimensión de cada subsistema; por defecto un único subsistema.
+        - dtype (numpy.dtype, opcional): Tipo de dato.
+
+        Retorna:
+        - estado (MatrizDensidad): El estado puro.
+        """
+        estados = np.asarray(estados)
+        lote = np.atleast_2d(estados)
+        lote = lote / np.linalg.norm(lote, axis=1, keepdims=True)
+        rho = lote[:, :, np.newaxis] * lote[:, np.newaxis, :].conj()
+        dimensiones = (lote.shape[1],) if dimensiones is None else dimensiones
+        return cls(dimensiones, rho if estados.ndim == 2 else rho[0], dtype)
+
+    @classmethod
+    def desde_probabilidades(cls, probabilidades, dimensiones=None, dtype=None):
+        """
+        Construye la mezcla clásica diagonal Σ p_i |i⟩⟨i| (por ejemplo, el estado del experimento
+        de rendijas clásico probabilístico).
+
+        Parámetros:
+        - probabilidades (numpy.ndarray): Vector de probabilidades (D,) o lote (N, D).
+        - dimensiones (list of int, opcional): Dimensión de cada subsistema.
+        - dtype (numpy.dtype, opcional): Tipo de dato.
+
+        Retorna:
+        - estado (MatrizDensidad): El estado mixto diagonal.
+        """
+        probabilidades = np.asarray(probabilidades)
+        lote = np.atleast_2d(probabilidades)
+        rho = np.zeros(lote.shape + lote.shape[-1:], dtype=tipo_complejo() if dtype is None else dtype)
+        indices = np.arange(lote.shape[1])
+        rho[:, indices, indices] = lote
+        dimensiones = (lote.shape[1],) if dimensiones is None else dimensiones
+        return cls(dimensiones, rho if probabilidades.ndim == 2 else rho[0], dtype)
+
+    @property
+    def num_subsistemas(self):
+        return len(self.dimensiones)
+
+    def _salida(self, valores):
+        # Sin lote se retorna el valor del único estado
+        return valores if self.es_lote else valores[0]
+
+    def _aplicar_local(self, tensor, operador, subsistemas):
+        # Aplica K por la izquierda (ejes de fila) y K† por la derecha (ejes de columna),
+        # tratando el lote como un subsistema más que no se toca
+        n = self.num_subsistemas
+        dimensiones = (tensor.shape[0],) + self.dimensiones + self.dimensiones
+        filas = [1 + s for s in subsistemas]
+        columnas = [1 + n + s for s in subsistemas]
+        tensor = aplicar_operador_local(tensor, operador, filas, dimensiones)
+        return aplicar_operador_local(tensor, np.conjugate(operador), columnas, dimensiones)
+
+    def _subsistemas(self, subsistemas):
+        if subsistemas is None:
+            return list(range(self.num_subsistemas))
+        if np.ndim(subsistemas) == 0:
+            return [int(subsistemas)]
+        return [int(s) for s in subsistemas]
+
+    def aplicar_canal(self, kraus, subsistemas=None, validar=True):
+        """
+        Aplica el canal ρ -> Σ K ρ K† sobre los subsistemas indicados, a todo el lote a la vez.
+
+        Parámetros:
+        - kraus (list of numpy.ndarray): Operadores de Kraus (D_local, D_local).
+        - subsistemas (int or list of int, opcional): Subsistemas sobre los que actúa; por defecto todos.
+        - validar (bool): Si es True se comprueba que el canal conserve la traza.
+
+        Retorna:
+        - estado (MatrizDensidad): El mismo objeto, para encadenar operaciones.
+        """
+        subsistemas = self._subsistemas(subsistemas)
+        kraus = [np.asarray(k, dtype=self.rho.dtype) for k in kraus]
+        if validar and not es_canal_valido(kraus):
+            raise ValueError("Los operadores de Kraus no conservan la traza (Σ K† K ≠ I)")
+        tensor = self.rho.reshape((len(self.rho),) + self.dimensiones * 2)
+        resultado = self._aplicar_local(tensor, kraus[0], subsistemas)
+        for operador in kraus[1:]:
+            resultado += self._aplicar_local(tensor, operador, subsistemas)
+        # El resultado es Hermitiano en exacto; se simetriza para que el redondeo no lo aleje
+        np.copyto(self.rho, resultado.reshape(self.rho.shape))
+        self.rho += np.conjugate(np.swapaxes(self.rho, 1, 2))
+        self.rho *= 0.5
+        return self
+
+    def aplicar_unitaria(self, unitaria, subsistemas=None):
+        """
+        Aplica ρ -> U ρ U† sobre los subsistemas indicados.
+
+        Parámetros:
+        - unitaria (numpy.ndarray): Matriz unitaria (D_local, D_local).
+        - subsistemas (int or list of int, opcional): Subsistemas sobre los que actúa; por defecto todos.
+
+        Retorna:
+        - estado (MatrizDensidad): El mismo objeto, para encadenar operaciones.
+        """
+        subsistemas = self._subsistemas(subsistemas)
+        tensor = self.rho.reshape((len(self.rho),) + self.dimensiones * 2)
+        resultado = self._aplicar_local(tensor, np.asarray(unitaria, dtype=self.rho.dtype), subsistemas)
+        np.copyto(self.rho, resultado.reshape(self.rho.shape))
+        return self
+
+    def traza(self):
+        """
+        Retorna:
+        - traza (float or numpy.ndarray): Tr(ρ) de cada estado del lote (real, por ser ρ Hermitiana).
+        """
+        return self._salida(np.einsum("nii->n", self.rho).real)
+
+    def pureza(self):
+        """
+        Calcula Tr(ρ²) sin multiplicar matrices: para ρ Hermitiana es la suma de |ρ_ij|², en O(D²).
+
+        Retorna:
+        - pureza (float or numpy.ndarray): 1 para estados puros y 1/D para el estado máximamente mezclado.
+        """
+        return self._salida(np.linalg.norm(self.rho.reshape(len(self.rho), -1), axis=1) ** 2)
+
+    def probabilidades(self):
+        """
+        Retorna:
+        - probabilidades (numpy.ndarray): Diagonal de ρ, (D,) o (N, D): la probabilidad de cada
+          estado de la base computacional.
+        """
+        return self._salida(np.diagonal(self.rho, axis1=1, axis2=2).real.copy())
+
+    def probabilidades_marginales(self, subsistemas):
+        """
+        Calcula la distribución de probabilidad de medir solo algunos subsistemas.
+
+        Parámetros:
+        - subsistemas (int or list of int): Subsistemas que se miden.
+
+        Retorna:
+        - probabilidades (numpy.ndarray): Arreglo con un eje por subsistema medido (precedido por el
+          eje del lote, si lo hay), en el orden dado.
+        """
+        subsistemas = self._subsistemas(subsistemas)
+        diagonal = np.diagonal(self.rho, axis1=1, axis2=2).real.reshape((len(self.rho),) + self.dimensiones)
+        resto = tuple(1 + eje for eje in range(self.num_subsistemas) if eje not in subsistemas)
+        marginales = np.sum(diagonal, axis=resto)
+        orden = [0] + [1 + i for i in np.argsort(np.argsort(subsistemas))]
+        return self._salida(np.transpose(marginales, orden))
+
+    def valor_esperado(self, observable):
+        """
+        Calcula Tr(ρ A) para un observable Hermitiano A sin formar el producto ρ A, en O(D²).
+
+        Parámetros:
+        - observable (numpy.ndarray): Matriz Hermitiana (D, D).
+
+        Retorna:
+        - valor (float or numpy.ndarray): El valor esperado en cada estado del lote.
+        """
+        return self._salida(np.einsum("nij,ji->n", self.rho, np.asarray(observable)).real)
+
+    def traza_parcial(self, conservar):
+        """
+        Traza los subsistemas que no se conservan.
+
+        Parámetros:
+        - conservar (int or list of int): Subsistemas que se conservan, en orden creciente.
+
+        Retorna:
+        - reducido (MatrizDensidad): El estado reducido de los subsistemas conservados.
+        """
+        conservar = sorted(self._subsistemas(conservar))
+        tensor = self.rho.reshape((len(self.rho),) + self.dimensiones * 2)
+        n = self.num_subsistemas
+        for eje in reversed(range(self.num_subsistemas)):
+            if eje not in conservar:
+                tensor = np.trace(tensor, axis1=1 + eje, axis2=1 + n + eje)
+                n -= 1
+        dimensiones = [self.dimensiones[eje] for eje in conservar]
+        dimension = int(np.prod(dimensiones))
+        rho = tensor.reshape(len(self.rho), dimension, dimension)
+        return MatrizDensidad(dimensiones, rho if self.es_lote else rho[0], self.rho.dtype)
@@ -0,0 +1,146 @@
+import numpy as np
+
+
+class MatrizDispersaCSR:
+    def __init__(self, datos, indices, punteros, forma):
+        """
+        Inicializa una matriz dispersa en formato CSR (filas comprimidas).
+
+        Parámetros:
+        - datos (numpy.ndarray): Valores no nulos, ordenados por fila.
+        - indices (numpy.ndarray): Columna de cada valor no nulo.
+        - punteros (numpy.ndarray): Arreglo de longitud filas + 1; los valores de la fila i
+          ocupan datos[punteros[i]:punteros[i + 1]].
+        - forma (tuple): Forma (filas, columnas) de la matriz.
+        """
+        self.datos = np.asarray(datos)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.punteros = np.asarray(punteros, dtype=np.intp)
+        self.forma = (int(forma[0]), int(forma[1]))
+        if len(self.punteros) != self.forma[0] + 1:
+            raise ValueError("Los punteros deben tener longitud igual al número de filas más uno")
+        if len(self.datos) != len(self.indices) or len(self.datos) != self.punteros[-1]:
+            raise ValueError("Los datos, los índices y los punteros no son consistentes")
+
+        # Filas con al menos un valor no nulo: reduceat no admite segmentos vacíos
+        self._filas_no_vacias = np.flatnonzero(self.punteros[:-1] < self.punteros[1:])
+        self._inicios = self.punteros[:-1][self._filas_no_vacias]
+
+    @classmethod
+    def desde_aristas(cls, aristas, dimension, pesos=None, dtype=float):
+        """
+        Construye una matriz de transición a partir de una lista de aristas.
+
+        Cada arista (origen, destino) con peso w aporta M[destino, origen] += w, de modo
+        que M · estado lleva la amplitud o probabilidad del origen al destino.
+
+        Parámetros:
+        - aristas (array_like): Pares (origen, destino) de posiciones.
+        - dimension (int): Número de posiciones del sistema.
+        - pesos (array_like, opcional): Peso de cada arista (1 si se omite).
+        - dtype (numpy.dtype): Tipo de dato de los valores.
+
+        Retorna:
+        - matriz (MatrizDispersaCSR): La matriz de transición dispersa (dimension, dimension).
+        """
+        aristas = np.asarray(aristas, dtype=np.intp).reshape(-1, 2)
+        origenes, destinos = aristas[:, 0], aristas[:, 1]
+        if pesos is None:
+            pesos = np.ones(len(aristas), dtype=dtype)
+        pesos = np.asarray(pesos, dtype=dtype)
+        if len(pesos) != len(aristas):
+            raise ValueError("Debe haber un peso por arista")
+        if len(aristas) and (aristas.min() < 0 or aristas.max() >= dimension):
+            raise ValueError("Hay aristas fuera del rango de posiciones")
+
+        # Ordenar por fila (destino) y después por columna, sumando aristas repetidas
+        orden = np.lexsort((origenes, destinos))
+        filas, columnas, pesos = destinos[orden], origenes[orden], pesos[orden]
+        if len(filas):
+            nuevas = np.ones(len(filas), dtype=bool)
+            nuevas[1:] = (filas[1:] != filas[:-1]) | (columnas[1:] != columnas[:-1])
+            grupos = np.flatnonzero(nuevas)
+            pesos = np.add.reduceat(pesos, grupos)
+            filas, columnas = filas[grupos], columnas[grupos]
+
+        punteros = np.zeros(dimension + 1, dtype=np.intp)
+        np.cumsum(np.bincount(filas, minlength=dimension), out=punteros[1:])
+        return cls(pesos, columnas, punteros, (dimension, dimension))
+
+    @classmethod
+    def desde_densa(cls, matriz):
+        """
+        Construye la matriz dispersa a partir de una matriz densa.
+
+        Parámetros:
+        - matriz (numpy.ndarray): La matriz densa.
+
+        Retorna:
+        - matriz (MatrizDispersaCSR): La misma matriz en formato CSR.
+        """
+        matriz = np.asarray(matriz)
+        filas, columnas = np.nonzero(matriz)
+        punteros = np.zeros(matriz.shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(filas, minlength=matriz.shape[0]), out=punteros[1:])
+        return cls(matriz[filas, columnas], columnas, punteros, matriz.shape)
+
+    @property
+    def shape(self):
+        return self.forma
+
+    @property
+    def dtype(self):
+        return self.datos.dtype
+
+    @property
+    def nnz(self):
+        return len(self.datos)
+
+    def dot(self, vector):
+        """
+        Calcula el producto de la matriz por un vector (o por las columnas de una matriz) en O(nnz).
+
+        Parámetros:
+        - vector (numpy.ndarray): Vector de longitud d o arreglo (d, k).
+
+        Retorna:
+        - resultado (numpy.ndarray): El producto M · vector.
+        """
+        vector = np.asarray(vector)
+        if vector.shape[0] != self.forma[1]:
+            raise ValueError(f"Dimensiones incompatibles: {self.forma} y {vector.shape}")
+        datos = self.datos if vector.ndim == 1 else self.datos.reshape((-1,) + (1,) * (vector.ndim - 1))
+        productos = datos * vector[self.indices]
+        resultado = np.zeros((self.forma[0],) + vector.shape[1:], dtype=productos.dtype)
+        if len(productos):
+            resultado[self._filas_no_vacias] = np.add.reduceat(productos, self._inicios, axis=0)
+        return resultado
+
+    def __matmul__(self, vector):
+        return self.dot(vector)
+
+    def adjunta(self):
+        """
+        Calcula la conjugada transpuesta, también en formato CSR, sin pasar por la matriz densa.
+
+        Retorna:
+        - adjunta (MatrizDispersaCSR): La matriz M† (columnas, filas).
+        """
+        filas = np.repeat(np.arange(self.forma[0]), np.diff(self.punteros))
+        # Las filas de M† son las columnas de M; el orden estable conserva las filas de M crecientes
+        orden = np.argsort(self.indices, kind="stable")
+        punteros = np.zeros(self.forma[1] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(self.indices, minlength=self.forma[1]), out=punteros[1:])
+        return MatrizDispersaCSR(np.conjugate(self.datos[orden]), filas[orden], punteros, self.forma[::-1])
+
+    def a_densa(self):
+        """
+        Convierte la matriz a un numpy.ndarray denso.
+
+        Retorna:
+        - matriz (numpy.ndarray): La matriz densa (filas, columnas).
+        """
+        densa = np.zeros(self.forma, dtype=self.dtype)
+        filas = np.repeat(np.arange(self.forma[0]), np.diff(self.punteros))
+        np.add.at(densa, (filas, self.indices), self.datos)
+        return densa
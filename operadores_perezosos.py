@@ -0,0 +1,392 @@
+import numpy as np
+
+
+def orden_de_contraccion(formas):
+    """
+    Calcula el orden de multiplicación más barato de una cadena de matrices (programación dinámica).
+
+    Parámetros:
+    - formas (list of tuple): Forma (filas, columnas) de cada matriz de la cadena, en orden.
+
+    Retorna:
+    - arbol (int or tuple): Índice de una matriz, o par (izquierda, derecha) de subárboles.
+    - costo (int): Número de multiplicaciones escalares del orden elegido.
+    """
+    n = len(formas)
+    dimensiones = [formas[0][0]] + [forma[1] for forma in formas]
+    costo = [[0] * n for _ in range(n)]
+    corte = [[0] * n for _ in range(n)]
+    for longitud in range(2, n + 1):
+        for i in range(n - longitud + 1):
+            j = i + longitud - 1
+            costo[i][j] = None
+            for k in range(i, j):
+                candidato = costo[i][k] + costo[k + 1][j] + dimensiones[i] * dimensiones[k + 1] * dimensiones[j + 1]
+                if costo[i][j] is None or candidato < costo[i][j]:
+                    costo[i][j], corte[i][j] = candidato, k
+
+    def arbol(i, j):
+        if i == j:
+            return i
+        return arbol(i, corte[i][j]), arbol(corte[i][j] + 1, j)
+
+    return arbol(0, n - 1), costo[0][n - 1]
+
+
+def _como_operador(valor):
+    return valor if isinstance(valor, Operador) else Matriz(valor)
+
+
+class Operador:
+    # Hace que numpy delegue en __rmatmul__ y __radd__ cuando el arreglo está a la izquierda
+    __array_ufunc__ = None
+
+    forma = None
+
+    def aplicar(self, vector, _memo=None):
+        """
+        Aplica el operador a un vector (o a las columnas de una matriz) sin formar matrices intermedias.
+
+        Dentro de una misma aplicación, una subexpresión compartida aplicada al mismo vector
+        se calcula una sola vez.
+
+        Parámetros:
+        - vector (numpy.ndarray): Vector de longitud igual a las columnas del operador, o arreglo (columnas, k).
+
+        Retorna:
+        - resultado (numpy.ndarray): El resultado de aplicar el operador.
+        """
+        memo = {} if _memo is None else _memo
+        clave = ("aplicar", id(self), id(vector))
+        if clave not in memo:
+            # Se guarda el vector junto al resultado para que su id no se reutilice
+            memo[clave] = (vector, self._aplicar(np.asarray(vector), memo))
+        return memo[clave][1]
+
+    def evaluar(self, _memo=None):
+        """
+        Construye la matriz densa del operador, multiplicando las cadenas en el orden más barato.
+
+        Retorna:
+        - matriz (numpy.ndarray): La matriz del operador.
+        """
+        memo = {} if _memo is None else _memo
+        clave = ("evaluar", id(self))
+        if clave not in memo:
+            memo[clave] = (self, self._evaluar(memo))
+        return memo[clave][1]
+
+    def adjunto(self):
+        """
+        Retorna:
+        - adjunto (Operador): El operador adjunto, con la daga llevada hasta las hojas.
+        """
+        return self._adjunto()
+
+    @property
+    def H(self):
+        return self.adjunto()
+
+    def __matmul__(self, otro):
+        if isinstance(otro, Operador):
+            return Producto([self, otro])
+        otro = np.asarray(otro)
+        if otro.ndim <= 1:
+            return self.aplicar(otro)
+        return Producto([self, Matriz(otro)])
+
+    def __rmatmul__(self, otro):
+        if isinstance(otro, Operador):
+            return Producto([otro, self])
+        otro = np.asarray(otro)
+        if otro.ndim <= 1:
+            # Vector fila: vᵀ A = (Aᵀ v)ᵀ = conj(A† conj(v))
+            return np.conjugate(self.adjunto().aplicar(np.conjugate(otro)))
+        return Producto([Matriz(otro), self])
+
+    def __add__(self, otro):
+        return Suma([self, _como_operador(otro)])
+
+    def __radd__(self, otro):
+        return Suma([_como_operador(otro), self])
+
+    def __neg__(self):
+        return Escalar(-1, self)
+
+    def __sub__(self, otro):
+        return Suma([self, Escalar(-1, _como_operador(otro))])
+
+    def __mul__(self, escalar):
+        if not np.isscalar(escalar):
+            raise TypeError("Solo se puede multiplicar un operador por un escalar; use @ para el producto")
+        return Escalar(escalar, self)
+
+    __rmul__ = __mul__
+
+
+class Matriz(Operador):
+    def __init__(self, matriz):
+        """
+        Hoja del grafo: una matriz densa (o cualquier objeto con .dot, como MatrizDispersaCSR).
+
+        Parámetros:
+        - matriz (numpy.ndarray): La matriz.
+        """
+        self.matriz = matriz if hasattr(matriz, "shape") and hasattr(matriz, "dot") else np.asarray(matriz)
+        self.forma = tuple(self.matriz.shape)
+        if len(self.forma) != 2:
+            raise ValueError(f"Un operador debe ser una matriz de dos dimensiones, no de forma {self.forma}")
+
+    def _aplicar(self, vector, memo):
+        return self.matriz.dot(vector)
+
+    def _evaluar(self, memo):
+        return self.matriz if isinstance(self.matriz, np.ndarray) else self.matriz.a_densa()
+
+    def _adjunto(self):
+        # Una hoja dispersa sigue siendo dispersa: su adjunta se construye en formato CSR
+        if hasattr(self.matriz, "adjunta"):
+            return Matriz(self.matriz.adjunta())
+        return AdjuntoDeMatriz(self._evaluar(None))
+
+
+class AdjuntoDeMatriz(Operador):
+    def __init__(self, matriz):
+        """
+        Adjunto de una hoja, aplicado sin formar la matriz conjugada transpuesta.
+
+        Parámetros:
+        - matriz (numpy.ndarray): La matriz cuyo adjunto representa.
+        """
+        self.matriz = np.asarray(matriz)
+        self.forma = self.matriz.shape[::-1]
+
+    def _aplicar(self, vector, memo):
+        # A† v = conj(Aᵀ conj(v)): solo se conjugan vectores, nunca la matriz
+        if not np.iscomplexobj(self.matriz):
+            return np.dot(self.matriz.T, vector)
+        return np.conjugate(np.dot(self.matriz.T, np.conjugate(vector)))
+
+    def _evaluar(self, memo):
+        return np.transpose(np.conjugate(self.matriz))
+
+    def _adjunto(self):
+        return Matriz(self.matriz)
+
+
+class Producto(Operador):
+    def __init__(self, factores):
+        """
+        Producto de una cadena de operadores F1 · F2 · ... · Fn.
+
+        Parámetros:
+        - factores (list of Operador): Los factores, de izquierda a derecha.
+        """
+        self.factores = []
+        for factor in factores:
+            factor = _como_operador(factor)
+            self.factores.extend(factor.factores if isinstance(factor, Producto) else [factor])
+        for izquierdo, derecho in zip(self.factores, self.factores[1:]):
+            if izquierdo.forma[1] != derecho.forma[0]:
+                raise ValueError(f"Dimensiones incompatibles en el producto: {izquierdo.forma} y {derecho.forma}")
+        self.forma = (self.factores[0].forma[0], self.factores[-1].forma[1])
+
+    def _aplicar(self, vector, memo):
+        # El vector se trata como el último factor de la cadena: con un solo vector el orden
+        # óptimo es siempre de derecha a izquierda, (A·B)·v = A·(B·v); con muchas columnas
+        # puede convenir multiplicar antes algunos factores entre sí
+        columnas = vector.shape[1] if vector.ndim > 1 else 1
+        formas = [factor.forma for factor in self.factores] + [(vector.shape[0], columnas)]
+        arbol, _ = orden_de_contraccion(formas)
+        return self._aplicar_arbol(arbol, vector, memo)
+
+    def _aplicar_arbol(self, arbol, vector, memo):
+        if arbol == len(self.factores):
+            return vector
+        izquierdo, derecho = arbol
+        bloque = self._aplicar_arbol(derecho, vector, memo)
+        if isinstance(izquierdo, int):
+            return self.factores[izquierdo].aplicar(bloque, memo)
+        return np.dot(self._evaluar_arbol(izquierdo, memo), bloque)
+
+    def _evaluar_arbol(self, arbol, memo):
+        if isinstance(arbol, int):
+            return self.factores[arbol].evaluar(memo)
+        izquierdo, derecho = arbol
+        return np.dot(self._evaluar_arbol(izquierdo, memo), self._evaluar_arbol(derecho, memo))
+
+    def _evaluar(self, memo):
+        arbol, _ = orden_de_contraccion([factor.forma for factor in self.factores])
+        return self._evaluar_arbol(arbol, memo)
+
+    def _adjunto(self):
+        return Producto([factor.adjunto() for factor in reversed(self.factores)])
+
+
+class Suma(Operador):
+    def __init__(self, terminos):
+        """
+        Suma de operadores de la misma forma.
+
+        Parámetros:
+        - terminos (list of Operador): Los sumandos.
+        """
+        self.terminos = []
+        for termino in terminos:
+            termino = _como_operador(termino)
+            self.terminos.extend(termino.terminos if isinstance(termino, Suma) else [termino])
+        if len({termino.forma for termino in self.terminos}) != 1:
+            raise ValueError("Todos los sumandos deben tener la misma forma")
+        self.forma = self.terminos[0].forma
+
+    def _aplicar(self, vector, memo):
+        resultado = self.terminos[0].aplicar(vector, memo)
+        for termino in self.terminos[1:]:
+            resultado = resultado + termino.aplicar(vector, memo)
+        return resultado
+
+    def _evaluar(self, memo):
+        resultado = self.terminos[0].evaluar(memo)
+        for termino in self.terminos[1:]:
+            resultado = resultado + termino.evaluar(memo)
+        return resultado
+
+    def _adjunto(self):
+        return Suma([termino.adjunto() for termino in self.terminos])
+
+
+class Escalar(Operador):
+    def __init__(self, escalar, operando):
+        """
+        Producto de un escalar por un operador.
+
+        Parámetros:
+        - escalar (complex): El escalar.
+        - operando (Operador): El operador.
+        """
+        operando = _como_operador(operando)
+        if isinstance(operando, Escalar):
+            escalar, operando = escalar * operando.escalar, operando.operando
+        self.escalar = escalar
+        self.operando = operando
+        self.forma = operando.forma
+
+    def _aplicar(self, vector, memo):
+        return self.escalar * self.operando.aplicar(vector, memo)
+
+    def _evaluar(self, memo):
+        return self.escalar * self.operando.evaluar(memo)
+
+    def _adjunto(self):
+        return Escalar(np.conjugate(self.escalar), self.operando.adjunto())
+
+
+class Tensor(Operador):
+    def __init__(self, factores):
+        """
+        Producto tensor F1 ⊗ F2 ⊗ ... ⊗ Fn, aplicado factor por factor sin formar el producto de Kronecker.
+
+        Parámetros:
+        - factores (list of Operador): Los factores.
+        """
+        self.factores = []
+        for factor in factores:
+            factor = _como_operador(factor)
+            self.factores.extend(factor.factores if isinstance(factor, Tensor) else [factor])
+        self.forma = (int(np.prod([f.forma[0] for f in self.factores])),
+                      int(np.prod([f.forma[1] for f in self.factores])))
+
+    def _aplicar(self, vector, memo):
+        columnas = vector.shape[1:]
+        tensor = vector.reshape([f.forma[1] for f in self.factores] + list(columnas))
+        for eje, factor in enumerate(self.factores):
+            movido = np.moveaxis(tensor, eje, 0)
+            resto = movido.shape[1:]
+            # Se omite la memoización: cada factor actúa sobre un bloque distinto
+            resultado = factor._aplicar(movido.reshape(movido.shape[0], -1), memo)
+            tensor = np.moveaxis(resultado.reshape((factor.forma[0],) + resto), 0, eje)
+        return tensor.reshape((self.forma[0],) + columnas)
+
+    def _evaluar(self, memo):
+        resultado = self.factores[0].evaluar(memo)
+        for factor in self.factores[1:]:
+            resultado = np.kron(resultado, factor.evaluar(memo))
+        return resultado
+
+    def _adjunto(self):
+        return Tensor([factor.adjunto() for factor in self.factores])
+
+
+# Versiones perezosas de las operaciones de libreria_CYNT_com: construyen el grafo
+# de operaciones y no calculan nada hasta aplicar() o evaluar()
+
+def perezoso(matriz):
+    """
+    Parámetros:
+    - matriz (numpy.ndarray, MatrizDispersaCSR or Operador): La matriz.
+
+    Retorna:
+    - operador (Operador): La matriz como hoja del grafo (o el mismo operador).
+    """
+    return _como_operador(matriz)
+
+def add_complex_matrices(matrix1, matrix2):
+    """
+    Parámetros:
+    - matrix1, matrix2 (numpy.ndarray or Operador): Los sumandos, de la misma forma.
+
+    Retorna:
+    - suma (Suma): El operador matrix1 + matrix2.
+    """
+    return Suma([matrix1, matrix2])
+
+def inverse_complex_matrix(matrix):
+    """
+    Parámetros:
+    - matrix (numpy.ndarray or Operador): La matriz.
+
+    Retorna:
+    - inverso (Escalar): El operador -matrix.
+    """
+    return Escalar(-1, matrix)
+
+def scalar_multiply_complex_matrix(scalar, matrix):
+    """
+    Parámetros:
+    - scalar (complex): El escalar.
+    - matrix (numpy.ndarray or Operador): La matriz.
+
+    Retorna:
+    - producto (Escalar): El operador scalar · matrix.
+    """
+    return Escalar(scalar, matrix)
+
+def complex_adjoint(matrix):
+    """
+    Parámetros:
+    - matrix (numpy.ndarray, MatrizDispersaCSR or Operador): La matriz.
+
+    Retorna:
+    - adjunto (Operador): El operador matrix† (disperso si la matriz lo es).
+    """
+    return _como_operador(matrix).adjunto()
+
+def matrix_multiply(matrix1, matrix2):
+    """
+    Parámetros:
+    - matrix1, matrix2 (numpy.ndarray or Operador): Los factores, de formas compatibles.
+
+    Retorna:
+    - producto (Producto): El operador matrix1 · matrix2.
+    """
+    return Producto([matrix1, matrix2])
+
+def tensor_product(matrix1, matrix2):
+    """
+    Parámetros:
+    - matrix1, matrix2 (numpy.ndarray or Operador): Los factores.
+
+    Retorna:
+    - producto (Tensor): El operador matrix1 ⊗ matrix2.
+    """
+    return Tensor([matrix1, matrix2])
@@ -0,0 +1,171 @@
+import contextlib
+
+import numpy as np
+
+from matriz_dispersa import MatrizDispersaCSR
+
+# Precisiones disponibles: "doble" usa los arreglos tal como llegan (complex128/float64 por
+# defecto); "simple" los convierte a complex64/float32, con la mitad de memoria y de ancho de banda
+PRECISIONES = {
+    "doble": (np.complex128, np.float64),
+    "simple": (np.complex64, np.float32),
+}
+
+# Tolerancias por defecto de los métodos iterativos en cada precisión
+TOLERANCIAS = {"doble": 1e-10, "simple": 1e-5}
+
+_politica = {"precision": "doble", "renormalizar_cada": None}
+
+
+def configurar_precision(precision="doble", renormalizar_cada=None):
+    """
+    Fija la política de precisión de toda la biblioteca.
+
+    Parámetros:
+    - precision (str): "doble" o "simple".
+    - renormalizar_cada (int, opcional): Si se indica, las evoluciones paso a paso renormalizan
+      los estados complejos (cuánticos) cada ese número de pasos, para que el error de redondeo
+      no se acumule en la norma, y propagar retorna el estado final normalizado con cualquier método.
+    """
+    if precision not in PRECISIONES:
+        raise ValueError(f"Precisión desconocida: {precision}")
+    if renormalizar_cada is not None and renormalizar_cada < 1:
+        raise ValueError("renormalizar_cada debe ser al menos 1")
+    _politica["precision"] = precision
+    _politica["renormalizar_cada"] = renormalizar_cada
+
+
+def obtener_precision():
+    """
+    Retorna:
+    - precision (str): La precisión actual, "doble" o "simple".
+    """
+    return _politica["precision"]
+
+
+def pasos_de_renormalizacion():
+    """
+    Retorna:
+    - pasos (int or None): Cada cuántos pasos se renormalizan los estados cuánticos (None si nunca).
+    """
+    return _politica["renormalizar_cada"]
+
+
+@contextlib.contextmanager
+def precision_temporal(precision, renormalizar_cada=None):
+    """
+    Cambia la política de precisión dentro de un bloque with y la restaura al salir.
+
+    Parámetros:
+    - precision (str): "doble" o "simple".
+    - renormalizar_cada (int, opcional): Igual que en configurar_precision.
+    """
+    anterior = dict(_politica)
+    configurar_precision(precision, renormalizar_cada)
+    try:
+        yield
+    finally:
+        _politica.update(anterior)
+
+
+def tipo_complejo():
+    """
+    Retorna:
+    - dtype (numpy.dtype): El tipo complejo de la precisión actual.
+    """
+    return np.dtype(PRECISIONES[_politica["precision"]][0])
+
+
+def tipo_real():
+    """
+    Retorna:
+    - dtype (numpy.dtype): El tipo real de la precisión actual.
+    """
+    return np.dtype(PRECISIONES[_politica["precision"]][1])
+
+
+def tolerancia_por_defecto():
+    """
+    Retorna:
+    - tolerancia (float): Tolerancia alcanzable por los métodos iterativos en la precisión actual.
+    """
+    return TOLERANCIAS[_politica["precision"]]
+
+
+def ajustar_precision(arreglo):
+    """
+    Convierte un arreglo (o MatrizDispersaCSR) a la precisión actual.
+
+    En precisión "simple" los complejos pasan a complex64 y los reales de punto flotante a float32;
+    los enteros y booleanos no cambian. En precisión "doble" el arreglo se deja como está.
+    No se copia nada si el arreglo ya tiene el tipo adecuado.
+
+    Parámetros:
+    - arreglo (array_like or MatrizDispersaCSR): El arreglo.
+
+    Retorna:
+    - arreglo (numpy.ndarray or MatrizDispersaCSR): El arreglo en la precisión actual.
+    """
+    if isinstance(arreglo, MatrizDispersaCSR):
+        datos = ajustar_precision(arreglo.datos)
+        if datos is arreglo.datos:
+            return arreglo
+        return MatrizDispersaCSR(datos, arreglo.indices, arreglo.punteros, arreglo.forma)
+    arreglo = np.asarray(arreglo)
+    if _politica["precision"] == "doble":
+        return arreglo
+    if np.iscomplexobj(arreglo):
+        return arreglo.astype(tipo_complejo(), copy=False)
+    if np.issubdtype(arreglo.dtype, np.floating):
+        return arreglo.astype(tipo_real(), copy=False)
+    return arreglo
+
+
+def renormalizar(estado, eje=0):
+    """
+    Normaliza un estado cuántico (o las columnas de un arreglo de estados) a norma 1.
+
+    Parámetros:
+    - estado (numpy.ndarray): Vector de estado, o arreglo con un estado por columna (eje=0) o por fila (eje=-1).
+    - eje (int): Eje a lo largo del cual se calcula la norma.
+
+    Retorna:
+    - estado (numpy.ndarray): El estado normalizado.
+    """
+    if estado.ndim == 1:
+        return estado / np.linalg.norm(estado)
+    return estado / np.linalg.norm(estado, axis=eje, keepdims=True)
+
+
+def cota_error(dimension, pasos, dtype=None, norma_matriz=1.0):
+    """
+    Estima el error de redondeo acumulado al aplicar pasos productos matriz-vector.
+
+    Cada producto en punto flotante equivale a multiplicar por una matriz con error relativo
+    componente a componente de a lo sumo γ_d = d·u / (1 - d·u), con u = ε/2 la unidad de
+    redondeo. Con n = pasos:
+
+    - peor_caso = n · γ_d · ‖ |M| ‖, una cota rigurosa (a primer orden en u).
+    - tipica = n · √d · u · ‖ |M| ‖, una estimación: si los d errores de redondeo de cada
+      producto escalar son independientes y de media cero, su suma crece como √d·u y no como
+      d·u. Los errores de pasos distintos se siguen sumando linealmente, así que no es una
+      cota pero rara vez se supera.
+
+    Parámetros:
+    - dimension (int): Dimensión d del estado.
+    - pasos (int): Número de productos matriz-vector.
+    - dtype (numpy.dtype, opcional): Tipo de dato; por defecto el complejo de la precisión actual.
+    - norma_matriz (float): Cota de ‖ |M| ‖ (1 para matrices de permutación o estocásticas; para
+      unitarias densas puede llegar a sqrt(d)).
+
+    Retorna:
+    - cotas (dict): "peor_caso" y "tipica", errores relativos en la norma del estado.
+    """
+    dtype = tipo_complejo() if dtype is None else np.dtype(dtype)
+    unidad_redondeo = np.finfo(dtype).eps / 2
+    producto = dimension * unidad_redondeo
+    gamma = producto / (1 - producto) if producto < 1 else np.inf
+    return {
+        "peor_caso": float(pasos * gamma * norma_matriz),
+        "tipica": float(pasos * np.sqrt(dimension) * unidad_redondeo * norma_matriz),
+    }
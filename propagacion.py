@@ -0,0 +1,372 @@
+import numpy as np
+
+from cache_matrices import CacheLRU, clave_matriz
+from instrumentacion import contar_flops, flops_producto, instrumentar
+from matriz_dispersa import MatrizDispersaCSR
+from precision import ajustar_precision, pasos_de_renormalizacion, renormalizar, tolerancia_por_defecto
+
+# Métodos de propagación disponibles
+METODOS = ("auto", "iterativo", "potencia", "espectral", "ciclos")
+
+# Número máximo de descomposiciones espectrales guardadas en caché
+TAMANO_CACHE_ESPECTRAL = 8
+
+# Condición máxima de la matriz de autovectores para aceptar la diagonalización
+CONDICION_MAXIMA = 1e8
+
+# Pesos relativos del modelo de costo: un producto matriz-matriz aprovecha
+# mucho mejor la caché que un producto matriz-vector, y cada paso del bucle
+# en Python tiene un costo fijo aproximado (en operaciones equivalentes).
+# Valores calibrados con benchmark_propagacion.py
+_COSTO_FLOP_MATVEC = 1.0
+_COSTO_FLOP_MATMUL = 0.25
+_COSTO_FLOP_EIG = 17.0
+_COSTO_EIG_FIJO = 4e5
+_COSTO_PASO_PYTHON = 2000.0
+
+_cache_espectral = CacheLRU(TAMANO_CACHE_ESPECTRAL)
+
+
+@instrumentar()
+def descomposicion_espectral(matriz):
+    """
+    Obtiene (y guarda en caché) la diagonalización M = V diag(λ) V⁻¹ de una matriz.
+
+    Si la matriz es exactamente Hermitiana se usa eigh; en otro caso eig (una matriz casi
+    Hermitiana no se trata como tal: eigh descartaría su parte anti-Hermitiana, cuyo efecto
+    crece con el número de pasos). Las matrices no
+    diagonalizables (o con autovectores mal condicionados) se marcan en caché
+    para no volver a intentarlo.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz de transición cuadrada.
+
+    Retorna:
+    - descomposicion (tuple or None): (autovalores, autovectores, inversa_autovectores),
+      o None si la matriz no es diagonalizable de forma estable.
+    """
+    clave = clave_matriz(matriz)
+    if clave in _cache_espectral:
+        return _cache_espectral.obtener(clave)
+
+    if np.array_equal(matriz, matriz.conj().T):
+        autovalores, autovectores = np.linalg.eigh(matriz)
+        descomposicion = (autovalores, autovectores, autovectores.conj().T)
+    else:
+        autovalores, autovectores = np.linalg.eig(matriz)
+        if np.linalg.cond(autovectores) > CONDICION_MAXIMA:
+            descomposicion = None
+        else:
+            descomposicion = (autovalores, autovectores, np.linalg.inv(autovectores))
+
+    _cache_espectral.guardar(clave, descomposicion)
+    return descomposicion
+
+
+def registrar_descomposicion_espectral(matriz, descomposicion):
+    """
+    Guarda en caché una diagonalización ya conocida (por ejemplo, leída de un punto de control),
+    para que propagar no vuelva a calcularla.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz de transición cuadrada.
+    - descomposicion (tuple): (autovalores, autovectores, inversa_autovectores), como en descomposicion_espectral.
+    """
+    _cache_espectral.guardar(clave_matriz(matriz), descomposicion)
+
+
+def limpiar_cache_espectral():
+    """
+    Vacía la caché de descomposiciones espectrales.
+    """
+    _cache_espectral.limpiar()
+
+
+def costos_estimados(dimension, pasos, columnas=1, en_cache=False):
+    """
+    Estima el costo relativo de cada método de propagación.
+
+    Parámetros:
+    - dimension (int): Dimensión d de la matriz de transición.
+    - pasos (int): Número de pasos a propagar.
+    - columnas (int): Número de vectores de estado propagados a la vez.
+    - en_cache (bool): True si la descomposición espectral ya está en caché.
+
+    Retorna:
+    - costos (dict): Costo estimado de cada método (excepto "auto").
+    """
+    d = float(dimension)
+    matvec = _COSTO_FLOP_MATVEC * d * d * columnas
+    matmul = _COSTO_FLOP_MATMUL * d * d * d
+    bits = max(int(pasos).bit_length(), 1)
+    unos = bin(int(pasos)).count("1")
+
+    iterativo = pasos * (matvec + _COSTO_PASO_PYTHON)
+    potencia = (bits - 1) * (matmul + _COSTO_PASO_PYTHON) + unos * (matvec + _COSTO_PASO_PYTHON)
+    espectral = 2 * matvec + 3 * _COSTO_PASO_PYTHON
+    if not en_cache:
+        espectral += _COSTO_EIG_FIJO + _COSTO_FLOP_EIG * d * d * d
+    return {"iterativo": iterativo, "potencia": potencia, "espectral": espectral}
+
+
+def elegir_metodo(matriz, pasos, columnas=1):
+    """
+    Elige el método de propagación más barato según el modelo de costo.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz de transición.
+    - pasos (int): Número de pasos a propagar.
+    - columnas (int): Número de vectores de estado propagados a la vez.
+
+    Retorna:
+    - metodo (str): "iterativo", "potencia" o "espectral".
+    """
+    # Si ni siquiera con la diagonalización en caché gana el método espectral,
+    # no hace falta calcular la clave de la matriz
+    costos = costos_estimados(matriz.shape[0], pasos, columnas, en_cache=True)
+    if min(costos, key=costos.get) != "espectral":
+        return min(costos, key=costos.get)
+
+    clave = clave_matriz(matriz)
+    en_cache = clave in _cache_espectral
+    costos = costos_estimados(matriz.shape[0], pasos, columnas, en_cache)
+    if en_cache and _cache_espectral.obtener(clave) is None:
+        del costos["espectral"]
+    return min(costos, key=costos.get)
+
+
+@instrumentar(flops=lambda matriz, estado, pasos: pasos * flops_producto(matriz, estado))
+def _propagar_iterativo(matriz, estado, pasos):
+    # Los estados cuánticos (complejos) se renormalizan periódicamente si la política lo pide
+    cada = pasos_de_renormalizacion() if np.iscomplexobj(estado) else None
+    # matriz.dot sirve tanto para numpy.ndarray como para MatrizDispersaCSR
+    for paso in range(1, pasos + 1):
+        estado = matriz.dot(estado)
+        if cada and paso % cada == 0:
+            estado = renormalizar(estado)
+    return estado
+
+
+# Cuadrados sucesivos de la matriz más un producto por el estado por cada bit 1 de los pasos
+@instrumentar(flops=lambda matriz, estado, pasos: ((int(pasos).bit_length() - 1) * flops_producto(matriz, matriz)
+                                                 + bin(int(pasos)).count("1") * flops_producto(matriz, estado)))
+def _propagar_potencia(matriz, estado, pasos):
+    # Exponenciación por cuadrados aplicada directamente al estado:
+    # solo se multiplican matrices log2(pasos) veces
+    base = matriz
+    while pasos:
+        if pasos & 1:
+            estado = np.dot(base, estado)
+        pasos >>= 1
+        if pasos:
+            base = np.dot(base, base)
+    return estado
+
+
+@instrumentar()
+def _propagar_espectral(matriz, estado, pasos):
+    descomposicion = descomposicion_espectral(matriz)
+    if descomposicion is None:
+        # Las operaciones las registra _propagar_potencia
+        return _propagar_potencia(matriz, estado, pasos)
+    autovalores, autovectores, inversa = descomposicion
+    contar_flops(2 * flops_producto(matriz, estado))
+    coeficientes = np.dot(inversa, estado)
+    potencias = autovalores ** pasos
+    if coeficientes.ndim > 1:
+        potencias = potencias[:, np.newaxis]
+    resultado = np.dot(autovectores, potencias * coeficientes)
+    if not np.iscomplexobj(matriz) and not np.iscomplexobj(estado):
+        resultado = resultado.real
+    return resultado
+
+
+def _estacionaria_de_cadena(matriz):
+    # Distribución estacionaria si la matriz es densa, real, no negativa y estocástica por columnas
+    # (salvo redondeo); None en otro caso o si la cadena no tiene una única distribución estacionaria
+    if isinstance(matriz, MatrizDispersaCSR) or np.iscomplexobj(matriz) or np.any(matriz < 0):
+        return None
+    margen = 10 * len(matriz) * np.finfo(matriz.dtype if np.issubdtype(matriz.dtype, np.floating) else float).eps
+    if np.max(np.abs(matriz.sum(axis=0) - 1)) > margen:
+        return None
+    try:
+        return distribucion_estacionaria(matriz)
+    except ValueError:
+        return None
+
+
+def _cerca_de_estacionaria(estado, estacionaria, tolerancia):
+    # Para M estocástica por columnas ‖M v‖₁ ≤ ‖v‖₁ y M (s π) = s π: si el estado (de masa s) está
+    # a distancia L1 ≤ tolerancia · |s| de s π, todos los estados siguientes también lo están
+    masa = np.sum(estado, axis=0)
+    objetivo = np.multiply.outer(estacionaria, masa) if estado.ndim > 1 else estacionaria * masa
+    distancia = np.sum(np.abs(estado - objetivo), axis=0)
+    return bool(np.all(distancia <= tolerancia * np.abs(masa))), objetivo
+
+
+@instrumentar()
+def _propagar_ciclos(matriz, estado, pasos, estacionaria=None, tolerancia=0):
+    # Algoritmo de Brent: se compara cada estado con uno de referencia que se renueva en las
+    # potencias de dos. Si el estado del paso k es exactamente igual al del paso k - longitud, la
+    # trayectoria se repite con periodo divisor de longitud (un punto fijo tiene periodo 1) y
+    # basta avanzar (pasos - k) mod longitud pasos más. Memoria constante, sin guardar la trayectoria.
+    # Dos estados solo parecidos no bastan: una cadena que mezcla lento cambia muy poco en cada paso
+    # pero mucho en muchos pasos. Para cadenas estocásticas se corta además cuando el estado ya está
+    # a menos de `tolerancia` de la distribución estacionaria.
+    # Solo se cuentan las operaciones de los pasos ejecutados, no las de los pasos saltados
+    flops_paso = flops_producto(matriz, estado)
+    referencia = estado
+    potencia = longitud = 1
+    for paso in range(1, pasos + 1):
+        estado = matriz.dot(estado)
+        if np.array_equal(estado, referencia):
+            restantes = (pasos - paso) % longitud
+            for _ in range(restantes):
+                estado = matriz.dot(estado)
+            contar_flops((paso + restantes) * flops_paso)
+            return estado
+        if estacionaria is not None:
+            convergio, objetivo = _cerca_de_estacionaria(estado, estacionaria, tolerancia)
+            if convergio:
+                contar_flops(paso * flops_paso)
+                return objetivo.astype(estado.dtype, copy=False)
+        if longitud == potencia:
+            referencia = estado
+            potencia *= 2
+            longitud = 0
+        longitud += 1
+    contar_flops(pasos * flops_paso)
+    return estado
+
+
+def _propagar_con_ciclos(matriz, estado, pasos, tolerancia):
+    tolerancia = tolerancia_por_defecto() if tolerancia is None else tolerancia
+    estacionaria = _estacionaria_de_cadena(matriz) if tolerancia > 0 else None
+    return _propagar_ciclos(matriz, estado, pasos, estacionaria, tolerancia)
+
+
+@instrumentar()
+def propagar(matriz_transicion, estado_inicial, pasos, metodo="auto", tolerancia=None):
+    """
+    Aplica la matriz de transición al estado inicial el número de pasos indicado.
+
+    Equivale a multiplicar por la matriz de transición paso a paso, pero permite
+    usar exponenciación por cuadrados o una diagonalización en caché cuando
+    resultan más baratas que los productos matriz-vector sucesivos. La matriz y
+    el estado se convierten a la precisión configurada en el módulo precision y, si la
+    política pide renormalizar, el estado cuántico (complejo) final tiene norma 1 con
+    cualquier método.
+
+    Parámetros:
+    - matriz_transicion (numpy.ndarray or MatrizDispersaCSR): La matriz de transición cuadrada.
+    - estado_inicial (numpy.ndarray): El vector de estado inicial.
+    - pasos (int): Número de pasos a propagar.
+    - metodo (str): "auto", "iterativo", "potencia", "espectral" o "ciclos". Con "ciclos" se itera
+      hasta que un estado se repite exactamente (punto fijo u órbita periódica) y se salta
+      directamente al paso pedido; si la matriz es densa y estocástica por columnas, también
+      hasta que el estado queda a menos de `tolerancia` de la distribución estacionaria.
+    - tolerancia (float, opcional): Solo para "ciclos" con cadenas estocásticas: distancia L1 máxima
+      (relativa a la masa del estado) a la distribución estacionaria; como M no aumenta la norma
+      L1, el resultado queda a esa distancia del exacto. 0 desactiva este criterio. Por defecto,
+      la tolerancia de la precisión configurada.
+
+    Retorna:
+    - estado_final (numpy.ndarray): El estado después de los pasos indicados.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método de propagación desconocido: {metodo}")
+    pasos = int(pasos)
+    if pasos < 0:
+        raise ValueError("El número de pasos no puede ser negativo")
+    estado_final = _propagar_con_metodo(matriz_transicion, ajustar_precision(estado_inicial), pasos, metodo, tolerancia)
+    # Misma política de norma para todos los métodos: _propagar_iterativo además renormaliza
+    # durante la evolución, pero el estado final solo difiere en un factor de escala
+    if pasos_de_renormalizacion() and np.iscomplexobj(estado_final):
+        estado_final = renormalizar(estado_final)
+    return estado_final
+
+
+def _propagar_con_metodo(matriz_transicion, estado_inicial, pasos, metodo, tolerancia):
+    if pasos == 0:
+        return estado_inicial
+
+    matriz_transicion = ajustar_precision(matriz_transicion)
+    if isinstance(matriz_transicion, MatrizDispersaCSR):
+        # Las potencias de una matriz dispersa se llenan: solo se itera, en O(nnz) por paso
+        if metodo not in ("auto", "iterativo", "ciclos"):
+            raise ValueError("Las matrices dispersas solo admiten los métodos iterativo y ciclos")
+        if metodo == "ciclos":
+            return _propagar_con_ciclos(matriz_transicion, estado_inicial, pasos, tolerancia)
+        return _propagar_iterativo(matriz_transicion, estado_inicial, pasos)
+
+    if metodo == "auto":
+        columnas = estado_inicial.shape[1] if estado_inicial.ndim > 1 else 1
+        metodo = elegir_metodo(matriz_transicion, pasos, columnas)
+
+    if metodo == "iterativo":
+        return _propagar_iterativo(matriz_transicion, estado_inicial, pasos)
+    if metodo == "ciclos":
+        return _propagar_con_ciclos(matriz_transicion, estado_inicial, pasos, tolerancia)
+    if metodo == "potencia":
+        return _propagar_potencia(matriz_transicion, estado_inicial, pasos)
+    return _propagar_espectral(matriz_transicion, estado_inicial, pasos)
+
+
+@instrumentar()
+def propagar_lote(matriz_transicion, estados_iniciales, pasos, metodo="auto", tolerancia=None):
+    """
+    Propaga un lote de estados iniciales con la misma matriz de transición.
+
+    Los estados se evolucionan juntos como columnas de una matriz, de modo que
+    cada paso es un único producto matriz-matriz en lugar de N productos
+    matriz-vector.
+
+    Parámetros:
+    - matriz_transicion (numpy.ndarray or MatrizDispersaCSR): La matriz de transición cuadrada (d, d).
+    - estados_iniciales (numpy.ndarray): Arreglo (N, d) con un estado inicial por fila.
+    - pasos (int): Número de pasos a propagar.
+    - metodo (str): "auto", "iterativo", "potencia", "espectral" o "ciclos".
+    - tolerancia (float, opcional): Solo para "ciclos" (ver propagar); se corta cuando todos los
+      estados del lote se repiten o cumplen el criterio.
+
+    Retorna:
+    - estados_finales (numpy.ndarray): Arreglo (N, d) con los estados finales, en el mismo orden.
+    """
+    estados_iniciales = np.asarray(estados_iniciales)
+    if estados_iniciales.ndim != 2:
+        raise ValueError("Los estados iniciales deben formar un arreglo (N, d)")
+    return propagar(matriz_transicion, estados_iniciales.T, pasos, metodo, tolerancia).T
+
+
+def distribucion_estacionaria(matriz_transicion):
+    """
+    Calcula directamente la distribución estacionaria π = M π de una matriz estocástica por columnas.
+
+    Resuelve el sistema lineal (M - I) π = 0 con Σ π = 1, en lugar de iterar: para una cadena
+    irreducible y aperiódica es el límite de rendijas_clasico_probabilistico cuando los pasos
+    tienden a infinito, cualquiera sea el estado inicial.
+
+    Parámetros:
+    - matriz_transicion (numpy.ndarray or MatrizDispersaCSR): Matriz (d, d) no negativa cuyas columnas suman 1.
+
+    Retorna:
+    - distribucion (numpy.ndarray): El vector de probabilidades estacionario.
+    """
+    if isinstance(matriz_transicion, MatrizDispersaCSR):
+        matriz_transicion = matriz_transicion.a_densa()
+    matriz = np.asarray(matriz_transicion, dtype=float)
+    if matriz.ndim != 2 or matriz.shape[0] != matriz.shape[1]:
+        raise ValueError("La matriz de transición debe ser cuadrada")
+    if np.any(matriz < 0) or not np.allclose(matriz.sum(axis=0), 1):
+        raise ValueError("La matriz de transición no es estocástica por columnas")
+
+    # Una de las ecuaciones de (M - I) π = 0 es redundante: se reemplaza por la normalización
+    sistema = matriz - np.eye(len(matriz))
+    sistema[-1, :] = 1
+    lado_derecho = np.zeros(len(matriz))
+    lado_derecho[-1] = 1
+    try:
+        distribucion = np.linalg.solve(sistema, lado_derecho)
+    except np.linalg.LinAlgError:
+        raise ValueError("La cadena no tiene una única distribución estacionaria (no es irreducible)") from None
+    return distribucion
@@ -0,0 +1,203 @@
+import numpy as np
+
+# Número de filas o columnas comparadas por bloque en las comprobaciones exactas
+TAMANO_BLOQUE = 256
+
+# Modos de comprobación: "exacto" compara todas las entradas (deteniéndose en el primer
+# bloque que falle); "probabilistico" solo aplica la matriz a unos vectores aleatorios
+MODOS = ("exacto", "probabilistico")
+
+
+def tolerancia_para(dtype):
+    """
+    Tolerancia absoluta por defecto de las comprobaciones para un tipo de dato: √ε, que es
+    1.5e-8 en doble precisión (como numpy.allclose) y 3.5e-4 en precisión simple.
+
+    Parámetros:
+    - dtype (numpy.dtype): Tipo de dato de la matriz (los enteros se tratan como float64).
+
+    Retorna:
+    - tolerancia (float): La tolerancia.
+    """
+    return float(np.sqrt(np.finfo(np.result_type(dtype, np.float32)).eps))
+
+
+def _cerca(a, b, rtol, atol):
+    # Misma tolerancia que numpy.allclose(a, b)
+    return np.all(np.abs(a - b) <= atol + rtol * np.abs(b))
+
+
+def es_hermitiana_por_bloques(matriz, rtol=1e-05, atol=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Comprueba si una matriz es Hermitiana comparando bloques de filas con bloques de columnas.
+
+    Equivale a numpy.allclose(matriz, matriz.conj().T), pero no forma la conjugada transpuesta
+    completa y termina en cuanto un bloque no coincide.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz que se va a comprobar.
+    - rtol, atol (float): Tolerancias relativa y absoluta, como en numpy.allclose (por defecto
+      atol es tolerancia_para(matriz.dtype)).
+    - tamano_bloque (int): Número de filas comparadas por bloque.
+
+    Retorna:
+    - es_hermitiana (bool): True si la matriz es Hermitiana, False en caso contrario.
+    """
+    matriz = np.asarray(matriz)
+    if matriz.ndim != 2 or matriz.shape[0] != matriz.shape[1]:
+        return False
+    atol = tolerancia_para(matriz.dtype) if atol is None else atol
+    for inicio in range(0, matriz.shape[0], tamano_bloque):
+        filas = matriz[inicio:inicio + tamano_bloque, :]
+        columnas = np.conjugate(matriz[:, inicio:inicio + tamano_bloque]).T
+        if not _cerca(filas, columnas, rtol, atol):
+            return False
+    return True
+
+
+def es_unitaria_por_bloques(matriz, rtol=1e-05, atol=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Comprueba si U · U† = I calculando el producto por bloques de columnas.
+
+    Equivale a numpy.allclose(U · U†, I), pero solo guarda un bloque (d, tamano_bloque) del
+    producto a la vez y termina en cuanto un bloque no coincide con la identidad.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz que se va a comprobar.
+    - rtol, atol (float): Tolerancias relativa y absoluta, como en numpy.allclose (por defecto
+      atol es tolerancia_para(matriz.dtype)).
+    - tamano_bloque (int): Número de columnas del producto calculadas por bloque.
+
+    Retorna:
+    - es_unitaria (bool): True si la matriz es unitaria, False en caso contrario.
+    """
+    matriz = np.asarray(matriz)
+    if matriz.ndim != 2:
+        return False
+    atol = tolerancia_para(matriz.dtype) if atol is None else atol
+    filas = matriz.shape[0]
+    for inicio in range(0, filas, tamano_bloque):
+        fin = min(inicio + tamano_bloque, filas)
+        # (U U†)[:, inicio:fin] = U · conj(U[inicio:fin, :])ᵀ
+        bloque = np.dot(matriz, np.conjugate(matriz[inicio:fin, :]).T)
+        identidad = np.zeros_like(bloque, dtype=float)
+        identidad[np.arange(inicio, fin), np.arange(fin - inicio)] = 1
+        if not _cerca(bloque, identidad, rtol, atol):
+            return False
+    return True
+
+
+def _vectores_de_prueba(dimension, num_pruebas, semilla):
+    rng = np.random.default_rng(semilla)
+    vectores = rng.standard_normal((dimension, num_pruebas)) + 1j * rng.standard_normal((dimension, num_pruebas))
+    return vectores / np.linalg.norm(vectores, axis=0)
+
+
+def _aplicar_adjunta(matriz, vectores):
+    # U† v = conj(Uᵀ conj(v)), sin formar U†
+    return np.conjugate(np.dot(matriz.T, np.conjugate(vectores)))
+
+
+def es_unitaria_probabilistica(matriz, num_pruebas=2, tolerancia=None, semilla=None):
+    """
+    Comprueba de forma aleatorizada si una matriz cuadrada es unitaria, en O(d²).
+
+    Verifica que ‖U U† v - v‖ sea pequeña para unos pocos vectores aleatorios v. Una matriz
+    unitaria siempre pasa; una que no lo es falla con probabilidad casi uno.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz que se va a comprobar.
+    - num_pruebas (int): Número de vectores aleatorios.
+    - tolerancia (float, opcional): Error relativo máximo permitido (por defecto tolerancia_para(matriz.dtype)).
+    - semilla (int, opcional): Semilla para reproducir los vectores de prueba.
+
+    Retorna:
+    - es_unitaria (bool): True si la matriz pasa todas las pruebas.
+    """
+    matriz = np.asarray(matriz)
+    if matriz.ndim != 2 or matriz.shape[0] != matriz.shape[1]:
+        return False
+    tolerancia = tolerancia_para(matriz.dtype) if tolerancia is None else tolerancia
+    vectores = _vectores_de_prueba(matriz.shape[0], num_pruebas, semilla)
+    residuo = np.dot(matriz, _aplicar_adjunta(matriz, vectores)) - vectores
+    return bool(np.all(np.linalg.norm(residuo, axis=0) <= tolerancia))
+
+
+def es_hermitiana_probabilistica(matriz, num_pruebas=2, tolerancia=None, semilla=None):
+    """
+    Comprueba de forma aleatorizada si una matriz es Hermitiana, en O(d²).
+
+    Verifica que A v y A† v coincidan para unos pocos vectores aleatorios v.
+
+    Parámetros:
+    - matriz (numpy.ndarray): La matriz que se va a comprobar.
+    - num_pruebas (int): Número de vectores aleatorios.
+    - tolerancia (float, opcional): Error máximo permitido, relativo a la norma de A v (por defecto
+      tolerancia_para(matriz.dtype)).
+    - semilla (int, opcional): Semilla para reproducir los vectores de prueba.
+
+    Retorna:
+    - es_hermitiana (bool): True si la matriz pasa todas las pruebas.
+    """
+    matriz = np.asarray(matriz)
+    if matriz.ndim != 2 or matriz.shape[0] != matriz.shape[1]:
+        return False
+    tolerancia = tolerancia_para(matriz.dtype) if tolerancia is None else tolerancia
+    vectores = _vectores_de_prueba(matriz.shape[0], num_pruebas, semilla)
+    accion = np.dot(matriz, vectores)
+    diferencia = np.linalg.norm(accion - _aplicar_adjunta(matriz, vectores), axis=0)
+    return bool(np.all(diferencia <= tolerancia * np.maximum(np.linalg.norm(accion, axis=0), 1)))
+
+
+class OperadorVerificado:
+    def __init__(self, matriz, **propiedades):
+        """
+        Envuelve una matriz y guarda las propiedades ya comprobadas, para no volver a validarlas.
+
+        Parámetros:
+        - matriz (numpy.ndarray): La matriz del operador.
+        - propiedades (bool, opcional): Propiedades ya conocidas, por ejemplo es_unitaria=True
+          (útil al cargar un operador verificado previamente).
+        """
+        self.matriz = np.asarray(matriz)
+        self.propiedades = {}
+        for nombre, valor in propiedades.items():
+            self.propiedades[(nombre, "exacto")] = bool(valor)
+
+    def _comprobar(self, nombre, modo, exacta, probabilistica):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de comprobación desconocido: {modo}")
+        # Un resultado exacto sirve para cualquier modo; uno probabilístico solo para ese modo
+        for clave in [(nombre, "exacto"), (nombre, modo)]:
+            if clave in self.propiedades:
+                return self.propiedades[clave]
+        comprobacion = exacta if modo == "exacto" else probabilistica
+        self.propiedades[(nombre, modo)] = comprobacion(self.matriz)
+        return self.propiedades[(nombre, modo)]
+
+    def es_unitaria(self, modo="exacto"):
+        """
+        Parámetros:
+        - modo (str): "exacto" o "probabilistico".
+
+        Retorna:
+        - es_unitaria (bool): True si la matriz es unitaria (calculado una sola vez por modo).
+        """
+        return self._comprobar("es_unitaria", modo, es_unitaria_por_bloques, es_unitaria_probabilistica)
+
+    def es_hermitiana(self, modo="exacto"):
+        """
+        Parámetros:
+        - modo (str): "exacto" o "probabilistico".
+
+        Retorna:
+        - es_hermitiana (bool): True si la matriz es Hermitiana (calculado una sola vez por modo).
+        """
+        return self._comprobar("es_hermitiana", modo, es_hermitiana_por_bloques, es_hermitiana_probabilistica)
+
+    def propiedades_verificadas(self):
+        """
+        Retorna:
+        - propiedades (dict): Propiedades comprobadas de forma exacta, por nombre.
+        """
+        return {nombre: valor for (nombre, modo), valor in self.propiedades.items() if modo == "exacto"}
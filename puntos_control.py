@@ -0,0 +1,176 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from estado_tensorial import EstadoTensorial
+from matriz_dispersa import MatrizDispersaCSR
+from operadores_perezosos import Matriz, Tensor
+from propagacion import descomposicion_espectral, registrar_descomposicion_espectral
+from propiedades import OperadorVerificado
+from teoriaCuanticaBasicaObv import Observable, SistemaCuantico, registrar_observable
+
+# Formato: MAGIA, longitud de la cabecera (uint64 little-endian), cabecera JSON y, a partir del
+# siguiente múltiplo de ALINEACION, los arreglos en binario, cada uno alineado a ALINEACION bytes
+MAGIA = b"CUANTCHK"
+VERSION = 1
+ALINEACION = 64
+
+
+def _alinear(posicion):
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+def _descomponer(objeto, base_propia):
+    # Retorna el tipo, la dimensión y el tipo de dato del estado u operador, los metadatos y los
+    # arreglos que lo describen
+    if isinstance(objeto, SistemaCuantico):
+        estado = objeto.estado
+        return "sistema", len(estado), estado.dtype, {"num_posiciones": int(objeto.num_posiciones)}, {"estado": estado}
+    if isinstance(objeto, EstadoTensorial):
+        return ("estado_tensorial", int(np.prod(objeto.dimensiones)), objeto.tensor.dtype,
+                {"dimensiones": list(objeto.dimensiones)}, {"tensor": objeto.tensor})
+    if isinstance(objeto, MatrizDispersaCSR):
+        arreglos = {"datos": objeto.datos, "indices": objeto.indices, "punteros": objeto.punteros}
+        return "dispersa", objeto.forma[0], objeto.datos.dtype, {"forma": list(objeto.forma)}, arreglos
+    if isinstance(objeto, Tensor):
+        if not all(isinstance(f, Matriz) and isinstance(f.matriz, np.ndarray) for f in objeto.factores):
+            raise TypeError("Solo se pueden guardar productos tensor de matrices densas")
+        matrices = [f.matriz for f in objeto.factores]
+        return ("tensor", int(np.prod([m.shape[0] for m in matrices])), np.result_type(*matrices),
+                {"num_factores": len(matrices)}, {f"factor_{i}": m for i, m in enumerate(matrices)})
+    if isinstance(objeto, Observable):
+        arreglos = {"matriz": objeto.matriz}
+        if base_propia or objeto.esta_diagonalizado:
+            arreglos["autovalores"], arreglos["autovectores"] = objeto.autovalores, objeto.autovectores
+        return "observable", len(objeto.matriz), objeto.matriz.dtype, {"propiedades": {"es_hermitiana": True}}, arreglos
+    if isinstance(objeto, OperadorVerificado):
+        return ("operador_verificado", len(objeto.matriz), objeto.matriz.dtype,
+                {"propiedades": objeto.propiedades_verificadas()}, {"matriz": objeto.matriz})
+    objeto = np.asarray(objeto)
+    arreglos = {"matriz": objeto}
+    # Solo las matrices cuadradas tienen base propia: para un vector se ignora base_propia
+    if base_propia and objeto.ndim == 2 and objeto.shape[0] == objeto.shape[1]:
+        descomposicion = descomposicion_espectral(objeto)
+        if descomposicion is not None:
+            arreglos["autovalores"], arreglos["autovectores"], arreglos["inversa"] = descomposicion
+    return "densa", objeto.shape[0] if objeto.ndim else 1, objeto.dtype, {}, arreglos
+
+
+def guardar(ruta, objeto, base_propia=False, metadatos=None):
+    """
+    Guarda un estado u operador en un archivo binario que se puede cargar sin copiar (mapeado en memoria).
+
+    Admite SistemaCuantico, EstadoTensorial, vectores y matrices densas, MatrizDispersaCSR,
+    productos tensor de operadores_perezosos (con factores densos), Observable y OperadorVerificado.
+    Además de los arreglos se guardan la dimensión, el tipo de dato, las propiedades ya verificadas
+    (unitaria, Hermitiana) y, si se conoce, la base propia, para que al cargar no se repitan.
+
+    Parámetros:
+    - ruta (str): Archivo de salida; se escribe completo o no se escribe.
+    - objeto: El estado u operador.
+    - base_propia (bool): Si es True se calcula (o se toma de la caché) y se guarda la diagonalización
+      de las matrices densas cuadradas y de los observables.
+    - metadatos (dict, opcional): Datos adicionales serializables en JSON.
+    """
+    tipo, dimension, dtype, descripcion, arreglos = _descomponer(objeto, base_propia)
+    cabecera = {
+        "version": VERSION,
+        "tipo": tipo,
+        "dimension": int(dimension),
+        "dtype": np.dtype(dtype).str,
+        "descripcion": descripcion,
+        "metadatos": metadatos or {},
+        "arreglos": {},
+    }
+    desplazamiento = 0
+    contiguos = {}
+    for nombre, arreglo in arreglos.items():
+        contiguos[nombre] = np.ascontiguousarray(arreglo)
+        cabecera["arreglos"][nombre] = {"desplazamiento": desplazamiento, "forma": list(contiguos[nombre].shape),
+                                        "dtype": contiguos[nombre].dtype.str}
+        desplazamiento = _alinear(desplazamiento + contiguos[nombre].nbytes)
+
+    texto = json.dumps(cabecera).encode("utf-8")
+    inicio_datos = _alinear(len(MAGIA) + 8 + len(texto))
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(MAGIA + struct.pack("<Q", len(texto)) + texto)
+        for nombre, arreglo in contiguos.items():
+            archivo.write(b"\0" * (inicio_datos + cabecera["arreglos"][nombre]["desplazamiento"] - archivo.tell()))
+            archivo.write(memoryview(arreglo).cast("B"))
+    os.replace(temporal, ruta)
+
+
+def leer_cabecera(ruta):
+    """
+    Lee solo la cabecera de un punto de control.
+
+    Parámetros:
+    - ruta (str): El archivo.
+
+    Retorna:
+    - cabecera (dict): Tipo, dimensión, dtype, descripción, metadatos y ubicación de los arreglos,
+      con "inicio_datos" (posición del primer arreglo en el archivo).
+    """
+    with open(ruta, "rb") as archivo:
+        if archivo.read(len(MAGIA)) != MAGIA:
+            raise ValueError(f"{ruta} no es un punto de control")
+        (longitud,) = struct.unpack("<Q", archivo.read(8))
+        cabecera = json.loads(archivo.read(longitud).decode("utf-8"))
+    if cabecera["version"] > VERSION:
+        raise ValueError(f"Versión de punto de control no soportada: {cabecera['version']}")
+    cabecera["inicio_datos"] = _alinear(len(MAGIA) + 8 + longitud)
+    return cabecera
+
+
+def cargar(ruta, modo="r"):
+    """
+    Carga un punto de control, mapeando los arreglos en memoria en lugar de leerlos.
+
+    Las propiedades verificadas y la base propia guardadas se reutilizan: los observables no se
+    vuelven a comprobar ni a diagonalizar (y quedan en la caché de obtener_observable), y la
+    diagonalización de las matrices densas se registra en la caché de propagar.
+
+    Parámetros:
+    - ruta (str): El archivo.
+    - modo (str): Modo de numpy.memmap: "r" (solo lectura), "c" (copia al escribir) o "r+".
+
+    Retorna:
+    - objeto: El estado u operador, del mismo tipo con el que se guardó (los vectores y matrices
+      densas se retornan como numpy.memmap).
+    """
+    cabecera = leer_cabecera(ruta)
+    arreglos = {}
+    for nombre, ubicacion in cabecera["arreglos"].items():
+        forma = tuple(ubicacion["forma"])
+        if int(np.prod(forma)) == 0:
+            arreglos[nombre] = np.empty(forma, dtype=ubicacion["dtype"])
+            continue
+        arreglos[nombre] = np.memmap(ruta, dtype=ubicacion["dtype"], mode=modo, shape=forma,
+                                     offset=cabecera["inicio_datos"] + ubicacion["desplazamiento"])
+
+    tipo, descripcion = cabecera["tipo"], cabecera["descripcion"]
+    if tipo == "sistema":
+        return SistemaCuantico(descripcion["num_posiciones"], arreglos["estado"])
+    if tipo == "estado_tensorial":
+        return EstadoTensorial(descripcion["dimensiones"], arreglos["tensor"], dtype=arreglos["tensor"].dtype)
+    if tipo == "dispersa":
+        return MatrizDispersaCSR(arreglos["datos"], arreglos["indices"], arreglos["punteros"], descripcion["forma"])
+    if tipo == "tensor":
+        return Tensor([Matriz(arreglos[f"factor_{i}"]) for i in range(descripcion["num_factores"])])
+    if tipo == "operador_verificado":
+        return OperadorVerificado(arreglos["matriz"], **descripcion["propiedades"])
+    if tipo == "observable":
+        if "autovalores" in arreglos:
+            observable = Observable.desde_base_propia(arreglos["matriz"], arreglos["autovalores"], arreglos["autovectores"])
+            registrar_observable(observable)
+            return observable
+        return Observable(arreglos["matriz"])
+    if tipo == "densa":
+        if "autovalores" in arreglos:
+            registrar_descomposicion_espectral(arreglos["matriz"], (arreglos["autovalores"], arreglos["autovectores"],
+                                                                    arreglos["inversa"]))
+        return arreglos["matriz"]
+    raise ValueError(f"Tipo de punto de control desconocido: {tipo}")
@@ -1,5 +1,17 @@
+import multiprocessing
+
 import numpy as np
 
+from cache_matrices import CacheLRU, clave_matriz
+from instrumentacion import contar_flops, esta_activa, flops_producto, instrumentar
+from precision import ajustar_precision
+from propiedades import es_hermitiana_por_bloques
+
+# Número máximo de observables guardados en caché (con su comprobación de Hermiticidad y su base propia)
+TAMANO_CACHE_OBSERVABLES = 32
+
+_cache_observables = CacheLRU(TAMANO_CACHE_OBSERVABLES)
+
 class SistemaCuantico:
     def __init__(self, num_posiciones, estado_inicial):
         """
@@ -13,6 +25,67 @@ class SistemaCuantico:
         self.num_posiciones = num_posiciones
         self.estado = estado_inicial
 
+    @property
+    def estado(self):
+        return self._estado
+
+    @estado.setter
+    def estado(self, estado):
+        # Al cambiar el estado se descarta la distribución acumulada guardada para el muestreo
+        self._estado = ajustar_precision(estado)
+        self._distribucion = None
+        self._acumulada = None
+
+    def distribucion_de_posiciones(self):
+        """
+        Calcula (y guarda) la distribución de Born de las posiciones, normalizada.
+
+        Si el estado se modifica en el mismo arreglo (sin asignar sistema.estado),
+        la distribución guardada no se actualiza.
+
+        Retorna:
+        - probabilidades (numpy.ndarray): Probabilidad de encontrar la partícula en cada posición.
+        """
+        if self._distribucion is None:
+            probabilidades = np.abs(np.asarray(self.estado[:self.num_posiciones])) ** 2
+            self._distribucion = probabilidades / probabilidades.sum()
+        return self._distribucion
+
+    def muestrear(self, num_muestras, semilla=None):
+        """
+        Simula mediciones de la posición de la partícula según la regla de Born.
+
+        Usa búsqueda binaria sobre la distribución acumulada, que se calcula una sola vez por estado.
+
+        Parámetros:
+        - num_muestras (int): Número de mediciones.
+        - semilla (int or numpy.random.Generator, opcional): Semilla o generador para reproducibilidad.
+
+        Retorna:
+        - posiciones (numpy.ndarray): Posición obtenida en cada medición.
+        """
+        if self._acumulada is None:
+            self._acumulada = np.cumsum(self.distribucion_de_posiciones())
+        uniformes = np.random.default_rng(semilla).random(int(num_muestras))
+        posiciones = np.searchsorted(self._acumulada, uniformes, side="right")
+        # El último valor acumulado puede quedar ligeramente por debajo de 1 por redondeo
+        return np.minimum(posiciones, self.num_posiciones - 1)
+
+    def histograma(self, num_muestras, semilla=None):
+        """
+        Cuenta cuántas de num_muestras mediciones caen en cada posición.
+
+        Se muestrea directamente la distribución multinomial, con costo independiente del número de muestras.
+
+        Parámetros:
+        - num_muestras (int): Número de mediciones.
+        - semilla (int or numpy.random.Generator, opcional): Semilla o generador para reproducibilidad.
+
+        Retorna:
+        - conteos (numpy.ndarray): Número de mediciones en cada posición.
+        """
+        return np.random.default_rng(semilla).multinomial(int(num_muestras), self.distribucion_de_posiciones())
+
     def probabilidad_en_posicion(self, posicion):
         """
         Calcula la probabilidad de encontrar la partícula en una posición específica.
@@ -38,7 +111,43 @@ class SistemaCuantico:
         Retorna:
         - probabilidad (float): Probabilidad de transición desde el estado inicial al estado final.
         """
-        return np.abs(np.dot(self.estado, estado_final.conj())) ** 2
+        # ⟨φ|ψ⟩: se conjuga el estado final, como en probabilidades_de_transicion (para varios estados finales)
+        return np.abs(np.vdot(estado_final, self.estado)) ** 2
+
+def _histograma_de_distribucion(argumentos):
+    probabilidades, num_muestras, semilla = argumentos
+    return np.random.default_rng(semilla).multinomial(num_muestras, probabilidades)
+
+def histogramas_en_lote(sistemas, num_muestras, semilla=None, procesos=None):
+    """
+    Calcula el histograma de mediciones de posición de muchos sistemas cuánticos.
+
+    Cada sistema recibe su propia semilla derivada de `semilla`, por lo que el resultado
+    es reproducible e independiente del número de procesos.
+
+    Parámetros:
+    - sistemas (list of SistemaCuantico): Los sistemas que se miden.
+    - num_muestras (int): Número de mediciones por sistema.
+    - semilla (int, opcional): Semilla base.
+    - procesos (int, opcional): Número de procesos; None o 1 calcula todo en el proceso actual.
+
+    Retorna:
+    - conteos (numpy.ndarray): Arreglo (S, P) con los conteos de cada sistema, donde P es el mayor
+      número de posiciones (los sistemas con menos posiciones se completan con ceros).
+    """
+    semillas = np.random.SeedSequence(semilla).spawn(len(sistemas))
+    tareas = [(sistema.distribucion_de_posiciones(), int(num_muestras), semilla_sistema)
+              for sistema, semilla_sistema in zip(sistemas, semillas)]
+    if procesos is None or procesos <= 1:
+        histogramas = [_histograma_de_distribucion(tarea) for tarea in tareas]
+    else:
+        with multiprocessing.Pool(procesos) as grupo:
+            histogramas = grupo.map(_histograma_de_distribucion, tareas)
+
+    conteos = np.zeros((len(sistemas), max((len(h) for h in histogramas), default=0)), dtype=np.int64)
+    for fila, histograma in zip(conteos, histogramas):
+        fila[:len(histograma)] = histograma
+    return conteos
 
 def amplitud_de_transicion(estado_inicial, estado_final):
     """
@@ -53,6 +162,56 @@ def amplitud_de_transicion(estado_inicial, estado_final):
     """
     return np.abs(np.dot(estado_final.conj(), estado_inicial)) ** 2
 
+@instrumentar(flops=lambda estados_iniciales, estados_finales, tamano_bloque=None:
+              flops_producto(np.atleast_2d(estados_finales), np.atleast_2d(estados_iniciales).T))
+def probabilidades_de_transicion(estados_iniciales, estados_finales, tamano_bloque=None):
+    """
+    Calcula las probabilidades de transición |⟨φ|ψ⟩|² entre varios estados iniciales y varios finales.
+
+    Todos los productos internos se obtienen con un único producto matriz-matriz por bloque,
+    en lugar de un producto escalar por cada par de estados.
+
+    Parámetros:
+    - estados_iniciales (numpy.ndarray): Arreglo (N, d) de estados |ψ⟩ (o un solo estado (d,)).
+    - estados_finales (numpy.ndarray or list of numpy.ndarray): Arreglo (M, d) de estados |φ⟩ (o un solo estado (d,)).
+    - tamano_bloque (int, opcional): Número de estados iniciales procesados a la vez, para acotar la
+      memoria temporal (M · tamano_bloque amplitudes); permite usar arreglos mapeados en memoria.
+
+    Retorna:
+    - probabilidades (numpy.ndarray): Arreglo (N, M) con la probabilidad de transición de cada estado
+      inicial a cada estado final (sin los ejes de las entradas que eran un solo estado).
+    """
+    estados_iniciales = np.asarray(estados_iniciales)
+    estados_finales = np.asarray(estados_finales)
+    un_inicial, un_final = estados_iniciales.ndim == 1, estados_finales.ndim == 1
+    iniciales = estados_iniciales.reshape(-1, estados_iniciales.shape[-1])
+    finales = estados_finales.reshape(-1, estados_finales.shape[-1])
+    if iniciales.shape[1] != finales.shape[1]:
+        raise ValueError("Los estados iniciales y finales deben tener la misma dimensión")
+
+    num_iniciales = len(iniciales)
+    if tamano_bloque is None:
+        tamano_bloque = max(num_iniciales, 1)
+    # ⟨φ_m|ψ_n⟩ para todo el bloque: (n, d) @ (d, m); la conjugación se hace una sola vez
+    bras = finales.conj().T
+    tipo_real = np.result_type(iniciales.dtype, finales.dtype, np.float32)
+    probabilidades = np.empty((num_iniciales, len(finales)), dtype=np.finfo(tipo_real).dtype)
+    for inicio in range(0, num_iniciales, tamano_bloque):
+        amplitudes = np.dot(iniciales[inicio:inicio + tamano_bloque], bras)
+        bloque = probabilidades[inicio:inicio + len(amplitudes)]
+        if np.iscomplexobj(amplitudes):
+            # |z|² = Re² + Im², sin la raíz cuadrada de np.abs
+            np.multiply(amplitudes.real, amplitudes.real, out=bloque)
+            bloque += amplitudes.imag * amplitudes.imag
+        else:
+            np.multiply(amplitudes, amplitudes, out=bloque)
+
+    if un_final:
+        probabilidades = probabilidades[:, 0]
+    if un_inicial:
+        probabilidades = probabilidades[0]
+    return probabilidades
+
 def es_hermitiana(matriz):
     """
     Comprueba si una matriz es Hermitiana (autoadjunta).
@@ -63,63 +222,315 @@ def es_hermitiana(matriz):
     Retorna:
     - es_hermitiana (bool): True si la matriz es Hermitiana, False en caso contrario.
     """
-    return np.allclose(matriz, matriz.conj().T)
+    return es_hermitiana_por_bloques(matriz)
+
+def _copia_de_solo_lectura(arreglo):
+    # Los observables se guardan en una caché indexada por el contenido de la matriz: se guarda una
+    # copia que nadie pueda modificar (un arreglo mapeado en modo "r" ya lo es y no se copia)
+    if isinstance(arreglo, np.memmap) and arreglo.mode == "r":
+        return arreglo
+    copia = np.array(arreglo, copy=True)
+    copia.flags.writeable = False
+    return copia
+
+class Observable:
+    def __init__(self, matriz):
+        """
+        Inicializa un observable a partir de una matriz Hermitiana.
+
+        La Hermiticidad se comprueba una sola vez y la base propia se calcula con eigh
+        la primera vez que se necesita, de modo que medir el mismo observable sobre
+        muchos estados no repite ese trabajo.
+
+        La matriz se copia y la copia es de solo lectura, para que modificar el arreglo original
+        no cambie un observable que ya está en la caché.
+
+        Parámetros:
+        - matriz (numpy.ndarray): La matriz que describe el observable.
+        """
+        self.matriz = _copia_de_solo_lectura(matriz)
+        if not es_hermitiana(self.matriz):
+            raise ValueError("La matriz del observable no es Hermitiana")
+        self._autovalores = None
+        self._autovectores = None
+
+    @classmethod
+    def desde_base_propia(cls, matriz, autovalores, autovectores):
+        """
+        Construye un observable ya verificado y diagonalizado (por ejemplo, leído de un punto de
+        control), sin repetir la comprobación de Hermiticidad ni la diagonalización.
+
+        Parámetros:
+        - matriz (numpy.ndarray): La matriz Hermitiana que describe el observable.
+        - autovalores (numpy.ndarray): Sus autovalores, en orden creciente.
+        - autovectores (numpy.ndarray): Matriz cuyas columnas son los autovectores correspondientes.
+
+        Retorna:
+        - observable (Observable): El observable.
+        """
+        observable = cls.__new__(cls)
+        observable.matriz = _copia_de_solo_lectura(matriz)
+        observable._autovalores = _copia_de_solo_lectura(autovalores)
+        observable._autovectores = _copia_de_solo_lectura(autovectores)
+        return observable
+
+    def _diagonalizar(self):
+        if self._autovalores is None:
+            self._autovalores, self._autovectores = np.linalg.eigh(self.matriz)
+            self._autovalores.flags.writeable = False
+            self._autovectores.flags.writeable = False
+
+    @property
+    def esta_diagonalizado(self):
+        """
+        Retorna:
+        - esta_diagonalizado (bool): True si la base propia ya se calculó (o se cargó), sin calcularla.
+        """
+        return self._autovalores is not None
+
+    @property
+    def autovalores(self):
+        """
+        Retorna:
+        - autovalores (numpy.ndarray): Los autovalores (reales, en orden creciente) del observable.
+        """
+        self._diagonalizar()
+        return self._autovalores
+
+    @property
+    def autovectores(self):
+        """
+        Retorna:
+        - autovectores (numpy.ndarray): Matriz cuyas columnas son los autovectores ortonormales del observable.
+        """
+        self._diagonalizar()
+        return self._autovectores
+
+    def distribucion(self, estados):
+        """
+        Calcula la probabilidad de obtener cada autovalor al medir el observable.
+
+        Parámetros:
+        - estados (numpy.ndarray): Un estado (d,) o un lote de estados (N, d).
+
+        Retorna:
+        - probabilidades (numpy.ndarray): Arreglo (d,) o (N, d) con |⟨v_k|ψ⟩|² para cada autovector v_k.
+        """
+        # Un único producto matriz-matriz para todo el lote
+        return np.abs(np.dot(estados, self.autovectores.conj())) ** 2
+
+    def media_y_varianza(self, estados):
+        """
+        Calcula la media y la varianza del observable en uno o varios estados.
+
+        Parámetros:
+        - estados (numpy.ndarray): Un estado (d,) o un lote de estados (N, d).
+
+        Retorna:
+        - media (float or numpy.ndarray): Valor medio del observable en cada estado.
+        - varianza (float or numpy.ndarray): Varianza del observable en cada estado.
+        """
+        probabilidades = self.distribucion(estados)
+        media = np.dot(probabilidades, self.autovalores)
+        varianza = np.dot(probabilidades, self.autovalores ** 2) - media ** 2
+        return media, varianza
+
+    def media(self, estados):
+        """
+        Parámetros:
+        - estados (numpy.ndarray): Un estado (d,) o un lote de estados (N, d).
+
+        Retorna:
+        - media (float or numpy.ndarray): Valor medio del observable en cada estado.
+        """
+        return np.dot(self.distribucion(estados), self.autovalores)
+
+    def varianza(self, estados):
+        """
+        Parámetros:
+        - estados (numpy.ndarray): Un estado (d,) o un lote de estados (N, d).
+
+        Retorna:
+        - varianza (float or numpy.ndarray): Varianza del observable en cada estado.
+        """
+        return self.media_y_varianza(estados)[1]
+
+def obtener_observable(matriz):
+    """
+    Retorna el Observable de una matriz, reutilizando la caché indexada por el contenido de la matriz.
+
+    Parámetros:
+    - matriz (numpy.ndarray or Observable): La matriz que describe el observable.
+
+    Retorna:
+    - observable (Observable or None): El observable, o None si la matriz no es Hermitiana.
+    """
+    if isinstance(matriz, Observable):
+        return matriz
+    clave = clave_matriz(matriz)
+    if clave in _cache_observables:
+        return _cache_observables.obtener(clave)
+    try:
+        observable = Observable(matriz)
+    except ValueError:
+        observable = None
+    _cache_observables.guardar(clave, observable)
+    return observable
+
+def registrar_observable(observable):
+    """
+    Guarda un observable en la caché de obtener_observable, indexado por el contenido de su matriz.
+
+    Parámetros:
+    - observable (Observable): El observable.
+    """
+    _cache_observables.guardar(clave_matriz(observable.matriz), observable)
 
 def media_y_varianza(observable, estado):
     """
     Calcula la media y la varianza de un observable en un estado dado.
 
     Parámetros:
-    - observable (numpy.ndarray): La matriz que describe el observable.
+    - observable (numpy.ndarray or Observable): La matriz que describe el observable.
     - estado (numpy.ndarray): El estado cuántico en el que se realiza la medición.
 
     Retorna:
     - media (float): Valor medio del observable en el estado dado.
     - varianza (float): Varianza del observable en el estado dado.
     """
-    if es_hermitiana(observable):
-        media = np.real(np.dot(estado.conj(), np.dot(observable, estado)))
-        varianza = np.real(np.dot(estado.conj(), np.dot(observable ** 2, estado))) - media ** 2
+    observable_verificado = obtener_observable(observable)
+    if observable_verificado is not None:
+        # ⟨A²⟩ = ‖Aψ‖² para A Hermitiana: basta un producto matriz-vector
+        accion = np.dot(observable_verificado.matriz, estado)
+        media = np.real(np.dot(estado.conj(), accion))
+        varianza = np.real(np.dot(accion.conj(), accion)) - media ** 2
         return media, varianza
     else:
         return None
 
+def medias_y_varianzas(observables, estados, tamano_bloque=None):
+    """
+    Calcula la media y la varianza de varios observables en varios estados a la vez.
+
+    Todos los productos Aψ se obtienen con un único producto matriz-matriz por bloque,
+    y ⟨A²⟩ se calcula como ‖Aψ‖², sin un segundo producto. Cada observable se obtiene con
+    obtener_observable, así que la Hermiticidad se comprueba como en el resto del módulo (y una
+    sola vez por matriz).
+
+    Parámetros:
+    - observables (numpy.ndarray or list): Arreglo (K, d, d) de matrices Hermitianas o lista de
+      matrices u Observable (o un solo observable).
+    - estados (numpy.ndarray): Arreglo (N, d) de estados (o un solo estado (d,)).
+    - tamano_bloque (int, opcional): Número de estados procesados a la vez, para acotar la memoria
+      temporal (K · d · tamano_bloque valores).
+
+    Retorna:
+    - medias (numpy.ndarray): Arreglo (N, K) con el valor medio de cada observable en cada estado.
+    - varianzas (numpy.ndarray): Arreglo (N, K) con la varianza de cada observable en cada estado.
+    Si algún observable no es Hermitiano se retorna None.
+    """
+    if isinstance(observables, Observable):
+        un_observable = True
+    elif isinstance(observables, (list, tuple)) and any(isinstance(matriz, Observable) for matriz in observables):
+        un_observable = False
+    else:
+        observables = np.asarray(observables)
+        un_observable = observables.ndim == 2
+    verificados = [obtener_observable(matriz) for matriz in ([observables] if un_observable else observables)]
+    if any(observable is None for observable in verificados):
+        return None
+    observables = np.stack([observable.matriz for observable in verificados])
+    estados = np.asarray(estados)
+    un_estado = estados.ndim == 1
+    estados = estados.reshape(-1, estados.shape[-1])
+
+    num_observables, dimension, _ = observables.shape
+    num_estados = len(estados)
+    if tamano_bloque is None:
+        tamano_bloque = max(num_estados, 1)
+    apilados = observables.reshape(num_observables * dimension, dimension)
+    medias = np.empty((num_estados, num_observables))
+    varianzas = np.empty((num_estados, num_observables))
+    for inicio in range(0, num_estados, tamano_bloque):
+        bloque = estados[inicio:inicio + tamano_bloque]
+        # acciones[n, k, :] = A_k ψ_n
+        acciones = np.dot(apilados, bloque.T).reshape(num_observables, dimension, len(bloque)).transpose(2, 0, 1)
+        media = np.real(np.einsum("ni,nki->nk", bloque.conj(), acciones))
+        cuadrado = np.einsum("nki,nki->nk", acciones.real, acciones.real)
+        if np.iscomplexobj(acciones):
+            cuadrado += np.einsum("nki,nki->nk", acciones.imag, acciones.imag)
+        medias[inicio:inicio + len(bloque)] = media
+        varianzas[inicio:inicio + len(bloque)] = cuadrado - media ** 2
+
+    if un_observable:
+        medias, varianzas = medias[:, 0], varianzas[:, 0]
+    if un_estado:
+        medias, varianzas = medias[0], varianzas[0]
+    return medias, varianzas
+
 def autovalores_y_probabilidades_de_transicion(observable, estado, estados_finales):
     """
     Calcula los autovalores y las probabilidades de transición de un observable en un estado dado.
 
     Parámetros:
-    - observable (numpy.ndarray): La matriz que describe el observable.
+    - observable (numpy.ndarray or Observable): La matriz que describe el observable.
     - estado (numpy.ndarray): El estado cuántico en el que se realiza la medición.
     - estados_finales (list of numpy.ndarray): Lista de estados cuánticos finales.
 
     Retorna:
     - autovalores (numpy.ndarray): Los autovalores de la matriz observable.
-    - probabilidades_de_transicion (list of float): Lista de probabilidades de transición a los estados finales.
+    - probabilidades_de_transicion (numpy.ndarray): Probabilidades de transición a los estados finales.
     """
-    if es_hermitiana(observable):
-        autovalores, autovectores = np.linalg.eig(observable)
-        probabilidades_de_transicion = [np.abs(np.dot(estado.conj(), autovector) ** 2) for autovector in estados_finales]
-        return autovalores, probabilidades_de_transicion
+    observable = obtener_observable(observable)
+    if observable is not None:
+        autovalores = observable.autovalores
+        return autovalores, probabilidades_de_transicion(estado, estados_finales)
     else:
         return None
 
+@instrumentar()
 def evolucion_del_sistema(estado_inicial, matrices_de_evolucion):
     """
     Calcula el estado final del sistema a partir de una serie de matrices de evolución.
 
     Parámetros:
     - estado_inicial (numpy.ndarray): El estado inicial del sistema.
-    - matrices_de_evolucion (list of numpy.ndarray): Lista de matrices de evolución temporal.
+    - matrices_de_evolucion (iterable of numpy.ndarray): Matrices de evolución temporal (lista o generador).
 
     Retorna:
     - estado_final (numpy.ndarray): El estado final del sistema después de aplicar las matrices de evolución en secuencia.
     """
-    estado = estado_inicial
+    estado = ajustar_precision(estado_inicial)
     for matriz in matrices_de_evolucion:
+        matriz = ajustar_precision(matriz)
+        # Las operaciones se cuentan al recorrer las matrices: pueden venir de un generador
+        if esta_activa():
+            contar_flops(flops_producto(matriz, estado))
         estado = np.dot(matriz, estado)
     return estado
 
+@instrumentar()
+def evolucion_del_sistema_lote(estados_iniciales, matrices_de_evolucion):
+    """
+    Calcula los estados finales de un lote de estados iniciales a partir de una serie de matrices de evolución.
+
+    Cada matriz se aplica a todo el lote con un único producto matriz-matriz.
+
+    Parámetros:
+    - estados_iniciales (numpy.ndarray): Arreglo (N, d) con un estado inicial por fila.
+    - matrices_de_evolucion (iterable of numpy.ndarray): Matrices de evolución temporal (lista o generador).
+
+    Retorna:
+    - estados_finales (numpy.ndarray): Arreglo (N, d) con los estados finales, en el mismo orden.
+    """
+    estados = ajustar_precision(estados_iniciales)
+    for matriz in matrices_de_evolucion:
+        matriz = ajustar_precision(matriz)
+        if esta_activa():
+            contar_flops(flops_producto(estados, matriz))
+        estados = np.dot(estados, np.transpose(matriz))
+    return estados
+
 # Ejemplos de modelado de problemas
 
 def problema_4_3_1(estado_inicial, estado_final):
@@ -146,7 +557,7 @@ def problema_4_3_2(estado_inicial, observable, estados_finales):
 
     Retorna:
     - autovalores (numpy.ndarray): Los autovalores de la matriz observable.
-    - probabilidades_de_transicion (list of float): Lista de probabilidades de transición a los estados finales.
+    - probabilidades_de_transicion (numpy.ndarray): Probabilidades de transición a los estados finales.
     """
     autovalores, probabilidades_de_transicion = autovalores_y_probabilidades_de_transicion(observable, estado_inicial, estados_finales)
     return autovalores, probabilidades_de_transicion
@@ -163,8 +574,7 @@ def problema_4_4_1(observable):
     """
     return es_hermitiana(observable)
 
-def problema_4_4_2
-
+def problema_4_4_2(observable, estado, estados_finales):
     """
     Resuelve el Problema 4.4.2: Calcula la media, la varianza y las probabilidades de transición de un observable en un estado dado.
 
@@ -176,11 +586,10 @@ def problema_4_4_2
     Retorna:
     - media (float): Valor medio del observable en el estado dado.
     - varianza (float): Varianza del observable en el estado dado.
-    - probabilidades_de_transicion (list of float): Lista de probabilidades de transición a los estados finales.
+    - probabilidades_de_transicion (numpy.ndarray): Probabilidades de transición a los estados finales.
     """
     media, varianza = media_y_varianza(observable, estado)
-    probabilidades_de_transicion = [amplitud_de_transicion(estado, estado_final) for estado_final in estados_finales]
-    return media, varianza, probabilidades_de_transicion
+    return media, varianza, probabilidades_de_transicion(estado, estados_finales)
 
 # Ejemplo de uso
 
@@ -219,9 +628,3 @@ if __name__ == "__main__":
     print(f"Media del observable: {media:.2f}")
     print(f"Varianza del observable: {varianza:.2f}")
     print(f"Probabilidades de transición a los estados finales: {probabilidades_transicion}")
-Este código en Python incluye una serie de clases y funciones que modelan un sistema cuántico, resuelven los desafíos y problemas mencionados y proporcionan ejemplos de uso. Puedes adaptarlo y ampliarlo según tus necesidades.
-
-
-
-
-
@@ -0,0 +1,109 @@
+import itertools
+
+import numpy as np
+
+from precision import ajustar_precision
+
+# Número de filas que se acumulan en memoria antes de escribirlas al archivo
+TAMANO_BLOQUE = 1024
+
+
+def trayectoria(matriz_transicion, estado_inicial, pasos, probabilidades=False):
+    """
+    Genera el estado del sistema en cada paso de la evolución, sin guardar la trayectoria completa.
+
+    Parámetros:
+    - matriz_transicion (numpy.ndarray or MatrizDispersaCSR): La matriz de transición cuadrada.
+    - estado_inicial (numpy.ndarray): El vector de estado inicial.
+    - pasos (int): Número de pasos a propagar.
+    - probabilidades (bool): Si es True se generan las probabilidades |estado|² en lugar de los estados
+      (útil para el experimento cuántico).
+
+    Retorna:
+    - trayectoria (generator of numpy.ndarray): pasos + 1 vectores, empezando por el estado inicial.
+    """
+    matriz_transicion = ajustar_precision(matriz_transicion)
+    estado = ajustar_precision(estado_inicial)
+    for paso in range(int(pasos) + 1):
+        if paso:
+            estado = matriz_transicion.dot(estado)
+        yield np.abs(estado) ** 2 if probabilidades else estado
+
+
+def _validar_cada(cada):
+    if cada < 1:
+        raise ValueError("El paso de submuestreo debe ser al menos 1")
+
+
+def submuestrear(trayectoria, cada):
+    """
+    Toma uno de cada `cada` elementos de una trayectoria (generador o arreglo), empezando por el primero.
+
+    Parámetros:
+    - trayectoria (iterable of numpy.ndarray): La trayectoria completa.
+    - cada (int): Separación entre los pasos que se conservan.
+
+    Retorna:
+    - trayectoria (iterator of numpy.ndarray): La trayectoria submuestreada.
+    """
+    _validar_cada(cada)
+    return itertools.islice(trayectoria, 0, None, int(cada))
+
+
+def guardar_trayectoria(ruta, matriz_transicion, estado_inicial, pasos, probabilidades=False, cada=1,
+                        tamano_bloque=TAMANO_BLOQUE):
+    """
+    Escribe la trayectoria en un archivo .npy mapeado en memoria, por bloques de filas.
+
+    La memoria usada depende solo de tamano_bloque y de la dimensión, no del número de pasos.
+
+    Parámetros:
+    - ruta (str): Ruta del archivo .npy que se crea.
+    - matriz_transicion (numpy.ndarray or MatrizDispersaCSR): La matriz de transición cuadrada.
+    - estado_inicial (numpy.ndarray): El vector de estado inicial.
+    - pasos (int): Número de pasos a propagar.
+    - probabilidades (bool): Si es True se guardan las probabilidades |estado|² en lugar de los estados.
+    - cada (int): Se guarda uno de cada `cada` pasos, empezando por el estado inicial.
+    - tamano_bloque (int): Número de filas que se acumulan antes de escribirlas.
+
+    Retorna:
+    - num_filas (int): Número de filas escritas en el archivo.
+    """
+    _validar_cada(cada)
+    estado_inicial = ajustar_precision(estado_inicial)
+    dtype = np.result_type(ajustar_precision(matriz_transicion).dtype, estado_inicial.dtype)
+    if probabilidades:
+        dtype = np.abs(np.zeros(1, dtype=dtype)).dtype
+    num_filas = int(pasos) // int(cada) + 1
+    archivo = np.lib.format.open_memmap(ruta, mode="w+", dtype=dtype, shape=(num_filas, len(estado_inicial)))
+
+    bloque = np.empty((min(tamano_bloque, num_filas), len(estado_inicial)), dtype=dtype)
+    fila = 0
+    usados = 0
+    for vector in submuestrear(trayectoria(matriz_transicion, estado_inicial, pasos, probabilidades), cada):
+        bloque[usados] = vector
+        usados += 1
+        if usados == len(bloque):
+            archivo[fila:fila + usados] = bloque
+            archivo.flush()
+            fila += usados
+            usados = 0
+    if usados:
+        archivo[fila:fila + usados] = bloque[:usados]
+        fila += usados
+    archivo.flush()
+    del archivo
+    return fila
+
+
+def cargar_trayectoria(ruta):
+    """
+    Abre una trayectoria guardada con guardar_trayectoria sin leerla completa en memoria.
+
+    Parámetros:
+    - ruta (str): Ruta del archivo .npy.
+
+    Retorna:
+    - trayectoria (numpy.memmap): Arreglo (filas, d) de solo lectura mapeado en memoria.
+    """
+    return np.load(ruta, mmap_mode="r")